@@ -5,17 +5,38 @@ Permet de créer, gérer et surveiller plusieurs instances d'IA spécialisées
 import json
 import logging
 import os
+import queue
+import random
+import threading
 import time
 import uuid
-from typing import Dict, List, Any, Optional, Union
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 
+from clone_metrics import LatencyRecorder
+from clone_workers import CloneWorkerPool, normalize_worker_config, process_clone_request
 from module_IA import SecurityAnalysisAI
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Spécialisation attendue pour chaque type de demande
+REQUEST_SPECIALIZATIONS = {
+    "analyze_network": "network",
+    "analyze_protocol": "protocol",
+    "analyze_vulnerability": "vulnerability",
+    "analyze_trends": "network"
+}
+
+# Politiques de répartition des demandes entre clones éligibles
+ROUTING_POLICIES = ("least_outstanding", "ewma_latency", "power_of_two")
+DEFAULT_ROUTING_POLICY = "power_of_two"
+
+# Poids de la dernière mesure dans la latence lissée (moyenne mobile exponentielle)
+LATENCY_EWMA_ALPHA = 0.2
+
 # Variable singleton pour le gestionnaire de clones
 _clone_manager_instance = None
 
@@ -23,7 +44,8 @@ class AIClone:
     """Représente une instance clonée d'intelligence artificielle avec des paramètres spécifiques"""
     
     def __init__(self, name: str, specialization: str, learning_rate: float = 0.1, 
-                 confidence_threshold: float = 0.7, clone_id: Optional[str] = None):
+                 confidence_threshold: float = 0.7, clone_id: Optional[str] = None,
+                 worker_config: Optional[Dict[str, Any]] = None):
         """
         Initialise un clone d'IA
         
@@ -33,6 +55,8 @@ class AIClone:
             learning_rate: Taux d'apprentissage (0.01 à 1.0)
             confidence_threshold: Seuil de confiance pour les prédictions (0.0 à 1.0)
             clone_id: Identifiant unique (généré automatiquement si None)
+            worker_config: Configuration du pool de traitement (exécuteur, nombre de
+                           workers, taille de la file d'attente, délai maximal)
         """
         self.clone_id = clone_id or str(uuid.uuid4())
         self.name = name
@@ -53,8 +77,18 @@ class AIClone:
         }
         self.training_sessions = []
         
-        # Créer l'instance de l'IA sous-jacente
-        self.ai_engine = SecurityAnalysisAI()
+        # Pool de traitement des demandes (créé à la première demande)
+        self.worker_config = normalize_worker_config(worker_config)
+        self._worker_pool = None
+        self._pool_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        # Latence lissée des demandes traitées (utilisée pour la répartition)
+        self.latency_ewma = 0.0
+        # Histogrammes de latence et erreurs par type de demande
+        self.latency_metrics = LatencyRecorder(known_types=REQUEST_SPECIALIZATIONS)
+        
+        # Créer l'instance de l'IA sous-jacente (insights reproductibles, mémorisés pour les requêtes répétées)
+        self.ai_engine = SecurityAnalysisAI(deterministic=True)
         logger.info(f"Clone IA '{name}' créé avec ID {self.clone_id}")
     
     def to_dict(self) -> Dict[str, Any]:
@@ -70,7 +104,8 @@ class AIClone:
             "status": self.status,
             "version": self.version,
             "performance_metrics": self.performance_metrics,
-            "training_sessions": self.training_sessions
+            "training_sessions": self.training_sessions,
+            "worker_config": self.worker_config
         }
     
     @classmethod
@@ -81,7 +116,8 @@ class AIClone:
             specialization=data["specialization"],
             learning_rate=data["learning_rate"],
             confidence_threshold=data["confidence_threshold"],
-            clone_id=data["clone_id"]
+            clone_id=data["clone_id"],
+            worker_config=data.get("worker_config")
         )
         clone.creation_date = data["creation_date"]
         clone.last_activity = data["last_activity"]
@@ -95,35 +131,107 @@ class AIClone:
         """Met à jour le timestamp de dernière activité"""
         self.last_activity = datetime.now().isoformat()
     
-    def process_request(self, request_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    def process_request(self, request_type: str, data: Dict[str, Any],
+                        timeout: Optional[float] = None) -> Dict[str, Any]:
         """
-        Traite une demande et retourne les résultats
+        Traite une demande dans le pool du clone et retourne les résultats
         
         Args:
             request_type: Type de demande (analyze_network, analyze_protocol, etc.)
             data: Données à analyser
+            timeout: Délai maximal en secondes (délai du pool si None)
             
         Returns:
-            Dict: Résultats de l'analyse avec des métriques additionnelles
+            Dict: Résultats de l'analyse avec des métriques additionnelles, ou erreur
+                  ('error' et 'error_code' : overloaded, timeout ou unavailable)
         """
         start_time = time.time()
-        self.update_activity()
+        future, error = self.submit_request(request_type, data)
+        if error:
+            return error
+        return self.collect_result(future, request_type, data, start_time, timeout)
+    
+    def submit_request(self, request_type: str, data: Dict[str, Any]) -> Tuple[Optional[Future], Optional[Dict[str, Any]]]:
+        """
+        Confie une demande au pool du clone (créé au besoin) sans attendre son résultat
         
-        # Simuler une durée de traitement
-        processing_time = 0.05 + (0.1 * (1 - self.learning_rate))
-        time.sleep(processing_time)
+        Args:
+            request_type: Type de demande
+            data: Données à analyser
+            
+        Returns:
+            Tuple: (résultat à venir, None) ou (None, erreur avec 'error_code')
+        """
+        if self.status != "active":
+            error = {"error": f"Clone inactif (statut: {self.status})", "error_code": "unavailable"}
+            self.latency_metrics.record_error(request_type, error["error_code"])
+            return None, error
         
-        # Traiter la demande selon le type
-        result = self._process_by_type(request_type, data)
+        with self._pool_lock:
+            if self._worker_pool is None:
+                self._worker_pool = CloneWorkerPool(self.name, self.worker_config)
+            pool = self._worker_pool
+        
+        try:
+            if self.worker_config["executor"] == "process":
+                return pool.submit(process_clone_request, self.worker_state(), request_type, data), None
+            return pool.submit(self._process_by_type, request_type, data), None
+        except queue.Full:
+            error = {"error": f"Clone {self.name} saturé, réessayez plus tard", "error_code": "overloaded"}
+        except RuntimeError:
+            error = {"error": f"Clone {self.name} en cours d'arrêt", "error_code": "unavailable"}
+        self.latency_metrics.record_error(request_type, error["error_code"])
+        return None, error
+    
+    def collect_result(self, future: Future, request_type: str, data: Dict[str, Any],
+                       start_time: float, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Attend le résultat d'une demande confiée au pool et y ajoute les métriques
+        
+        Args:
+            future: Résultat à venir renvoyé par submit_request
+            request_type: Type de demande
+            data: Données analysées
+            start_time: Instant de soumission (le délai maximal court depuis cet instant)
+            timeout: Délai maximal en secondes (délai du pool si None)
+            
+        Returns:
+            Dict: Résultats de l'analyse avec des métriques additionnelles, ou erreur de délai
+        """
+        deadline = start_time + (timeout or self.worker_config["timeout"])
+        try:
+            result, started_at, finished_at = future.result(timeout=max(0.0, deadline - time.time()))
+        except FuturesTimeoutError:
+            # Une demande encore en file est annulée ; une demande en cours garde sa place jusqu'à sa fin
+            future.cancel()
+            self._record_timeout()
+            self.latency_metrics.record_error(request_type, "timeout")
+            return {"error": f"Délai de traitement dépassé pour le clone {self.name}", "error_code": "timeout"}
+        except Exception as e:
+            logger.error(f"Erreur lors du traitement d'une demande par le clone {self.name}: {e}")
+            self.latency_metrics.record_error(request_type, "failed")
+            return {"error": f"Erreur de traitement du clone {self.name}: {e}", "error_code": "failed"}
         
         # Mettre à jour les métriques
         elapsed_time = time.time() - start_time
-        self.performance_metrics["requests_processed"] += 1
-        self.performance_metrics["average_response_time"] = (
-            (self.performance_metrics["average_response_time"] * 
-             (self.performance_metrics["requests_processed"] - 1) + 
-             elapsed_time) / self.performance_metrics["requests_processed"]
+        self.latency_metrics.record(
+            request_type,
+            total=elapsed_time,
+            queue_wait=started_at - start_time,
+            execution=finished_at - started_at
         )
+        with self._metrics_lock:
+            self.update_activity()
+            self.performance_metrics["requests_processed"] += 1
+            self.performance_metrics["average_response_time"] = (
+                (self.performance_metrics["average_response_time"] * 
+                 (self.performance_metrics["requests_processed"] - 1) + 
+                 elapsed_time) / self.performance_metrics["requests_processed"]
+            )
+            if self.performance_metrics["requests_processed"] == 1:
+                self.latency_ewma = elapsed_time
+            else:
+                self.latency_ewma += LATENCY_EWMA_ALPHA * (elapsed_time - self.latency_ewma)
         
         # Ajouter des métriques de traitement
         result_with_metrics = {
@@ -140,6 +248,97 @@ class AIClone:
         
         return result_with_metrics
     
+    def outstanding_requests(self) -> int:
+        """Nombre de demandes acceptées par le pool et non terminées"""
+        pool = self._worker_pool
+        return pool.stats["in_flight"] if pool is not None else 0
+    
+    def wait_for_capacity(self, timeout: Optional[float] = None) -> bool:
+        """Attend qu'une place se libère dans le pool du clone (voir CloneWorkerPool.wait_for_capacity)"""
+        with self._pool_lock:
+            pool = self._worker_pool
+        return pool is None or pool.wait_for_capacity(timeout)
+    
+    def _record_timeout(self) -> None:
+        """Comptabilise un dépassement de délai dans le pool courant"""
+        with self._pool_lock:
+            if self._worker_pool is not None:
+                self._worker_pool.record_timeout()
+    
+    def worker_state(self) -> Dict[str, Any]:
+        """Paramètres nécessaires pour reconstruire le clone dans un processus d'exécution"""
+        return {
+            "clone_id": self.clone_id,
+            "name": self.name,
+            "specialization": self.specialization,
+            "learning_rate": self.learning_rate,
+            "confidence_threshold": self.confidence_threshold,
+            "version": self.version
+        }
+    
+    def configure_workers(self, worker_config: Dict[str, Any], drain_timeout: Optional[float] = None) -> None:
+        """
+        Modifie la configuration du pool ; l'ancien pool termine ses demandes en cours
+        
+        Args:
+            worker_config: Nouvelles valeurs de configuration (clés partielles acceptées)
+            drain_timeout: Délai maximal d'attente des demandes en cours de l'ancien pool
+                           (attente en arrière-plan)
+        """
+        new_config = normalize_worker_config({**self.worker_config, **worker_config})
+        if new_config != self.worker_config:
+            self.worker_config = new_config
+            self.drain_workers_in_background(drain_timeout)
+    
+    def drain_workers(self, timeout: Optional[float] = None) -> bool:
+        """
+        Arrête le pool du clone après la fin des demandes déjà acceptées
+        
+        Args:
+            timeout: Délai maximal d'attente en secondes (délai du pool si None)
+            
+        Returns:
+            bool: True si toutes les demandes acceptées se sont terminées
+        """
+        with self._pool_lock:
+            pool, self._worker_pool = self._worker_pool, None
+        if pool is None:
+            return True
+        return pool.drain(timeout if timeout is not None else pool.config["timeout"])
+    
+    def drain_workers_in_background(self, timeout: Optional[float] = None) -> Optional[threading.Thread]:
+        """
+        Refuse immédiatement les nouvelles demandes du pool, puis attend la fin des
+        demandes acceptées et arrête ses exécuteurs dans un thread d'arrière-plan
+        
+        Args:
+            timeout: Délai maximal d'attente en secondes (délai du pool si None)
+            
+        Returns:
+            Optional[threading.Thread]: Thread d'arrêt, ou None si aucun pool n'était démarré
+        """
+        with self._pool_lock:
+            pool, self._worker_pool = self._worker_pool, None
+        if pool is None:
+            return None
+        pool.stop_accepting()
+        thread = threading.Thread(
+            target=pool.drain,
+            args=(timeout if timeout is not None else pool.config["timeout"],),
+            name=f"clone-drain-{self.name}",
+            daemon=True
+        )
+        thread.start()
+        return thread
+    
+    def get_worker_stats(self) -> Dict[str, Any]:
+        """Renvoie l'état du pool de traitement du clone"""
+        with self._pool_lock:
+            pool = self._worker_pool
+        if pool is None:
+            return {**self.worker_config, "in_flight": 0, "running": False}
+        return {**pool.get_stats(), "running": True}
+    
     def _process_by_type(self, request_type: str, data: Dict[str, Any]) -> Any:
         """Traite une demande selon son type"""
         # Vérifier si le clone est actif
@@ -301,15 +500,28 @@ class AIClone:
 class AICloneManager:
     """Gestionnaire de clones d'IA pour créer et administrer plusieurs instances d'IA"""
     
-    def __init__(self, config_path: str = 'config/ai_clones.json'):
+    def __init__(self, config_path: str = 'config/ai_clones.json',
+                 routing_policy: str = DEFAULT_ROUTING_POLICY):
         """
         Initialise le gestionnaire de clones IA
         
         Args:
             config_path: Chemin vers le fichier de configuration des clones
+            routing_policy: Politique de répartition des demandes (voir ROUTING_POLICIES)
         """
         self.config_path = config_path
         self.clones = {}  # Dictionnaire des clones par ID
+        
+        # Index de répartition : clones par spécialisation
+        self.routing_policy = routing_policy if routing_policy in ROUTING_POLICIES else DEFAULT_ROUTING_POLICY
+        self.routing_index: Dict[str, List[AIClone]] = {}
+        self._routing_lock = threading.Lock()
+        self.routing_stats = {
+            "decisions": 0,
+            "fallbacks": 0,
+            "by_clone": {}
+        }
+        
         self.load_clones()
         
         # Créer un clone par défaut si aucun n'existe
@@ -330,6 +542,7 @@ class AICloneManager:
                     except Exception as e:
                         logger.error(f"Erreur lors du chargement du clone: {e}")
                 
+                self._rebuild_routing_index()
                 logger.info(f"{len(self.clones)} clones chargés depuis {self.config_path}")
             else:
                 logger.info(f"Fichier de configuration {self.config_path} introuvable, création d'un nouveau fichier")
@@ -360,6 +573,7 @@ class AICloneManager:
             confidence_threshold=0.7
         )
         self.clones[default_clone.clone_id] = default_clone
+        self._rebuild_routing_index()
         self.save_clones()
         return default_clone
     
@@ -384,6 +598,7 @@ class AICloneManager:
             confidence_threshold=confidence_threshold
         )
         self.clones[clone.clone_id] = clone
+        self._rebuild_routing_index()
         self.save_clones()
         return clone
     
@@ -414,16 +629,26 @@ class AICloneManager:
         if "name" in updates:
             clone.name = updates["name"]
         
+        if "specialization" in updates and updates["specialization"]:
+            clone.specialization = updates["specialization"]
+        
         if "learning_rate" in updates:
             clone.learning_rate = max(0.01, min(1.0, float(updates["learning_rate"])))
         
         if "confidence_threshold" in updates:
             clone.confidence_threshold = max(0.0, min(1.0, float(updates["confidence_threshold"])))
         
+        if "worker_config" in updates and isinstance(updates["worker_config"], dict):
+            clone.configure_workers(updates["worker_config"])
+        
         if "status" in updates and updates["status"] in ["active", "paused", "stopped"]:
             clone.status = updates["status"]
+            if clone.status != "active":
+                # Les demandes déjà acceptées se terminent en arrière-plan, les suivantes sont refusées
+                clone.drain_workers_in_background()
         
         clone.update_activity()
+        self._rebuild_routing_index()
         self.save_clones()
         return clone
     
@@ -437,11 +662,15 @@ class AICloneManager:
         Returns:
             bool: True si supprimé avec succès, False sinon
         """
-        if clone_id in self.clones:
-            del self.clones[clone_id]
-            self.save_clones()
-            return True
-        return False
+        clone = self.clones.pop(clone_id, None)
+        if clone is None:
+            return False
+        self._rebuild_routing_index()
+        with self._routing_lock:
+            self.routing_stats["by_clone"].pop(clone_id, None)
+        self.save_clones()
+        clone.drain_workers_in_background()
+        return True
     
     def process_request(self, request_type: str, data: Dict[str, Any], 
                         clone_id: Optional[str] = None) -> Dict[str, Any]:
@@ -463,54 +692,164 @@ class AICloneManager:
                 return {"error": f"Clone non trouvé: {clone_id}"}
             return clone.process_request(request_type, data)
         
-        # Sinon, trouver le clone le plus approprié
-        best_clone = self._find_best_clone_for_request(request_type)
-        if not best_clone:
-            return {"error": "Aucun clone actif disponible"}
-        
-        return best_clone.process_request(request_type, data)
+        # Sinon, confier la demande au clone retenu par la politique de répartition
+        # (ou au suivant si le pool du premier est saturé)
+        chosen, tier, fallback = self._select_clone(request_type)
+        if chosen is None:
+            return {"error": "Aucun clone actif disponible", "error_code": "unavailable"}
+        
+        for clone in self._iter_candidates(chosen, tier):
+            start_time = time.time()
+            future, error = clone.submit_request(request_type, data)
+            if future:
+                self._record_routing_decision(clone, fallback)
+                return clone.collect_result(future, request_type, data, start_time)
+        return error
     
-    def _find_best_clone_for_request(self, request_type: str) -> Optional[AIClone]:
-        """Trouve le meilleur clone pour traiter une demande spécifique"""
-        specialization_map = {
-            "analyze_network": "network",
-            "analyze_protocol": "protocol",
-            "analyze_vulnerability": "vulnerability",
-            "analyze_trends": "network"
-        }
+    def process_batch(self, items: List[Dict[str, Any]], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Traite un lot de demandes en parallèle sur les clones éligibles
         
-        target_specialization = specialization_map.get(request_type)
+        Chaque demande est confiée au clone retenu par la politique de
+        répartition ; quand tous les clones éligibles sont saturés, le lot
+        attend qu'une place se libère plutôt que d'échouer.
         
-        # Chercher un clone spécialisé actif
-        specialized_clones = []
-        general_clones = []
+        Args:
+            items: Demandes ({request_type, data, clone_id optionnel})
+            timeout: Délai maximal par demande en secondes (délai du clone si None)
+            
+        Returns:
+            Dict: Résultats dans l'ordre des demandes (ou erreur par demande) et durée totale
+        """
+        start_time = time.time()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        pending = []
+        saturated = set()
         
-        for clone in self.clones.values():
-            if clone.status != "active":
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or not item.get("request_type"):
+                results[index] = {"error": "Le type de demande est requis", "error_code": "invalid_request"}
                 continue
-                
-            if clone.specialization == target_specialization:
-                specialized_clones.append(clone)
-            elif clone.specialization == "general":
-                general_clones.append(clone)
-        
-        # Préférer un clone spécialisé
-        if specialized_clones:
-            # Trier par niveau de confiance
-            specialized_clones.sort(key=lambda c: c.confidence_threshold, reverse=True)
-            return specialized_clones[0]
-        
-        # Sinon utiliser un clone général
-        if general_clones:
-            general_clones.sort(key=lambda c: c.confidence_threshold, reverse=True)
-            return general_clones[0]
+            request_type = item["request_type"]
+            data = item.get("data") or {}
+            
+            clone_id = item.get("clone_id")
+            if clone_id:
+                clone = self.get_clone(clone_id)
+                if not clone:
+                    results[index] = {"error": f"Clone non trouvé: {clone_id}", "error_code": "not_found"}
+                    continue
+                chosen, tier, routed, fallback = clone, [clone], False, False
+            else:
+                chosen, tier, fallback = self._select_clone(request_type)
+                routed = True
+            
+            while True:
+                if chosen is None:
+                    results[index] = {"error": "Aucun clone actif disponible", "error_code": "unavailable"}
+                    break
+                for clone in self._iter_candidates(chosen, tier):
+                    submitted_at = time.time()
+                    future, error = clone.submit_request(request_type, data)
+                    if future:
+                        if routed:
+                            self._record_routing_decision(clone, fallback)
+                        pending.append((index, clone, future, submitted_at, request_type, data))
+                        break
+                else:
+                    # Tous les candidats refusent : attendre une place, une seule fois par clone bloqué
+                    waiting_clone = chosen
+                    if (error.get("error_code") == "overloaded" and waiting_clone.clone_id not in saturated
+                            and waiting_clone.wait_for_capacity(timeout or waiting_clone.worker_config["timeout"])):
+                        if routed:
+                            chosen, tier, fallback = self._select_clone(request_type)
+                        continue
+                    if error.get("error_code") == "overloaded":
+                        saturated.add(waiting_clone.clone_id)
+                    results[index] = error
+                break
+        
+        for index, clone, future, submitted_at, request_type, data in pending:
+            results[index] = clone.collect_result(future, request_type, data, submitted_at, timeout)
+        
+        failed = sum(1 for result in results if "error" in result)
+        return {
+            "results": results,
+            "total_time": time.time() - start_time,
+            "succeeded": len(results) - failed,
+            "failed": failed
+        }
+    
+    def _rebuild_routing_index(self) -> None:
+        """Reconstruit l'index de répartition (clones par spécialisation) après une modification"""
+        routing_index: Dict[str, List[AIClone]] = {}
+        for clone in self.clones.values():
+            routing_index.setdefault(clone.specialization, []).append(clone)
+        with self._routing_lock:
+            self.routing_index = routing_index
+    
+    def _select_clone(self, request_type: str) -> Tuple[Optional[AIClone], List[AIClone], bool]:
+        """
+        Choisit le clone actif qui traitera une demande
         
-        # En dernier recours, prendre n'importe quel clone actif
-        active_clones = [c for c in self.clones.values() if c.status == "active"]
-        if active_clones:
-            return active_clones[0]
+        Les clones de la spécialisation attendue sont préférés, puis les clones
+        généraux, puis n'importe quel clone actif. Dans ce groupe, le choix suit
+        la politique de répartition ; l'ordre de repli n'est calculé que si le
+        clone choisi refuse la demande (voir _iter_candidates).
         
-        return None
+        Args:
+            request_type: Type de demande
+            
+        Returns:
+            Tuple: (clone choisi ou None, groupe dont il est issu,
+                    True si aucun clone de la spécialisation attendue n'est actif)
+        """
+        target_specialization = REQUEST_SPECIALIZATIONS.get(request_type)
+        routing_index = self.routing_index
+        
+        for specialization in (target_specialization, "general"):
+            tier = routing_index.get(specialization, [])
+            chosen = self._pick_clone(tier)
+            if chosen is not None:
+                return chosen, tier, specialization != target_specialization
+        
+        # En dernier recours, n'importe quel clone actif
+        tier = [c for clones in routing_index.values() for c in clones]
+        return self._pick_clone(tier), tier, True
+    
+    def _pick_clone(self, tier: List[AIClone]) -> Optional[AIClone]:
+        """Choisit un clone actif du groupe selon la politique de répartition"""
+        if self.routing_policy == "power_of_two" and len(tier) > 2:
+            # Deux clones tirés au hasard, le moins chargé est préféré
+            sampled = [c for c in random.sample(tier, 2) if c.status == "active"]
+            if sampled:
+                return min(sampled, key=self._routing_key)
+        return min((c for c in tier if c.status == "active"), key=self._routing_key, default=None)
+    
+    def _iter_candidates(self, chosen: AIClone, tier: List[AIClone]):
+        """Renvoie le clone choisi, puis, seulement si on les demande, les autres clones actifs du groupe du moins au plus chargé"""
+        yield chosen
+        yield from sorted((c for c in tier if c is not chosen and c.status == "active"), key=self._routing_key)
+    
+    def _routing_key(self, clone: AIClone) -> Tuple[float, int, float]:
+        """Clé de tri des clones candidats selon la politique de répartition (le plus petit est préféré)"""
+        outstanding = clone.outstanding_requests()
+        if self.routing_policy == "least_outstanding":
+            load = float(outstanding)
+        else:
+            # Temps d'attente estimé : demandes en cours (plus celle-ci) fois la latence lissée
+            load = (outstanding + 1) * clone.latency_ewma
+        # À charge égale : le clone le moins sollicité, puis le plus confiant
+        return load, self.routing_stats["by_clone"].get(clone.clone_id, 0), -clone.confidence_threshold
+    
+    def _record_routing_decision(self, clone: AIClone, fallback: bool) -> None:
+        """Comptabilise le clone retenu pour une demande"""
+        with self._routing_lock:
+            self.routing_stats["decisions"] += 1
+            if fallback:
+                self.routing_stats["fallbacks"] += 1
+            by_clone = self.routing_stats["by_clone"]
+            by_clone[clone.clone_id] = by_clone.get(clone.clone_id, 0) + 1
     
     def get_clone_statistics(self) -> Dict[str, Any]:
         """Récupère les statistiques globales sur tous les clones"""
@@ -541,8 +880,38 @@ class AICloneManager:
             },
             "specializations": specializations,
             "total_requests_processed": total_requests,
-            "average_response_time": avg_response_time
+            "average_response_time": avg_response_time,
+            "workers": {clone_id: clone.get_worker_stats() for clone_id, clone in self.clones.items()},
+            "routing": self.get_routing_statistics(),
+            "latency": {clone_id: clone.latency_metrics.snapshot() for clone_id, clone in self.clones.items()}
+        }
+    
+    def get_routing_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère l'état de la répartition des demandes
+        
+        Returns:
+            Dict: Politique, décisions (totales, hors spécialisation, par clone),
+                  charge et latence lissée de chaque clone
+        """
+        with self._routing_lock:
+            stats = {
+                "policy": self.routing_policy,
+                "decisions": self.routing_stats["decisions"],
+                "fallbacks": self.routing_stats["fallbacks"],
+                "by_clone": dict(self.routing_stats["by_clone"])
+            }
+            routing_index = self.routing_index
+        stats["index"] = {specialization: [c.clone_id for c in clones]
+                          for specialization, clones in routing_index.items()}
+        stats["clones"] = {
+            clone.clone_id: {
+                "outstanding_requests": clone.outstanding_requests(),
+                "latency_ewma": clone.latency_ewma
+            }
+            for clones in routing_index.values() for clone in clones
         }
+        return stats
 
 
 # Singleton pour l'accès global au gestionnaire de clones
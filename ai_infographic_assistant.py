@@ -1,11 +1,16 @@
 """
 Module d'assistance IA pour enrichir les données des infographies de sécurité
 """
+import copy
 import logging
 import os
-import json
 from typing import Dict, List, Any, Optional
-from datetime import datetime
+
+from ai_insights_cache import (
+    DEFAULT_INSIGHTS_DB_FILENAME, DEFAULT_INSIGHTS_MAX_BYTES, DEFAULT_INSIGHTS_MAX_ENTRIES,
+    DEFAULT_INSIGHTS_TTL, InsightCache
+)
+from data_hashing import compute_data_hash
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -22,7 +27,7 @@ try:
 except ImportError:
     # Classe simulée pour éviter les erreurs
     class SecurityAnalysisAI:
-        def __init__(self):
+        def __init__(self, **kwargs):
             logger.warning("Utilisation d'une classe SecurityAnalysisAI simulée")
         
         def is_available(self):
@@ -35,6 +40,12 @@ except ImportError:
         def analyze_device_security(self, device_type, device_name, security_score):
             return f"Analyse simulée pour l'appareil {device_name}"
             
+        def generate_recommendation_insights(self, recs):
+            return [self.generate_recommendation_insight(rec) for rec in recs]
+            
+        def analyze_devices_security(self, devices):
+            return [self.analyze_device_security(*device) for device in devices]
+            
         def predict_security_trend(self, trend_data):
             return [{"date": "Futur", "score": 75, "predicted": True}]
             
@@ -47,6 +58,12 @@ except ImportError:
         def generate_protocol_recommendation(self, rec):
             return "Recommandation simulée pour les protocoles"
             
+        def analyze_protocols_security(self, protocols):
+            return [self.analyze_protocol_security(*protocol) for protocol in protocols]
+            
+        def generate_protocol_recommendations(self, recs):
+            return [self.generate_protocol_recommendation(rec) for rec in recs]
+            
         def generate_protocol_comparison(self, protocol_names):
             return {"summary": "Comparaison simulée", "protocols": {}}
             
@@ -59,6 +76,15 @@ except ImportError:
         def analyze_vulnerability_trend(self, date, count, description):
             return "Analyse simulée des tendances de vulnérabilité"
             
+        def analyze_vulnerabilities(self, vulnerabilities):
+            return [self.analyze_vulnerability(*vuln) for vuln in vulnerabilities]
+            
+        def generate_remediation_recommendations(self, steps):
+            return [self.generate_remediation_recommendation(*step) for step in steps]
+            
+        def analyze_vulnerability_trends(self, entries):
+            return [self.analyze_vulnerability_trend(*entry) for entry in entries]
+            
         def generate_advanced_security_recommendations(self, total_vulns, critical_vulns):
             return [{"title": "Recommandation simulée", "description": "Description", "ai_confidence": 90}]
             
@@ -79,24 +105,40 @@ class AIInfographicAssistant:
     et améliorer les rapports de sécurité
     """
     
-    def __init__(self, use_cache: bool = True, cache_dir: str = 'config'):
+    def __init__(
+        self,
+        use_cache: bool = True,
+        cache_dir: str = 'config',
+        cache_max_entries: int = DEFAULT_INSIGHTS_MAX_ENTRIES,
+        cache_max_bytes: int = DEFAULT_INSIGHTS_MAX_BYTES,
+        cache_ttl: float = DEFAULT_INSIGHTS_TTL
+    ):
         """
         Initialise l'assistant d'infographie IA
         
         Args:
             use_cache: Utiliser le cache pour les requêtes fréquentes (par défaut: True)
             cache_dir: Répertoire où stocker les données en cache
+            cache_max_entries: Nombre maximal d'insights en cache
+            cache_max_bytes: Taille maximale du cache (octets)
+            cache_ttl: Durée de validité d'un insight en cache (secondes)
         """
         self.use_cache = use_cache
         self.cache_dir = cache_dir
-        self.cache_file = os.path.join(cache_dir, 'ai_insights_cache.json')
+        self.cache_file = os.path.join(cache_dir, DEFAULT_INSIGHTS_DB_FILENAME)
+        self.cache_limits = {
+            'max_entries': cache_max_entries,
+            'max_bytes': cache_max_bytes,
+            'ttl': cache_ttl
+        }
         self.security_ai = None
-        self.cache = {}
+        self.cache = None
         
         # Initialiser le module IA si disponible
         if AI_MODULE_AVAILABLE:
             try:
-                self.security_ai = SecurityAnalysisAI()
+                # Insights reproductibles : mêmes données, même enrichissement (et cache cohérent)
+                self.security_ai = SecurityAnalysisAI(deterministic=True)
                 logger.info("Module IA chargé avec succès")
             except Exception as e:
                 logger.error(f"Erreur lors de l'initialisation du module IA: {e}")
@@ -108,25 +150,8 @@ class AIInfographicAssistant:
             self._load_cache()
     
     def _load_cache(self) -> None:
-        """Charge le cache depuis le fichier"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
-                logger.info(f"Cache chargé depuis {self.cache_file}")
-            except Exception as e:
-                logger.error(f"Erreur lors du chargement du cache: {e}")
-                self.cache = {}
-    
-    def _save_cache(self) -> None:
-        """Enregistre le cache dans le fichier"""
-        try:
-            os.makedirs(self.cache_dir, exist_ok=True)
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2, ensure_ascii=False)
-            logger.info(f"Cache enregistré dans {self.cache_file}")
-        except Exception as e:
-            logger.error(f"Erreur lors de l'enregistrement du cache: {e}")
+        """Ouvre le cache persistant des insights"""
+        self.cache = InsightCache(self.cache_file, **self.cache_limits)
     
     def _get_cache_key(self, data_type: str, data_hash: str) -> str:
         """
@@ -143,39 +168,30 @@ class AIInfographicAssistant:
     
     def _generate_data_hash(self, data: Dict[str, Any]) -> str:
         """
-        Génère un hash simple pour les données
+        Génère l'empreinte du contenu des données
         
         Args:
             data: Données à hasher
             
         Returns:
-            str: Hash des données (simplifié)
+            str: Empreinte SHA-256 des données canoniques (deux jeux de données
+                 différents ne partagent jamais la même clé)
         """
-        # Version simplifiée, en production utiliser un hash plus robuste
-        try:
-            # Utiliser uniquement quelques champs clés pour le hash
-            key_items = []
-            
-            if 'report_id' in data:
-                key_items.append(f"id:{data['report_id']}")
-            
-            if 'generated_at' in data:
-                key_items.append(f"date:{data['generated_at']}")
-            
-            if 'devices' in data and isinstance(data['devices'], list):
-                key_items.append(f"devices:{len(data['devices'])}")
-            
-            if 'vulnerabilities' in data and isinstance(data['vulnerabilities'], list):
-                key_items.append(f"vulns:{len(data['vulnerabilities'])}")
-            
-            # Si aucune clé spécifique n'est trouvée, utiliser un timestamp
-            if not key_items:
-                key_items.append(f"ts:{datetime.now().timestamp()}")
-            
-            return "_".join(key_items)
-        except Exception as e:
-            logger.error(f"Erreur lors de la génération du hash: {e}")
-            return f"fallback_{datetime.now().timestamp()}"
+        return compute_data_hash(data)
+    
+    @staticmethod
+    def _attach_insights(items: List[Dict[str, Any]], insights: List[Optional[str]], field: str) -> None:
+        """
+        Ajoute à chaque élément l'insight calculé pour lui (s'il existe)
+        
+        Args:
+            items: Éléments enrichis (modifiés sur place)
+            insights: Insights renvoyés par le traitement par lot, dans le même ordre
+            field: Nom du champ ajouté
+        """
+        for item, insight in zip(items, insights):
+            if insight:
+                item[field] = insight
     
     def is_available(self) -> bool:
         """
@@ -205,35 +221,29 @@ class AIInfographicAssistant:
             data_hash = self._generate_data_hash(network_data)
             cache_key = self._get_cache_key('network', data_hash)
             
-            if self.use_cache and cache_key in self.cache:
-                logger.info(f"Utilisation des données en cache pour {cache_key}")
-                return self.cache[cache_key]
+            if self.cache is not None:
+                cached_data = self.cache.get(cache_key)
+                if cached_data is not None:
+                    logger.info(f"Utilisation des données en cache pour {cache_key}")
+                    return cached_data
             
-            # Créer une copie pour ne pas modifier l'original
-            enriched_data = network_data.copy()
+            # Créer une copie pour ne pas modifier l'original (ni son empreinte)
+            enriched_data = copy.deepcopy(network_data)
             
-            # Enrichir les recommandations
+            # Enrichir les recommandations (traitées par lot)
             if 'recommendations' in enriched_data and isinstance(enriched_data['recommendations'], list):
-                for i, rec in enumerate(enriched_data['recommendations']):
-                    if i < len(enriched_data['recommendations']):
-                        ai_insight = self.security_ai.generate_recommendation_insight(rec)
-                        if ai_insight:
-                            enriched_data['recommendations'][i]['ai_insight'] = ai_insight
+                recommendations = enriched_data['recommendations']
+                insights = self.security_ai.generate_recommendation_insights(recommendations)
+                self._attach_insights(recommendations, insights, 'ai_insight')
             
-            # Enrichir les données des appareils
+            # Enrichir les données des appareils (une analyse par appareil distinct)
             if 'devices' in enriched_data and isinstance(enriched_data['devices'], list):
-                for i, device in enumerate(enriched_data['devices']):
-                    if i < len(enriched_data['devices']):
-                        device_type = device.get('type', '')
-                        device_name = device.get('name', '')
-                        security_score = device.get('security_score', 0)
-                        
-                        ai_insight = self.security_ai.analyze_device_security(
-                            device_type, device_name, security_score
-                        )
-                        
-                        if ai_insight:
-                            enriched_data['devices'][i]['ai_security_analysis'] = ai_insight
+                devices = enriched_data['devices']
+                insights = self.security_ai.analyze_devices_security([
+                    (device.get('type', ''), device.get('name', ''), device.get('security_score', 0))
+                    for device in devices
+                ])
+                self._attach_insights(devices, insights, 'ai_security_analysis')
             
             # Ajouter des tendances de sécurité prédictives
             if 'security_trend' in enriched_data:
@@ -249,9 +259,8 @@ class AIInfographicAssistant:
             )
             
             # Sauvegarder dans le cache
-            if self.use_cache:
-                self.cache[cache_key] = enriched_data
-                self._save_cache()
+            if self.cache is not None:
+                self.cache.put(cache_key, enriched_data)
             
             logger.info("Données de sécurité réseau enrichies avec succès")
             return enriched_data
@@ -279,34 +288,28 @@ class AIInfographicAssistant:
             data_hash = self._generate_data_hash(protocol_data)
             cache_key = self._get_cache_key('protocol', data_hash)
             
-            if self.use_cache and cache_key in self.cache:
-                logger.info(f"Utilisation des données en cache pour {cache_key}")
-                return self.cache[cache_key]
+            if self.cache is not None:
+                cached_data = self.cache.get(cache_key)
+                if cached_data is not None:
+                    logger.info(f"Utilisation des données en cache pour {cache_key}")
+                    return cached_data
             
-            # Créer une copie pour ne pas modifier l'original
-            enriched_data = protocol_data.copy()
+            # Créer une copie pour ne pas modifier l'original (ni son empreinte)
+            enriched_data = copy.deepcopy(protocol_data)
             
-            # Enrichir les protocoles
+            # Enrichir les protocoles (une analyse par protocole distinct)
             if 'protocols' in enriched_data and isinstance(enriched_data['protocols'], list):
-                for i, protocol in enumerate(enriched_data['protocols']):
-                    if i < len(enriched_data['protocols']):
-                        protocol_name = protocol.get('name', '')
-                        security_score = protocol.get('security', 0)
-                        
-                        ai_insight = self.security_ai.analyze_protocol_security(
-                            protocol_name, security_score
-                        )
-                        
-                        if ai_insight:
-                            enriched_data['protocols'][i]['ai_security_analysis'] = ai_insight
-            
-            # Enrichir les recommandations
+                protocols = enriched_data['protocols']
+                insights = self.security_ai.analyze_protocols_security([
+                    (protocol.get('name', ''), protocol.get('security', 0)) for protocol in protocols
+                ])
+                self._attach_insights(protocols, insights, 'ai_security_analysis')
+            
+            # Enrichir les recommandations (traitées par lot)
             if 'recommendations' in enriched_data and isinstance(enriched_data['recommendations'], list):
-                for i, rec in enumerate(enriched_data['recommendations']):
-                    if i < len(enriched_data['recommendations']):
-                        ai_insight = self.security_ai.generate_protocol_recommendation(rec)
-                        if ai_insight:
-                            enriched_data['recommendations'][i]['ai_insight'] = ai_insight
+                recommendations = enriched_data['recommendations']
+                insights = self.security_ai.generate_protocol_recommendations(recommendations)
+                self._attach_insights(recommendations, insights, 'ai_insight')
             
             # Ajouter une analyse comparative des protocoles
             if 'protocols' in enriched_data and isinstance(enriched_data['protocols'], list):
@@ -317,9 +320,8 @@ class AIInfographicAssistant:
                     enriched_data['ai_protocol_comparison'] = protocol_comparison
             
             # Sauvegarder dans le cache
-            if self.use_cache:
-                self.cache[cache_key] = enriched_data
-                self._save_cache()
+            if self.cache is not None:
+                self.cache.put(cache_key, enriched_data)
             
             logger.info("Données d'analyse de protocole enrichies avec succès")
             return enriched_data
@@ -347,56 +349,41 @@ class AIInfographicAssistant:
             data_hash = self._generate_data_hash(vulnerability_data)
             cache_key = self._get_cache_key('vulnerability', data_hash)
             
-            if self.use_cache and cache_key in self.cache:
-                logger.info(f"Utilisation des données en cache pour {cache_key}")
-                return self.cache[cache_key]
+            if self.cache is not None:
+                cached_data = self.cache.get(cache_key)
+                if cached_data is not None:
+                    logger.info(f"Utilisation des données en cache pour {cache_key}")
+                    return cached_data
             
-            # Créer une copie pour ne pas modifier l'original
-            enriched_data = vulnerability_data.copy()
+            # Créer une copie pour ne pas modifier l'original (ni son empreinte)
+            enriched_data = copy.deepcopy(vulnerability_data)
             
-            # Enrichir les vulnérabilités critiques
+            # Enrichir les vulnérabilités critiques (une analyse par vulnérabilité distincte)
             if 'critical_vulnerabilities' in enriched_data and isinstance(enriched_data['critical_vulnerabilities'], list):
-                for i, vuln in enumerate(enriched_data['critical_vulnerabilities']):
-                    if i < len(enriched_data['critical_vulnerabilities']):
-                        vuln_id = vuln.get('id', '')
-                        vuln_title = vuln.get('title', '')
-                        vuln_severity = vuln.get('severity', 'medium')
-                        
-                        ai_insights = self.security_ai.analyze_vulnerability(
-                            vuln_id, vuln_title, vuln_severity
-                        )
-                        
-                        if ai_insights:
-                            enriched_data['critical_vulnerabilities'][i]['ai_insights'] = ai_insights
-            
-            # Enrichir le plan de remédiation
+                vulnerabilities = enriched_data['critical_vulnerabilities']
+                insights = self.security_ai.analyze_vulnerabilities([
+                    (vuln.get('id', ''), vuln.get('title', ''), vuln.get('severity', 'medium'))
+                    for vuln in vulnerabilities
+                ])
+                self._attach_insights(vulnerabilities, insights, 'ai_insights')
+            
+            # Enrichir le plan de remédiation (traité par lot)
             if 'remediation_plan' in enriched_data and isinstance(enriched_data['remediation_plan'], list):
-                for i, step in enumerate(enriched_data['remediation_plan']):
-                    if i < len(enriched_data['remediation_plan']):
-                        title = step.get('title', '')
-                        difficulty = step.get('difficulty', 'medium')
-                        
-                        ai_recommendation = self.security_ai.generate_remediation_recommendation(
-                            title, difficulty
-                        )
-                        
-                        if ai_recommendation:
-                            enriched_data['remediation_plan'][i]['ai_recommendation'] = ai_recommendation
+                steps = enriched_data['remediation_plan']
+                recommendations = self.security_ai.generate_remediation_recommendations([
+                    (step.get('title', ''), step.get('difficulty', 'medium')) for step in steps
+                ])
+                self._attach_insights(steps, recommendations, 'ai_recommendation')
             
             # Enrichir la chronologie de découverte
             if 'discovery_timeline' in enriched_data and isinstance(enriched_data['discovery_timeline'], list):
-                for i, entry in enumerate(enriched_data['discovery_timeline']):
-                    if i < len(enriched_data['discovery_timeline']) and i % 2 == 0:  # Une entrée sur deux pour limiter
-                        date = entry.get('date', '')
-                        count = entry.get('vulnerabilities', 0)
-                        description = entry.get('description', '')
-                        
-                        ai_insights = self.security_ai.analyze_vulnerability_trend(
-                            date, count, description
-                        )
-                        
-                        if ai_insights:
-                            enriched_data['discovery_timeline'][i]['ai_insights'] = ai_insights
+                # Une entrée sur deux pour limiter
+                entries = enriched_data['discovery_timeline'][::2]
+                insights = self.security_ai.analyze_vulnerability_trends([
+                    (entry.get('date', ''), entry.get('vulnerabilities', 0), entry.get('description', ''))
+                    for entry in entries
+                ])
+                self._attach_insights(entries, insights, 'ai_insights')
             
             # Ajouter des recommandations avancées
             enriched_data['ai_advanced_recommendations'] = self.security_ai.generate_advanced_security_recommendations(
@@ -405,9 +392,8 @@ class AIInfographicAssistant:
             )
             
             # Sauvegarder dans le cache
-            if self.use_cache:
-                self.cache[cache_key] = enriched_data
-                self._save_cache()
+            if self.cache is not None:
+                self.cache.put(cache_key, enriched_data)
             
             logger.info("Données de vulnérabilité enrichies avec succès")
             return enriched_data
@@ -452,9 +438,8 @@ class AIInfographicAssistant:
             bool: True si le cache a été effacé avec succès, False sinon
         """
         try:
-            self.cache = {}
-            if os.path.exists(self.cache_file):
-                os.remove(self.cache_file)
+            if self.cache is not None:
+                self.cache.clear()
             logger.info("Cache effacé avec succès")
             return True
         except Exception as e:
@@ -468,7 +453,15 @@ class AIInfographicAssistant:
         Returns:
             Dict[str, Any]: Statistiques du cache
         """
+        if self.cache is None:
+            return {
+                'cache_size': 0,
+                'cache_file_exists': os.path.exists(self.cache_file),
+                'cache_types': {}
+            }
+        
         stats = {
+            **self.cache.get_stats(),
             'cache_size': len(self.cache),
             'cache_file_exists': os.path.exists(self.cache_file),
             'cache_types': {}
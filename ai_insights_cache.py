@@ -0,0 +1,273 @@
+"""
+Module de cache des insights IA des infographies.
+Les données enrichies sont adressées par une empreinte stable de leur contenu
+(JSON canonique), bornées en nombre d'entrées et en octets avec éviction LRU
+et expiration (TTL), et persistées entrée par entrée dans une base SQLite
+au lieu de réécrire tout le cache à chaque ajout.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Constantes par défaut du cache d'insights
+DEFAULT_INSIGHTS_DB_FILENAME = 'ai_insights_cache.db'
+DEFAULT_INSIGHTS_MAX_ENTRIES = 256
+DEFAULT_INSIGHTS_MAX_BYTES = 16 * 1024 * 1024  # 16 Mo
+DEFAULT_INSIGHTS_TTL = 7 * 24 * 3600  # 7 jours
+
+
+class InsightCache:
+    """Cache LRU borné, avec expiration, des données enrichies par l'IA"""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_entries: int = DEFAULT_INSIGHTS_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_INSIGHTS_MAX_BYTES,
+        ttl: float = DEFAULT_INSIGHTS_TTL
+    ):
+        """
+        Initialise le cache et charge les entrées encore valides
+
+        Args:
+            db_path: Chemin de la base SQLite
+            max_entries: Nombre maximal d'entrées
+            max_bytes: Taille totale maximale des valeurs sérialisées (octets)
+            ttl: Durée de validité d'une entrée en secondes
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # Clé -> {'value': JSON sérialisé, 'size': octets, 'created_at': horodatage}, du moins au plus récent
+        self.entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        # Derniers accès pas encore écrits en base (écrits par lots, voir _flush_access_locked)
+        self._pending_access: Dict[str, float] = {}
+        self.total_bytes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+        self._lock = threading.Lock()
+        self._conn = None
+        self._open()
+
+    def _open(self) -> None:
+        """Ouvre la base SQLite et charge les entrées (du moins au plus récemment utilisé)"""
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS insights ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            rows = self._conn.execute(
+                "SELECT key, value, created_at FROM insights ORDER BY last_access"
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de l'ouverture du cache d'insights {self.db_path}: {e}")
+            self._conn = None
+            return
+
+        for key, value, created_at in rows:
+            size = len(value.encode('utf-8'))
+            self.entries[key] = {'value': value, 'size': size, 'created_at': created_at}
+            self.total_bytes += size
+
+        with self._lock:
+            # Les bornes ont pu changer depuis le dernier démarrage
+            self._evict_locked()
+            self._commit()
+        logger.info(f"Cache d'insights chargé depuis {self.db_path} ({len(self.entries)} entrées)")
+
+    def _execute(self, query: str, params: tuple = ()) -> None:
+        """Exécute une écriture sur la base (sans effet si la base est indisponible)"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(query, params)
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de l'écriture du cache d'insights: {e}")
+
+    def _commit(self) -> None:
+        """Valide les écritures en attente"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de l'enregistrement du cache d'insights: {e}")
+
+    def _remove_locked(self, key: str) -> None:
+        """Retire une entrée de la mémoire et de la base (le verrou doit être détenu)"""
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.total_bytes -= entry['size']
+        self._pending_access.pop(key, None)
+        self._execute("DELETE FROM insights WHERE key = ?", (key,))
+
+    def _flush_access_locked(self) -> None:
+        """Écrit en un lot les derniers accès en attente (le verrou doit être détenu, sans valider)"""
+        if not self._pending_access:
+            return
+        if self._conn is not None:
+            try:
+                self._conn.executemany(
+                    "UPDATE insights SET last_access = ? WHERE key = ?",
+                    [(accessed_at, key) for key, accessed_at in self._pending_access.items()]
+                )
+            except sqlite3.Error as e:
+                logger.error(f"Erreur lors de l'écriture du cache d'insights: {e}")
+        self._pending_access.clear()
+
+    def _evict_locked(self, protect: Optional[str] = None) -> int:
+        """Supprime les entrées expirées puis les moins récemment utilisées au-delà des bornes"""
+        now = time.time()
+        evicted = 0
+        # L'ordre persistant doit refléter les accès avant toute éviction
+        self._flush_access_locked()
+
+        for key in [k for k, e in self.entries.items() if k != protect and now - e['created_at'] > self.ttl]:
+            self._remove_locked(key)
+            self.stats['expirations'] += 1
+            evicted += 1
+
+        for key in list(self.entries.keys()):
+            if len(self.entries) <= self.max_entries and self.total_bytes <= self.max_bytes:
+                break
+            if key == protect:
+                continue
+            self._remove_locked(key)
+            self.stats['evictions'] += 1
+            evicted += 1
+
+        return evicted
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Renvoie une copie des données en cache pour une clé
+
+        Args:
+            key: Clé de cache
+
+        Returns:
+            Optional[Any]: Données désérialisées, ou None si absentes ou expirées
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            now = time.time()
+            if now - entry['created_at'] > self.ttl:
+                self._remove_locked(key)
+                self._commit()
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+
+            # Récence tenue en mémoire ; écrite en base par lots (éviction, fermeture)
+            self.entries.move_to_end(key)
+            self._pending_access[key] = now
+            self.stats['hits'] += 1
+            value = entry['value']
+
+        return json.loads(value)
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Enregistre des données dans le cache puis applique les bornes
+
+        Args:
+            key: Clé de cache
+            value: Données sérialisables en JSON
+        """
+        try:
+            serialized = json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Données non sérialisables pour le cache d'insights: {e}")
+            return
+
+        size = len(serialized.encode('utf-8'))
+        if size > self.max_bytes:
+            logger.warning(f"Insight trop volumineux pour le cache ({size} octets), non conservé")
+            return
+
+        now = time.time()
+        with self._lock:
+            if key in self.entries:
+                self._remove_locked(key)
+            self.entries[key] = {'value': serialized, 'size': size, 'created_at': now}
+            self.total_bytes += size
+            self._execute(
+                "INSERT OR REPLACE INTO insights (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, serialized, now, now)
+            )
+            self.stats['stores'] += 1
+            self._evict_locked(protect=key)
+            self._commit()
+
+    def close(self) -> None:
+        """Écrit les derniers accès en attente et ferme la base"""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush_access_locked()
+            self._commit()
+            self._conn.close()
+            self._conn = None
+
+    def keys(self):
+        """Clés en cache, de la moins à la plus récemment utilisée"""
+        with self._lock:
+            return list(self.entries.keys())
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def clear(self) -> None:
+        """Vide complètement le cache"""
+        with self._lock:
+            self.entries.clear()
+            self._pending_access.clear()
+            self.total_bytes = 0
+            self._execute("DELETE FROM insights")
+            self._commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Renvoie les statistiques d'utilisation du cache
+
+        Returns:
+            Dict[str, Any]: Compteurs, taux de succès et occupation
+        """
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(self.stats['hits'] / lookups, 4) if lookups else 0.0,
+                'entries': len(self.entries),
+                'total_bytes': self.total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl
+            }
@@ -14,6 +14,18 @@ from ai_clone_manager import get_clone_manager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Codes HTTP des erreurs de traitement des clones
+CLONE_ERROR_STATUS = {
+    "overloaded": 429,
+    "unavailable": 503,
+    "timeout": 504,
+    "failed": 500
+}
+# Délai suggéré (en secondes) avant de réessayer une demande refusée
+CLONE_RETRY_AFTER = 1
+# Nombre maximal de demandes par lot
+MAX_BATCH_ITEMS = 500
+
 # Décorateur pour vérifier si l'utilisateur est administrateur
 def admin_api_required(f):
     @wraps(f)
@@ -347,10 +359,12 @@ def register_api_routes(app):
             
             # Vérifier s'il y a une erreur
             if "error" in result:
+                status_code = CLONE_ERROR_STATUS.get(result.get("error_code"), 400)
+                headers = {"Retry-After": str(CLONE_RETRY_AFTER)} if status_code in (429, 503) else {}
                 return jsonify({
                     "success": False,
                     "error": result["error"]
-                }), 400
+                }), status_code, headers
             
             return jsonify({
                 "success": True,
@@ -361,4 +375,155 @@ def register_api_routes(app):
             return jsonify({
                 "success": False,
                 "error": str(e)
-            }), 500
\ No newline at end of file
+            }), 500
+    
+    @app.route('/api/ai/process/batch', methods=['POST'])
+    @login_required
+    def process_ai_batch():
+        """API: Traite un lot de demandes avec l'IA"""
+        try:
+            data = request.json or {}
+            items = data.get('requests')
+            
+            # Validation des données
+            if not isinstance(items, list) or not items:
+                return jsonify({
+                    "success": False,
+                    "error": "Une liste de demandes est requise"
+                }), 400
+            if len(items) > MAX_BATCH_ITEMS:
+                return jsonify({
+                    "success": False,
+                    "error": f"Un lot est limité à {MAX_BATCH_ITEMS} demandes"
+                }), 400
+            
+            clone_manager = get_clone_manager()
+            batch = clone_manager.process_batch(items)
+            
+            results = []
+            for result in batch["results"]:
+                if "error" in result:
+                    results.append({
+                        "success": False,
+                        "error": result["error"],
+                        "error_code": result.get("error_code")
+                    })
+                else:
+                    results.append({
+                        "success": True,
+                        "result": result
+                    })
+            
+            return jsonify({
+                "success": True,
+                "results": results,
+                "succeeded": batch["succeeded"],
+                "failed": batch["failed"],
+                "total_time": batch["total_time"]
+            })
+        except Exception as e:
+            logger.error(f"Erreur lors du traitement du lot de demandes IA: {e}")
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 500
+    
+    # ======================================================
+    # API pour la génération groupée des rapports
+    # ======================================================
+    
+    @app.route('/api/admin/reports/bulk', methods=['POST'])
+    @admin_api_required
+    def start_bulk_reports():
+        """API: Lance la génération groupée de rapports pour plusieurs sites"""
+        try:
+            data = request.json or {}
+            jobs = data.get('jobs')
+            
+            if not jobs or not isinstance(jobs, list):
+                return jsonify({
+                    "success": False,
+                    "error": "La liste des travaux ('jobs') est requise"
+                }), 400
+            
+            from bulk_reports import start_bulk_generation
+            run_id = start_bulk_generation(
+                jobs,
+                max_workers=data.get('max_workers'),
+                dpi=int(data.get('dpi', 150)),
+                use_ai=bool(data.get('use_ai', True)),
+                optimize=bool(data.get('optimize', False))
+            )
+            
+            return jsonify({
+                "success": True,
+                "run_id": run_id,
+                "status_url": f"/api/admin/reports/bulk/{run_id}"
+            }), 202
+        except Exception as e:
+            logger.error(f"Erreur lors du lancement de la génération groupée: {e}")
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 500
+    
+    @app.route('/api/admin/reports/bulk/<run_id>', methods=['GET'])
+    @admin_api_required
+    def get_bulk_reports(run_id):
+        """API: Récupère l'état ou le manifeste d'une génération groupée"""
+        from bulk_reports import get_bulk_run
+        run = get_bulk_run(run_id)
+        
+        if run is None:
+            return jsonify({
+                "success": False,
+                "error": f"Lot non trouvé: {run_id}"
+            }), 404
+        
+        return jsonify({
+            "success": True,
+            "run": run
+        })
+    
+    # ======================================================
+    # API pour la recherche dans les conversations du chatbot
+    # ======================================================
+    
+    @app.route('/api/admin/chatbot/search', methods=['GET'])
+    @admin_api_required
+    def search_chatbot_conversations():
+        """API: Recherche plein texte dans les conversations (paramètres: q, limit, cursor, since, until)"""
+        from conversation_store import get_conversation_store, clamp_page_size, DEFAULT_SEARCH_PAGE_SIZE
+        
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({
+                "success": False,
+                "error": "Paramètre 'q' manquant"
+            }), 400
+        
+        try:
+            page = get_conversation_store().search(
+                query,
+                limit=clamp_page_size(request.args.get('limit'), DEFAULT_SEARCH_PAGE_SIZE),
+                cursor=request.args.get('cursor'),
+                since=request.args.get('since'),
+                until=request.args.get('until')
+            )
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 400
+        except RuntimeError as e:
+            logger.error(f"Erreur lors de la recherche dans les conversations: {e}")
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 503
+        
+        return jsonify({
+            "success": True,
+            "query": query,
+            **page
+        })
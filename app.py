@@ -1,4 +1,5 @@
 import os
+import time
 import logging
 from flask import Flask
 from urllib.parse import urlparse
@@ -13,6 +14,9 @@ def create_app():
     Fonction Factory pour créer l'application Flask
     Cela permet d'éviter les importations circulaires
     """
+    # Mesure du temps de démarrage (démarrage à froid)
+    start_time = time.perf_counter()
+    
     # Création de l'application
     app = Flask(__name__)
     
@@ -34,6 +38,10 @@ def create_app():
     app.config["JWT_COOKIE_CSRF_PROTECT"] = True
     app.config["JWT_ACCESS_TOKEN_EXPIRES"] = 3600  # 1 heure
     
+    # Préchargement du générateur d'infographies en arrière-plan (chargé à la demande sinon)
+    app.config["INFOGRAPHIC_WARMUP"] = os.environ.get("INFOGRAPHIC_WARMUP", "1") != "0"
+    app.config["INFOGRAPHIC_WARMUP_DELAY"] = float(os.environ.get("INFOGRAPHIC_WARMUP_DELAY", "5"))
+    
     # Initialisation des extensions
     db.init_app(app)
     login_manager.init_app(app)
@@ -87,6 +95,9 @@ def create_app():
         except Exception as e:
             logger.error(f"Erreur lors de l'initialisation du système de mise à jour IA: {e}")
     
+    app.config["STARTUP_TIME_MS"] = round((time.perf_counter() - start_time) * 1000, 1)
+    logger.info(f"Application initialisée en {app.config['STARTUP_TIME_MS']} ms")
+    
     return app
 
 # Importation de la fonction de chargement d'utilisateur pour Flask-Login
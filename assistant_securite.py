@@ -1,12 +1,22 @@
 # Module d'assistant de sécurité conversationnel avancé pour la cyberdéfense
+import copy
 import logging
+import heapq
+import itertools
 import json
 import os
 import random
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from network_security import NetworkSecurityAnalyzer
+from intent_matcher import IntentMatcher
+from conversation_store import (
+    get_conversation_store, clamp_page_size,
+    DEFAULT_CONVERSATIONS_DIR, DEFAULT_CONVERSATIONS_PAGE_SIZE, DEFAULT_MESSAGES_PAGE_SIZE
+)
 try:
     from module_IA import SecurityAnalysisAI
     ai_available = True
@@ -16,13 +26,67 @@ except ImportError:
 # Configuration du logging
 logger = logging.getLogger(__name__)
 
+# Mots-clés des intentions, de la plus prioritaire à la moins prioritaire
+INTENT_KEYWORDS = [
+    ("greeting", ['bonjour', 'salut', 'hello', 'coucou', 'hi', 'hey']),
+    ("threats", ["menace", "attaque", "vulnérabilité", "risque", "danger", "exploit"]),
+    ("password", ["mot de passe", "password", "mdp", "authentification"]),
+    ("encryption", ["chiffrement", "encryption", "cryptage", "wpa", "wep", "protocole"]),
+    ("advice", ["conseil", "recommandation", "améliorer", "renforcer", "sécuriser"]),
+    # Question sur le réseau analysé (également reconnue par la présence de son SSID)
+    ("network", ["réseau"]),
+    ("analysis", ["analyse", "scanner", "évaluer", "diagnostic"])
+]
+
+# Découpage en mots des questions et des descriptions de menaces
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+
+# Poids d'un mot commun entre la question et une menace
+THREAT_KEYWORD_WEIGHT = 3
+
+# Menaces favorisées par chaque type de chiffrement, avec leur bonus de pertinence
+ENCRYPTION_THREAT_BONUS = {
+    "WEP": (["wps_pin", "wpa_handshake"], 5),
+    "WPA": (["wpa_handshake"], 4),
+    "WPA2": (["krack", "pmkid"], 3),
+    "OPEN": (["evil_twin", "karma"], 5)
+}
+
+# Taille maximale (en caractères) des fragments de réponse diffusés en continu
+RESPONSE_CHUNK_SIZE = 80
+
+
+def split_response_chunks(response, chunk_size=RESPONSE_CHUNK_SIZE):
+    """
+    Découpe une réponse en fragments à diffuser, coupés après un espace si possible
+    
+    Args:
+        response: Texte de la réponse
+        chunk_size: Taille maximale d'un fragment en caractères
+        
+    Returns:
+        List[str]: Fragments dont la concaténation redonne la réponse
+    """
+    chunks = []
+    start = 0
+    while start < len(response):
+        end = min(start + chunk_size, len(response))
+        if end < len(response):
+            space = response.rfind(" ", start + 1, end)
+            if space != -1:
+                end = space + 1
+        chunks.append(response[start:end])
+        start = end
+    return chunks
+
 class CyberDefenseAssistant:
     """Assistant avancé de cyberdéfense pour l'analyse de sécurité et les recommandations"""
     
-    def __init__(self):
+    def __init__(self, conversations_dir=DEFAULT_CONVERSATIONS_DIR):
         self.security_analyzer = NetworkSecurityAnalyzer()
-        self.conversations_dir = "instance/conversations"
+        self.conversations_dir = conversations_dir
         os.makedirs(self.conversations_dir, exist_ok=True)
+        self.conversation_store = get_conversation_store(self.conversations_dir)
         
         # Initialiser le module IA si disponible
         self.ai_module = None
@@ -230,17 +294,107 @@ class CyberDefenseAssistant:
             "medium": "Moyenne - À planifier",
             "low": "Faible - Bonnes pratiques"
         }
+        
+        self.build_threat_index()
+    
+    def build_threat_index(self):
+        """
+        Indexe la base des menaces pour le calcul de pertinence
+        
+        Les mots du nom et de la description de chaque menace sont découpés une
+        seule fois ; l'index inversé associe chaque mot aux menaces qui le
+        contiennent (avec son poids), de sorte qu'une question ne parcourt que
+        les menaces partageant au moins un mot avec elle. Les menaces ayant une
+        pertinence propre et celles qui n'en ont pas sont triées une fois ici
+        pour compléter le classement sans parcourir toute la base.
+        """
+        self.threat_ids = list(self.threat_database.keys())
+        self.threat_positions = {threat_id: i for i, threat_id in enumerate(self.threat_ids)}
+        self.threat_tokens = {}
+        self.threat_index = {}
+        # Pertinence de chaque menace indépendante de la question (bonus de gravité)
+        self.threat_base_scores = {}
+        
+        for threat_id, threat in self.threat_database.items():
+            tokens = frozenset(TOKEN_PATTERN.findall(threat["name"].lower() + " " + threat["description"].lower()))
+            self.threat_tokens[threat_id] = tokens
+            for token in tokens:
+                self.threat_index.setdefault(token, []).append((threat_id, THREAT_KEYWORD_WEIGHT))
+            self.threat_base_scores[threat_id] = 2 if threat["severity"] == "élevée" else 0
+        
+        # Menaces à pertinence propre non nulle, par pertinence décroissante puis dans l'ordre de la base
+        self.base_ranked_threats = sorted(
+            ((threat_id, score) for threat_id, score in self.threat_base_scores.items() if score),
+            key=lambda item: (-item[1], self.threat_positions[item[0]])
+        )
+        # Menaces sans pertinence propre, dans l'ordre de la base
+        self.zero_base_threats = [threat_id for threat_id in self.threat_ids if not self.threat_base_scores[threat_id]]
+        
+        # Menaces proposées par défaut lorsqu'aucune n'est pertinente
+        self.default_threats = sorted(
+            (t for t in self.threat_database.values() if t["severity"] == "élevée"),
+            key=lambda x: x["name"]
+        )[:3]
+    
+    def rank_threats(self, query_tokens, encryption_type="UNKNOWN", limit=3):
+        """
+        Classe les menaces par pertinence pour une question
+        
+        Args:
+            query_tokens: Mots (en minuscules) de la question
+            encryption_type: Type de chiffrement du réseau analysé
+            limit: Nombre maximal de menaces renvoyées
+            
+        Returns:
+            List[tuple]: Couples (identifiant, pertinence) par pertinence décroissante,
+                         à égalité dans l'ordre de la base
+        """
+        base_scores = self.threat_base_scores
+        scores = {}
+        
+        # Seules les menaces partageant un mot avec la question sont parcourues
+        for token in query_tokens:
+            for threat_id, weight in self.threat_index.get(token, ()):
+                scores[threat_id] = scores.get(threat_id, base_scores[threat_id]) + weight
+        
+        # Augmenter la pertinence si le type de chiffrement est vulnérable à ces menaces
+        favored, bonus = ENCRYPTION_THREAT_BONUS.get(encryption_type, ((), 0))
+        for threat_id in favored:
+            if threat_id in self.threat_database:
+                scores[threat_id] = scores.get(threat_id, base_scores[threat_id]) + bonus
+        
+        # Parmi les autres menaces, seules les premières à pertinence propre peuvent entrer dans le classement
+        candidates = list(scores.items())
+        base_only = (item for item in self.base_ranked_threats if item[0] not in scores)
+        candidates.extend(itertools.islice(base_only, limit))
+        
+        position = self.threat_positions
+        ranked = heapq.nsmallest(limit, candidates, key=lambda item: (-item[1], position[item[0]]))
+        
+        # Compléter avec des menaces sans pertinence, dans l'ordre de la base
+        if len(ranked) < limit:
+            zero_relevance = (threat_id for threat_id in self.zero_base_threats if threat_id not in scores)
+            ranked += [(threat_id, 0) for threat_id in itertools.islice(zero_relevance, limit - len(ranked))]
+        return ranked
 
 # Maintenir la classe originale pour compatibilité, mais en déléguant à la nouvelle implémentation
 class AssistantSecurite:
-    def __init__(self):
-        self.assistant = CyberDefenseAssistant()
+    def __init__(self, conversations_dir=DEFAULT_CONVERSATIONS_DIR):
+        self.assistant = CyberDefenseAssistant(conversations_dir)
         self.security_analyzer = self.assistant.security_analyzer
         # Conserver l'accès direct aux attributs pour compatibilité
         self.templates = self.assistant.templates
         self.security_advice = self.assistant.security_advice
         self.encryption_info = self.assistant.encryption_info
         self.conversations_dir = self.assistant.conversations_dir
+        self.conversation_store = self.assistant.conversation_store
+        # Automate compilé une fois pour tous les mots-clés d'intention
+        self.intent_matcher = IntentMatcher(INTENT_KEYWORDS)
+        # Écrivain unique : les échanges différés sont sauvegardés dans leur ordre d'arrivée
+        self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='conversation-writer')
+        # Contexte réseau lu depuis un fichier, relu uniquement s'il a changé
+        self._network_context_cache = {}
+        self._network_context_lock = threading.Lock()
         
     def load_response_templates(self):
         """Délègue à la nouvelle implémentation"""
@@ -250,7 +404,33 @@ class AssistantSecurite:
         self.encryption_info = self.assistant.encryption_info
         
     def generate_response(self, user_input, conversation_id=None, network_data=None):
-        """Génère une réponse en fonction de l'entrée utilisateur"""
+        """Génère une réponse en fonction de l'entrée utilisateur et sauvegarde l'échange"""
+        exchange = self.compose_exchange(user_input, conversation_id, network_data)
+        
+        # Sauvegarder la conversation
+        self._save_conversation(
+            exchange["conversation_id"], exchange["user_input"], exchange["response"], exchange["network_data"]
+        )
+        
+        return {
+            "response": exchange["response"],
+            "conversation_id": exchange["conversation_id"],
+            "timestamp": exchange["timestamp"]
+        }
+    
+    def compose_exchange(self, user_input, conversation_id=None, network_data=None):
+        """
+        Génère la réponse à une entrée utilisateur, sans sauvegarder l'échange
+        
+        Args:
+            user_input: Message de l'utilisateur
+            conversation_id: Identifiant de la conversation (créé s'il est absent)
+            network_data: Données réseau du contexte
+            
+        Returns:
+            Dict: Échange à sauvegarder (conversation_id, user_input normalisé,
+                  response, network_data, timestamp)
+        """
         # Vérifier et préparer les données réseau
         if isinstance(network_data, list) and len(network_data) > 0:
             # Si on reçoit une liste de réseaux, prendre le premier pour l'analyse
@@ -265,11 +445,13 @@ class AssistantSecurite:
         if not conversation_id:
             conversation_id = datetime.now().strftime("%Y%m%d%H%M%S")
             
-        # Détection des intentions avancée
-        if self._detect_greeting(user_input):
+        # Détection des intentions avancée (un seul parcours du message)
+        intents = set(self.detect_intents(user_input)['intents'])
+        
+        if "greeting" in intents:
             response = random.choice(self.templates["greeting"])
         
-        elif self._detect_intent(user_input, ["menace", "attaque", "vulnérabilité", "risque", "danger", "exploit"]):
+        elif "threats" in intents:
             # L'utilisateur demande des informations sur les menaces
             threats = self._get_relevant_threats(user_input, network_data)
             threat_names = ", ".join([t["name"] for t in threats[:3]])
@@ -280,10 +462,10 @@ class AssistantSecurite:
                 protection=protection_advice
             )
         
-        elif self._detect_intent(user_input, ["mot de passe", "password", "mdp", "authentification"]):
+        elif "password" in intents:
             response = random.choice(self.templates["password"])
         
-        elif self._detect_intent(user_input, ["chiffrement", "encryption", "cryptage", "wpa", "wep", "protocole"]):
+        elif "encryption" in intents:
             if network_data and 'security' in network_data:
                 encryption_type = self._get_encryption_type(network_data['security'])
                 if encryption_type in self.encryption_info:
@@ -306,13 +488,13 @@ class AssistantSecurite:
                            "Si WPA3 n'est pas disponible, configurez WPA2-AES (évitez TKIP) avec un mot de passe de plus de 16 caractères. "
                            "Pour les environnements professionnels, envisagez WPA2/WPA3-Enterprise avec 802.1X et des certificats.")
         
-        elif self._detect_intent(user_input, ["conseil", "recommandation", "améliorer", "renforcer", "sécuriser"]):
+        elif "advice" in intents:
             random_advice = self._get_random_advice(3)
             response = random.choice(self.templates["general_security"]).format(
                 advice=random_advice
             )
         
-        elif network_data and network_data.get('ssid', '') and (network_data.get('ssid', '') in user_input or "réseau" in user_input):
+        elif network_data and network_data.get('ssid', '') and (network_data.get('ssid', '') in user_input or "network" in intents):
             # L'utilisateur pose une question sur un réseau spécifique
             network_name = network_data.get('ssid', 'Ce réseau')
             signal_quality = self._evaluate_signal(network_data.get('rssi', -100))
@@ -346,7 +528,7 @@ class AssistantSecurite:
                 recommendation=recommendation
             )
         
-        elif self._detect_intent(user_input, ["analyse", "scanner", "évaluer", "diagnostic"]):
+        elif "analysis" in intents:
             # L'utilisateur demande une analyse de vulnérabilité
             vulnerabilities = ["configuration par défaut non modifiée", "absence de pare-feu réseau", "mises à jour manquantes"]
             risk_level = "moyen à élevé"
@@ -362,12 +544,11 @@ class AssistantSecurite:
             # Si l'intention de l'utilisateur n'est pas claire
             response = random.choice(self.templates["unknown"])
         
-        # Sauvegarder la conversation
-        self._save_conversation(conversation_id, user_input, response, network_data)
-        
         return {
-            "response": response,
             "conversation_id": conversation_id,
+            "user_input": user_input,
+            "response": response,
+            "network_data": network_data,
             "timestamp": datetime.now().isoformat()
         }
     
@@ -375,97 +556,129 @@ class AssistantSecurite:
         """Récupère l'historique d'une conversation"""
         if not conversation_id:
             return []
-            
-        conversation_file = os.path.join(self.conversations_dir, f"{conversation_id}.json")
+        return self.conversation_store.read_log(conversation_id)
+    
+    def get_conversation_page(self, conversation_id, limit=None, cursor=None, include_network_data=True):
+        """
+        Récupère une page de l'historique d'une conversation
         
-        if not os.path.exists(conversation_file):
-            return []
+        Args:
+            conversation_id: Identifiant de la conversation
+            limit: Nombre maximal de messages
+            cursor: Curseur de la page précédente
+            include_network_data: False pour omettre les données réseau des messages
             
-        try:
-            with open(conversation_file, "r") as f:
-                return json.load(f)
-        except FileNotFoundError as e:
-            logger.error(f"Fichier de conversation introuvable pour {conversation_id}: {e}")
-            return []
-        except json.JSONDecodeError as e:
-            logger.error(f"Format JSON invalide pour la conversation {conversation_id}: {e}")
-            return []
-        except PermissionError as e:
-            logger.error(f"Erreur de permission lors de la lecture de la conversation {conversation_id}: {e}")
-            return []
-        except IOError as e:
-            logger.error(f"Erreur d'I/O lors de la lecture de la conversation {conversation_id}: {e}")
-            return []
+        Returns:
+            Dict: Messages de la page et curseur de la page suivante
+            
+        Raises:
+            ValueError: Si le curseur est invalide
+        """
+        limit = clamp_page_size(limit, DEFAULT_MESSAGES_PAGE_SIZE)
+        if not conversation_id:
+            return {"messages": [], "next_cursor": None}
+        return self.conversation_store.read_messages_page(
+            conversation_id, limit=limit, cursor=cursor, include_network_data=include_network_data
+        )
+    
+    @staticmethod
+    def _conversation_summary(meta):
+        """Résumé d'une conversation pour la liste de l'historique"""
+        return {
+            "id": meta["id"],
+            "date": meta["id"][:8],  # Format YYYYMMDD
+            "message_count": meta["message_count"],
+            "first_message": meta["preview"] + "...",
+            "created_at": meta["created_at"],
+            "updated_at": meta["updated_at"]
+        }
     
     def get_all_conversations(self):
-        """Récupère la liste de toutes les conversations"""
-        conversations = []
+        """Récupère la liste de toutes les conversations (depuis l'index, sans lire les conversations)"""
+        return [self._conversation_summary(meta) for meta in self.conversation_store.list_conversations()]
+    
+    def get_conversations_page(self, limit=None, cursor=None):
+        """
+        Récupère une page de la liste des conversations, des plus récentes aux plus anciennes
         
-        if not os.path.exists(self.conversations_dir):
-            return conversations
+        Args:
+            limit: Nombre maximal de conversations
+            cursor: Curseur de la page précédente
             
-        for filename in os.listdir(self.conversations_dir):
-            if filename.endswith(".json"):
-                conversation_id = filename.replace(".json", "")
-                try:
-                    with open(os.path.join(self.conversations_dir, filename), "r") as f:
-                        data = json.load(f)
-                        if data:
-                            first_message = data[0] if data else {}
-                            conversations.append({
-                                "id": conversation_id,
-                                "date": conversation_id[:8],  # Format YYYYMMDD
-                                "message_count": len(data),
-                                "first_message": first_message.get("user_input", "")[:50] + "..."
-                            })
-                except FileNotFoundError as e:
-                    logger.error(f"Fichier de conversation introuvable pour {filename}: {e}")
-                except json.JSONDecodeError as e:
-                    logger.error(f"Format JSON invalide pour le fichier {filename}: {e}")
-                except PermissionError as e:
-                    logger.error(f"Erreur de permission lors de la lecture de {filename}: {e}")
-                except IOError as e:
-                    logger.error(f"Erreur d'I/O lors de la lecture de {filename}: {e}")
-        
-        # Trier par date (plus récent en premier)
-        conversations.sort(key=lambda x: x["date"], reverse=True)
-        return conversations
+        Returns:
+            Dict: Conversations de la page et curseur de la page suivante
+            
+        Raises:
+            ValueError: Si le curseur est invalide
+        """
+        limit = clamp_page_size(limit, DEFAULT_CONVERSATIONS_PAGE_SIZE)
+        page = self.conversation_store.list_conversations_page(limit=limit, cursor=cursor)
+        return {
+            "conversations": [self._conversation_summary(meta) for meta in page["conversations"]],
+            "next_cursor": page["next_cursor"]
+        }
     
-    def _save_conversation(self, conversation_id, user_input, response, network_data=None):
-        """Sauvegarde une conversation"""
-        conversation_file = os.path.join(self.conversations_dir, f"{conversation_id}.json")
+    def save_exchange_async(self, exchange):
+        """
+        Sauvegarde un échange en arrière-plan
         
-        # Charger la conversation existante ou créer une nouvelle
-        if os.path.exists(conversation_file):
-            try:
-                with open(conversation_file, "r") as f:
-                    conversation = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError, PermissionError, IOError):
-                conversation = []
-        else:
-            conversation = []
+        Args:
+            exchange: Échange renvoyé par compose_exchange
+            
+        Returns:
+            Future: Sauvegarde en cours
+        """
+        return self._save_executor.submit(
+            self._save_conversation,
+            exchange["conversation_id"], exchange["user_input"], exchange["response"], exchange["network_data"]
+        )
+    
+    def flush_pending_saves(self, timeout=None):
+        """
+        Attend la fin des sauvegardes différées déjà demandées
         
-        # Ajouter le nouvel échange
-        conversation.append({
+        Args:
+            timeout: Délai maximal d'attente en secondes (None pour attendre sans limite)
+        """
+        self._save_executor.submit(lambda: None).result(timeout=timeout)
+    
+    def read_network_context(self, path):
+        """
+        Lit les données réseau d'un fichier de scan, en mémoire tant qu'il n'a pas changé
+        
+        Args:
+            path: Chemin du fichier JSON de scan
+            
+        Returns:
+            Any: Copie des données réseau ({} si le fichier est absent ou invalide)
+        """
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            logger.error(f"Erreur lors de la lecture des données réseau: {e}")
+            return {}
+        
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._network_context_lock:
+            cached = self._network_context_cache.get(path)
+            if cached is None or cached[0] != signature:
+                try:
+                    with open(path, "r") as f:
+                        cached = (signature, json.load(f))
+                except (OSError, json.JSONDecodeError) as e:
+                    logger.error(f"Erreur lors de la lecture des données réseau: {e}")
+                    return {}
+                self._network_context_cache[path] = cached
+        return copy.deepcopy(cached[1])
+    
+    def _save_conversation(self, conversation_id, user_input, response, network_data=None):
+        """Sauvegarde un échange en l'ajoutant au journal de la conversation"""
+        self.conversation_store.append(conversation_id, {
             "timestamp": datetime.now().isoformat(),
             "user_input": user_input,
             "response": response,
             "network_data": network_data
         })
-        
-        # Sauvegarder la conversation mise à jour
-        try:
-            os.makedirs(os.path.dirname(conversation_file), exist_ok=True)
-            with open(conversation_file, "w") as f:
-                json.dump(conversation, f, indent=2)
-        except FileNotFoundError as e:
-            logger.error(f"Chemin de fichier invalide lors de la sauvegarde de la conversation: {e}")
-        except PermissionError as e:
-            logger.error(f"Erreur de permission lors de la sauvegarde de la conversation: {e}")
-        except IOError as e:
-            logger.error(f"Erreur d'I/O lors de la sauvegarde de la conversation: {e}")
-        except TypeError as e:
-            logger.error(f"Erreur de type lors de la sérialisation JSON: {e}")
     
     def _get_random_advice(self, count=3):
         """Retourne quelques conseils aléatoires sous forme de liste à puces"""
@@ -507,60 +720,40 @@ class AssistantSecurite:
         else:
             return "faible"
     
+    def detect_intents(self, text):
+        """
+        Détecte en un seul parcours toutes les intentions d'un message
+        
+        Args:
+            text: Message de l'utilisateur
+            
+        Returns:
+            dict: Intention prioritaire, intentions reconnues par ordre de priorité
+                  et position de chaque mot-clé trouvé
+        """
+        return self.intent_matcher.classify(text)
+    
     def _detect_greeting(self, text):
         """Détecte une salutation dans le texte"""
-        greeting_words = ['bonjour', 'salut', 'hello', 'coucou', 'hi', 'hey']
-        return any(word in text for word in greeting_words)
-    
-    def _detect_intent(self, text, keywords):
-        """Détecte une intention basée sur des mots-clés"""
-        return any(keyword in text for keyword in keywords)
+        return "greeting" in self.detect_intents(text)['intents']
     
     def _get_relevant_threats(self, user_input, network_data):
         """Identifie les menaces les plus pertinentes en fonction du contexte"""
         # Déterminer les mots-clés de la question
-        query_keywords = set(re.findall(r'\b\w+\b', user_input.lower()))
+        query_keywords = set(TOKEN_PATTERN.findall(user_input.lower()))
         
         # Déterminer le type de chiffrement si disponible
         encryption_type = "UNKNOWN"
         if network_data and 'security' in network_data:
             encryption_type = self._get_encryption_type(network_data['security'])
         
-        # Calculer la pertinence pour chaque menace
-        threat_relevance = []
-        for threat_id, threat in self.assistant.threat_database.items():
-            relevance = 0
-            
-            # Chercher les mots-clés de la menace dans la question
-            threat_keywords = set(re.findall(r'\b\w+\b', threat["name"].lower() + " " + threat["description"].lower()))
-            keyword_match = len(query_keywords.intersection(threat_keywords))
-            relevance += keyword_match * 3
-            
-            # Augmenter la pertinence si le type de chiffrement est vulnérable à cette menace
-            if encryption_type == "WEP" and threat_id in ["wps_pin", "wpa_handshake"]:
-                relevance += 5
-            elif encryption_type == "WPA" and threat_id in ["wpa_handshake"]:
-                relevance += 4
-            elif encryption_type == "WPA2" and threat_id in ["krack", "pmkid"]:
-                relevance += 3
-            elif encryption_type == "OPEN" and threat_id in ["evil_twin", "karma"]:
-                relevance += 5
-            
-            # Bonus pour les menaces à gravité élevée
-            if threat["severity"] == "élevée":
-                relevance += 2
-            
-            threat_relevance.append((threat_id, relevance, threat))
-        
-        # Trier par pertinence décroissante
-        threat_relevance.sort(key=lambda x: x[1], reverse=True)
+        ranked = self.assistant.rank_threats(query_keywords, encryption_type, limit=3)
         
         # Si aucune menace n'est particulièrement pertinente, inclure les plus graves
-        if not threat_relevance or threat_relevance[0][1] == 0:
-            high_severity_threats = [t for t in self.assistant.threat_database.values() if t["severity"] == "élevée"]
-            return sorted(high_severity_threats, key=lambda x: x["name"])[:3]
+        if not ranked or ranked[0][1] == 0:
+            return list(self.assistant.default_threats)
         
         # Retourner les menaces les plus pertinentes
-        return [t[2] for t in threat_relevance[:3]]
+        return [self.assistant.threat_database[threat_id] for threat_id, _ in ranked]
     
     # Aucune autre méthode nécessaire - toutes les méthodes implémentées ci-dessus
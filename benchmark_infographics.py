@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de mesure des temps de rendu des infographies NetSecure Pro
+Ce script mesure, graphique par graphique, le temps de rendu PNG avec et sans
+les calques statiques pré-rendus (jauge, radar, tableau des protocoles), ainsi
+que le coût d'import à froid de la pile d'infographies au démarrage et la taille
+des fichiers produits en mode standard et optimisé.
+Il mesure aussi le rendu complet de chaque rapport pour plusieurs volumes de
+données et résolutions (temps par fonction de tracé), et vérifie qu'après une
+série de rendus la mémoire du processus et les objets matplotlib vivants
+reviennent à leur niveau initial.
+"""
+
+import io
+import gc
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+import time
+import argparse
+import logging
+import statistics
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.artist import Artist
+
+from infographic_generator import BUNDLE_FORMATS, REPORT_FILE_PREFIXES, InfographicGenerator
+from infographic_layers import apply_static_layers, enable_static_layers
+from infographic_output import save_figure
+from memory_monitor import MemoryMonitor
+
+# Configuration du logging
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Volumes de données (nombre d'éléments par série) et résolutions de la suite de rendus
+SUITE_DATA_SIZES = (5, 50, 500)
+SUITE_DPIS = (72, 150)
+
+# Tolérances du contrôle de fuite mémoire après la série de rendus
+LEAK_RSS_TOLERANCE_MB = 25.0
+LEAK_TRACED_TOLERANCE_KB = 1024.0
+
+
+def _chart_builders(generator):
+    """Renvoie les graphiques mesurés avec les données d'exemple"""
+    network = generator._generate_sample_data('network')['network_data']
+    protocols = generator._generate_sample_data('protocol')['protocol_data'].get('protocols', [])
+    # Les données d'exemple peuvent fournir un nombre de vulnérabilités au lieu d'une liste
+    protocols = [
+        {**p, 'vulnerabilities': p['vulnerabilities'] if isinstance(p.get('vulnerabilities'), list)
+         else [str(p.get('vulnerabilities', ''))]}
+        for p in protocols
+    ]
+
+    return {
+        'gauge': ((6, 4), lambda fig, pos: generator._create_security_score_gauge(
+            fig, pos, network.get('overall_score', 0))),
+        'radar': ((6, 5), lambda fig, pos: generator._create_security_dimensions_radar(
+            fig, pos, dict(network.get('security_dimensions', {})))),
+        'table': ((12, 5), lambda fig, pos: generator._create_protocol_comparison_table(
+            fig, pos, protocols))
+    }
+
+
+def render_chart(generator, figsize, build, dpi, static_layers):
+    """
+    Construit et enregistre en PNG une figure contenant un seul graphique
+
+    Returns:
+        float: Durée du rendu en millisecondes
+    """
+    start = time.perf_counter()
+    fig = plt.figure(figsize=figsize, dpi=dpi)
+    if static_layers:
+        enable_static_layers(fig)
+    gs = fig.add_gridspec(1, 1)
+    build(fig, gs[0, 0])
+    fig.tight_layout()
+    if static_layers:
+        apply_static_layers(fig, generator.static_layer_cache)
+    fig.savefig(io.BytesIO(), format='png')
+    plt.close(fig)
+    return (time.perf_counter() - start) * 1000
+
+
+def run_benchmark(repeat=10, dpi=150):
+    """
+    Mesure les temps de rendu médians par graphique, avant et après les calques statiques
+
+    Args:
+        repeat: Nombre de rendus mesurés par configuration
+        dpi: Résolution en points par pouce
+
+    Returns:
+        Dict: Temps médians (ms) par graphique : {'gauge': {'before': ..., 'after': ..., 'live_static': ...}, ...},
+              'live_static' étant le temps moyen de création des éléments statiques vivants,
+              non évité par les calques (ils servent à la mise en page)
+    """
+    generator = InfographicGenerator(use_cache=False)
+    results = {}
+
+    for name, (figsize, build) in _chart_builders(generator).items():
+        # Rendu de chauffe : remplit le cache de calques et les caches de polices
+        render_chart(generator, figsize, build, dpi, static_layers=False)
+        render_chart(generator, figsize, build, dpi, static_layers=True)
+
+        before = [render_chart(generator, figsize, build, dpi, False) for _ in range(repeat)]
+        live_draw_start = generator.static_layer_cache.get_stats()['live_draw_ms']
+        after = [render_chart(generator, figsize, build, dpi, True) for _ in range(repeat)]
+        live_draw_ms = generator.static_layer_cache.get_stats()['live_draw_ms'] - live_draw_start
+        results[name] = {
+            'before': statistics.median(before),
+            'after': statistics.median(after),
+            'live_static': live_draw_ms / repeat
+        }
+
+    results['layer_cache'] = generator.static_layer_cache.get_stats()
+    return results
+
+
+def measure_cold_import(module, repeat=3):
+    """
+    Mesure le temps d'import à froid d'un module dans un nouvel interpréteur
+
+    Args:
+        module: Nom du module à importer
+        repeat: Nombre de mesures (la médiane est renvoyée)
+
+    Returns:
+        float: Durée médiane de l'import en millisecondes
+    """
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; "
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def run_startup_benchmark(repeat=3):
+    """
+    Compare le coût au démarrage d'un chargement immédiat et différé du générateur
+
+    Returns:
+        Dict: Temps médians (ms) : import direct du générateur et du chargeur différé
+    """
+    return {
+        'infographic_generator': measure_cold_import('infographic_generator', repeat),
+        'infographic_loader': measure_cold_import('infographic_loader', repeat)
+    }
+
+
+def measure_output_sizes(dpi=150):
+    """
+    Mesure la taille des fichiers produits pour chaque rapport, en mode standard et optimisé
+
+    Args:
+        dpi: Résolution en points par pouce
+
+    Returns:
+        Dict: Tailles en octets : {('network', 'png'): {'standard': ..., 'optimized': ...}, ...}
+    """
+    generator = InfographicGenerator(use_cache=False)
+    output_dir = tempfile.mkdtemp(prefix='infographic_sizes_')
+    results = {}
+    try:
+        for report_type in REPORT_FILE_PREFIXES:
+            data = generator._generate_sample_data(report_type)
+            fig = generator._build_report_figure(report_type, data, dpi)
+            try:
+                for fmt in BUNDLE_FORMATS:
+                    sizes = {}
+                    for mode, optimize in (('standard', False), ('optimized', True)):
+                        path = os.path.join(output_dir, f"{report_type}_{mode}.{fmt}")
+                        sizes[mode] = save_figure(fig, path, fmt, optimize)
+                    results[(report_type, fmt)] = sizes
+            finally:
+                plt.close(fig)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return results
+
+
+def scale_report_data(report_data, size):
+    """
+    Redimensionne les séries des données d'exemple à un nombre donné d'éléments
+
+    Les listes (appareils, tendances, protocoles, vulnérabilités...) sont répétées
+    ou tronquées, en rendant les noms uniques pour ne pas fusionner les entrées.
+
+    Args:
+        report_data: Données d'un rapport ({'network_data': ..., 'vulnerability_data': ...})
+        size: Nombre d'éléments par série
+
+    Returns:
+        Dict: Copie des données aux séries redimensionnées
+    """
+    def scale_list(items):
+        scaled = []
+        for index in range(size):
+            item = items[index % len(items)]
+            if isinstance(item, dict):
+                item = dict(item)
+                if 'name' in item and index >= len(items):
+                    item['name'] = f"{item['name']} #{index // len(items) + 1}"
+            scaled.append(item)
+        return scaled
+
+    return {
+        section: {
+            key: scale_list(value) if isinstance(value, list) and value else value
+            for key, value in data.items()
+        } if isinstance(data, dict) else data
+        for section, data in report_data.items()
+    }
+
+
+@contextmanager
+def time_chart_helpers(generator, timings):
+    """
+    Mesure le temps de chaque fonction de tracé (_create_*) du générateur
+
+    Args:
+        generator: Instance d'InfographicGenerator
+        timings: Dictionnaire alimenté avec les durées (ms) par fonction
+    """
+    helpers = [name for name in dir(type(generator)) if name.startswith('_create_')]
+
+    def timed(name, method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timings[name] = timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+        return wrapper
+
+    for name in helpers:
+        setattr(generator, name, timed(name, getattr(generator, name)))
+    try:
+        yield timings
+    finally:
+        # Les attributs d'instance masquaient les méthodes de la classe
+        for name in helpers:
+            delattr(generator, name)
+
+
+def run_render_suite(data_sizes=SUITE_DATA_SIZES, dpis=SUITE_DPIS, repeat=3):
+    """
+    Mesure le rendu complet (mise en page et PNG) de chaque rapport par volume de données et résolution
+
+    Args:
+        data_sizes: Nombres d'éléments par série
+        dpis: Résolutions en points par pouce
+        repeat: Nombre de rendus mesurés par configuration
+
+    Returns:
+        Dict: Par (rapport, volume, dpi) : durée médiane totale (ms) et durée médiane par fonction de tracé
+    """
+    generator = InfographicGenerator(use_cache=False)
+    results = {}
+
+    for report_type in REPORT_FILE_PREFIXES:
+        sample = generator._generate_sample_data(report_type)
+        for size in data_sizes:
+            data = scale_report_data(sample, size)
+            for dpi in dpis:
+                # Rendu de chauffe (polices, calques statiques)
+                plt.close(generator._build_report_figure(report_type, data, dpi))
+
+                totals = []
+                helper_runs = []
+                for _ in range(repeat):
+                    timings = {}
+                    start = time.perf_counter()
+                    with time_chart_helpers(generator, timings):
+                        fig = generator._build_report_figure(report_type, data, dpi)
+                    try:
+                        fig.savefig(io.BytesIO(), format='png')
+                    finally:
+                        plt.close(fig)
+                    totals.append((time.perf_counter() - start) * 1000)
+                    helper_runs.append(timings)
+
+                results[(report_type, size, dpi)] = {
+                    'total': statistics.median(totals),
+                    'helpers': {
+                        name: statistics.median(run.get(name, 0.0) for run in helper_runs)
+                        for name in helper_runs[0]
+                    }
+                }
+
+    return results
+
+
+def count_live_artists():
+    """Nombre d'objets matplotlib (figures et artistes) encore référencés"""
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, Artist))
+
+
+def _memory_state():
+    """Relevé de la mémoire du processus et des objets matplotlib après un ramasse-miettes complet"""
+    gc.collect()
+    return {
+        'rss_mb': MemoryMonitor.get_memory_usage()['process']['rss_mb'],
+        'figures': len(plt.get_fignums()),
+        'artists': count_live_artists()
+    }
+
+
+def check_memory_leaks(renders=20, dpi=72, data_size=50, formats=('png', 'svg'),
+                       rss_tolerance_mb=LEAK_RSS_TOLERANCE_MB,
+                       traced_tolerance_kb=LEAK_TRACED_TOLERANCE_KB):
+    """
+    Vérifie qu'une série de rendus ne laisse ni figures, ni artistes, ni mémoire derrière elle
+
+    Chaque rendu passe par generate_infographic_bundle, comme les exports réels.
+    Après des rendus de chauffe, l'état de référence (RSS via MemoryMonitor, objets
+    matplotlib vivants) est comparé à l'état obtenu après la série ; une seconde série,
+    suivie par tracemalloc, mesure la croissance des allocations Python.
+
+    Args:
+        renders: Nombre de rendus par série (les types de rapport sont alternés)
+        dpi: Résolution en points par pouce
+        data_size: Nombre d'éléments par série des données
+        formats: Formats enregistrés à chaque rendu
+        rss_tolerance_mb: Croissance tolérée de la mémoire résidente (Mo)
+        traced_tolerance_kb: Croissance tolérée des allocations Python suivies (Ko)
+
+    Returns:
+        Dict: États de référence et final, croissances mesurées, principales
+              allocations restantes et résultat du contrôle ('passed')
+    """
+    generator = InfographicGenerator(use_cache=False)
+    report_types = list(REPORT_FILE_PREFIXES)
+    datasets = {
+        report_type: scale_report_data(generator._generate_sample_data(report_type), data_size)
+        for report_type in report_types
+    }
+    output_dir = tempfile.mkdtemp(prefix='infographic_leaks_')
+
+    def render(report_type):
+        generator.generate_infographic_bundle(
+            report_type, datasets[report_type], formats=list(formats),
+            output_basename=report_type, dpi=dpi, use_ai=False, output_dir=output_dir
+        )
+
+    try:
+        # Chauffe : caches de polices et du tracé, arènes de l'allocateur
+        for _ in range(2):
+            for report_type in report_types:
+                render(report_type)
+
+        # Mémoire résidente mesurée sans tracemalloc, qui alourdit lui-même le processus
+        baseline = _memory_state()
+        for index in range(renders):
+            render(report_types[index % len(report_types)])
+        final = _memory_state()
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            for index in range(renders):
+                render(report_types[index % len(report_types)])
+            gc.collect()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    differences = after.compare_to(before, 'lineno')
+    traced_growth_kb = sum(stat.size_diff for stat in differences) / 1024
+    growth = {
+        'rss_mb': round(final['rss_mb'] - baseline['rss_mb'], 2),
+        'traced_kb': round(traced_growth_kb, 1),
+        'figures': final['figures'] - baseline['figures'],
+        'artists': final['artists'] - baseline['artists']
+    }
+    return {
+        'renders': renders,
+        'baseline': baseline,
+        'final': final,
+        'growth': growth,
+        'top_allocations': [str(stat) for stat in differences[:5] if stat.size_diff > 0],
+        'passed': (
+            growth['figures'] <= 0
+            and growth['artists'] <= 0
+            and growth['rss_mb'] <= rss_tolerance_mb
+            and growth['traced_kb'] <= traced_tolerance_kb
+        )
+    }
+
+
+def main():
+    """Point d'entrée du script"""
+    parser = argparse.ArgumentParser(description="Mesure des temps de rendu des infographies")
+    parser.add_argument('--repeat', type=int, default=10, help="Nombre de rendus par configuration")
+    parser.add_argument('--dpi', type=int, default=150, help="Résolution des rendus")
+    parser.add_argument('--startup', action='store_true', help="Mesurer le coût d'import au démarrage")
+    parser.add_argument('--sizes', action='store_true', help="Mesurer la taille des fichiers standard et optimisés")
+    parser.add_argument('--suite', action='store_true',
+                        help="Mesurer le rendu de chaque rapport par volume de données et résolution")
+    parser.add_argument('--leaks', type=int, metavar='N', default=0,
+                        help="Vérifier la mémoire après N rendus (code de sortie 1 en cas de fuite)")
+    args = parser.parse_args()
+
+    if args.leaks:
+        report = check_memory_leaks(renders=args.leaks)
+        growth = report['growth']
+        print(f"Contrôle mémoire après {report['renders']} rendus")
+        print(f"RSS: {report['baseline']['rss_mb']:.1f} -> {report['final']['rss_mb']:.1f} Mo "
+              f"({growth['rss_mb']:+.1f} Mo), allocations suivies: {growth['traced_kb']:+.1f} Ko")
+        print(f"Figures ouvertes: {growth['figures']:+d}, artistes vivants: {growth['artists']:+d}")
+        for allocation in report['top_allocations']:
+            print(f"  {allocation}")
+        print("OK" if report['passed'] else "ÉCHEC: la mémoire ne revient pas à son niveau initial")
+        return 0 if report['passed'] else 1
+
+    if args.suite:
+        results = run_render_suite(repeat=args.repeat)
+        print(f"Rendu complet PNG, médiane sur {args.repeat} rendus")
+        for (report_type, size, dpi), timing in results.items():
+            print(f"{report_type:<14} {size:>5} éléments {dpi:>4} dpi {timing['total']:>10.1f} ms")
+            for name, duration in sorted(timing['helpers'].items(), key=lambda item: -item[1]):
+                print(f"    {name:<42} {duration:>10.1f} ms")
+        return 0
+
+    if args.sizes:
+        sizes = measure_output_sizes(dpi=args.dpi)
+        print(f"Taille des fichiers à {args.dpi} dpi (données d'exemple)")
+        print(f"{'Rapport':<14} {'Format':<7} {'Standard (Ko)':>14} {'Optimisé (Ko)':>14} {'Gain':>7}")
+        for (report_type, fmt), size in sizes.items():
+            gain = 1 - size['optimized'] / size['standard'] if size['standard'] else 0
+            print(f"{report_type:<14} {fmt:<7} {size['standard'] / 1024:>14.1f} "
+                  f"{size['optimized'] / 1024:>14.1f} {gain:>6.0%}")
+        return 0
+
+    if args.startup:
+        timings = run_startup_benchmark()
+        print("Import à froid au démarrage (médiane sur 3 interpréteurs)")
+        print(f"{'Module':<24} {'Durée (ms)':>12}")
+        for module, duration in timings.items():
+            print(f"{module:<24} {duration:>12.1f}")
+        return 0
+
+    results = run_benchmark(repeat=args.repeat, dpi=args.dpi)
+    layer_stats = results.pop('layer_cache')
+
+    print(f"Rendu PNG à {args.dpi} dpi, médiane sur {args.repeat} rendus")
+    print(f"{'Graphique':<10} {'Avant (ms)':>12} {'Après (ms)':>12} {'Gain':>8} {'Statique vivant (ms)':>22}")
+    for name, timing in results.items():
+        gain = 1 - timing['after'] / timing['before'] if timing['before'] else 0
+        print(f"{name:<10} {timing['before']:>12.1f} {timing['after']:>12.1f} {gain:>7.0%} "
+              f"{timing['live_static']:>22.1f}")
+    print("Les éléments statiques restent créés sur les axes pour la mise en page (colonne "
+          "'Statique vivant') : seul leur rendu est évité.")
+    print(f"Calques en cache: {layer_stats['entries']} ({layer_stats['bytes'] / 1024:.0f} Ko), "
+          f"succès: {layer_stats['hits']}, échecs: {layer_stats['misses']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
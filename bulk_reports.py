@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de génération groupée des rapports d'infographies pour plusieurs sites.
+Chaque lot reçoit une liste de travaux (site, type de rapport, format) :
+- les sources de chaque site sont rassemblées une seule fois pour tous ses rapports ;
+- chaque rapport est mis en page une seule fois pour tous ses formats ;
+- les rendus sont répartis sur plusieurs processus ;
+- un manifeste JSON récapitule fichiers, durées et échecs.
+
+Utilisation en ligne de commande :
+    python bulk_reports.py --sites site-a,site-b --types network,vulnerability --formats png,pdf
+    python bulk_reports.py --jobs travaux.json --workers 4
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from protocol_analyzer import PROTOCOL_ANALYSES_FILE, ProtocolAnalyzer
+from report_data import DEFAULT_WIFI_RESULTS_FILE, REPORT_TYPES, build_report_data, collect_report_sources
+from security_scoring import DEVICES_SECURITY_FILE, DeviceSecurityScoring
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Répertoire des données par site : <SITES_DIR>/<site>/{devices_security,wifi_results}.json
+SITES_DIR = os.path.join('instance', 'sites')
+
+# Site utilisant les données de l'instance principale
+DEFAULT_SITE = 'default'
+
+# Répertoire des lots générés : <BULK_REPORTS_DIR>/<identifiant du lot>/
+BULK_REPORTS_DIR = os.path.join('instance', 'bulk_reports')
+BULK_MANIFEST_FILENAME = 'manifest.json'
+
+# Formats disponibles pour la génération groupée
+BULK_FORMATS = ('png', 'pdf', 'svg')
+
+# Noms de sites et de lots autorisés (utilisés comme noms de répertoires)
+_SAFE_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+
+# Générateur propre à chaque processus de rendu
+_worker_generator = None
+
+# Lots lancés en arrière-plan depuis l'API
+_running_runs: Dict[str, threading.Thread] = {}
+_running_runs_lock = threading.Lock()
+
+
+def get_site_paths(site: str, sites_dir: str = SITES_DIR) -> Dict[str, str]:
+    """
+    Renvoie les fichiers de données d'un site
+
+    Args:
+        site: Nom du site
+        sites_dir: Répertoire des données par site
+
+    Returns:
+        Dict[str, str]: Fichiers des appareils, des réseaux WiFi et de l'historique des analyses
+    """
+    if site == DEFAULT_SITE:
+        return {
+            'devices': DEVICES_SECURITY_FILE,
+            'wifi_results': DEFAULT_WIFI_RESULTS_FILE,
+            'protocol_analyses': PROTOCOL_ANALYSES_FILE
+        }
+    if not _SAFE_NAME_PATTERN.match(site):
+        raise ValueError(f"Nom de site invalide: {site}")
+    site_dir = os.path.join(sites_dir, site)
+    return {
+        'devices': os.path.join(site_dir, 'devices_security.json'),
+        'wifi_results': os.path.join(site_dir, 'wifi_results.json'),
+        'protocol_analyses': os.path.join(site_dir, 'protocol_analyses.json')
+    }
+
+
+def build_site_snapshot(site: str, report_types: List[str], sites_dir: str = SITES_DIR) -> Dict[str, Any]:
+    """
+    Rassemble une seule fois les sources d'un site pour tous ses rapports
+
+    Args:
+        site: Nom du site
+        report_types: Types de rapports demandés pour ce site
+        sites_dir: Répertoire des données par site
+
+    Returns:
+        Dict[str, Any]: Instantané des sources (voir report_data.collect_report_sources)
+    """
+    paths = get_site_paths(site, sites_dir)
+    # Ne pas générer d'appareils d'exemple pour un site inconnu
+    if not os.path.exists(paths['devices']):
+        raise FileNotFoundError(f"Données d'appareils introuvables pour le site {site}: {paths['devices']}")
+
+    scoring = DeviceSecurityScoring(devices_file=paths['devices'])
+    analyzer = ProtocolAnalyzer(analyses_file=paths['protocol_analyses']) if 'protocol' in report_types else None
+    return collect_report_sources(scoring, analyzer, paths['wifi_results'], report_types)
+
+
+def normalize_jobs(jobs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, str]], List[Dict[str, Any]]]:
+    """
+    Valide les travaux demandés
+
+    Args:
+        jobs: Travaux {'site', 'report_type', 'format'}
+
+    Returns:
+        Tuple: (travaux valides, entrées de manifeste des travaux rejetés)
+    """
+    valid = []
+    rejected = []
+    for job in jobs:
+        site = str(job.get('site', DEFAULT_SITE))
+        report_type = str(job.get('report_type', '')).lower()
+        fmt = str(job.get('format', 'png')).lower()
+
+        error = None
+        if site != DEFAULT_SITE and not _SAFE_NAME_PATTERN.match(site):
+            error = f"Nom de site invalide: {site}"
+        elif report_type not in REPORT_TYPES:
+            error = f"Type de rapport invalide: {report_type}"
+        elif fmt not in BULK_FORMATS:
+            error = f"Format invalide: {fmt}"
+
+        entry = {'site': site, 'report_type': report_type, 'format': fmt}
+        if error:
+            rejected.append({**entry, 'status': 'failed', 'error': error})
+        else:
+            valid.append(entry)
+    return valid, rejected
+
+
+def _init_worker() -> None:
+    """Crée le générateur d'infographies du processus de rendu"""
+    global _worker_generator
+    from infographic_generator import InfographicGenerator
+    # Pas de cache de rendus partagé entre processus (index commun)
+    _worker_generator = InfographicGenerator(use_cache=False)
+
+
+def _render_report(
+    site: str,
+    report_type: str,
+    report_data: Dict[str, Any],
+    formats: List[str],
+    output_dir: str,
+    options: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Met en page un rapport une seule fois et l'enregistre dans tous les formats demandés
+
+    Returns:
+        Dict[str, Any]: Résultat de generate_infographic_bundle complété de la durée de rendu
+    """
+    if _worker_generator is None:
+        _init_worker()
+
+    start = time.perf_counter()
+    try:
+        result = _worker_generator.generate_infographic_bundle(
+            report_type,
+            report_data,
+            formats=formats,
+            output_basename=f"{site}_{report_type}",
+            output_dir=os.path.join(output_dir, site),
+            dpi=options['dpi'],
+            use_ai=options['use_ai'],
+            optimize=options['optimize']
+        )
+    except Exception as e:
+        result = {'success': False, 'error': str(e)}
+    result['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def _write_manifest(output_dir: str, manifest: Dict[str, Any]) -> str:
+    """Enregistre le manifeste du lot (écriture atomique)"""
+    manifest_path = os.path.join(output_dir, BULK_MANIFEST_FILENAME)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
+
+
+def run_bulk_generation(
+    jobs: List[Dict[str, Any]],
+    output_dir: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    dpi: int = 150,
+    use_ai: bool = True,
+    optimize: bool = False,
+    sites_dir: str = SITES_DIR,
+    run_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Génère un lot de rapports pour plusieurs sites
+
+    Args:
+        jobs: Travaux {'site', 'report_type', 'format'}
+        output_dir: Répertoire du lot (par défaut: BULK_REPORTS_DIR/<identifiant du lot>)
+        max_workers: Nombre de processus de rendu (1 pour un rendu dans le processus courant)
+        dpi: Résolution en points par pouce
+        use_ai: Utiliser l'IA pour enrichir les données (si disponible)
+        optimize: Produire des fichiers optimisés en taille
+        sites_dir: Répertoire des données par site
+        run_id: Identifiant du lot (généré si absent)
+
+    Returns:
+        Dict[str, Any]: Manifeste du lot (également enregistré dans le répertoire du lot)
+    """
+    run_id = run_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    output_dir = output_dir or os.path.join(BULK_REPORTS_DIR, run_id)
+    os.makedirs(output_dir, exist_ok=True)
+    max_workers = max_workers or os.cpu_count() or 1
+    options = {'dpi': dpi, 'use_ai': use_ai, 'optimize': optimize}
+
+    started_at = datetime.now().isoformat()
+    start = time.perf_counter()
+    valid_jobs, rejected = normalize_jobs(jobs)
+
+    # Regrouper les formats par site puis par rapport (une mise en page par rapport)
+    plan: Dict[str, Dict[str, List[str]]] = {}
+    for job in valid_jobs:
+        formats = plan.setdefault(job['site'], {}).setdefault(job['report_type'], [])
+        if job['format'] not in formats:
+            formats.append(job['format'])
+
+    # 1. Instantanés des sources, une seule fois par site
+    snapshots = {}
+    tasks = []
+    results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for site, reports in plan.items():
+        snapshot_start = time.perf_counter()
+        try:
+            sources = build_site_snapshot(site, list(reports), sites_dir)
+            snapshots[site] = {'duration_ms': round((time.perf_counter() - snapshot_start) * 1000, 1)}
+        except Exception as e:
+            logger.error(f"Erreur lors de la collecte des données du site {site}: {e}")
+            snapshots[site] = {'error': str(e)}
+            for report_type in reports:
+                results[(site, report_type)] = {'success': False, 'error': f"Données du site indisponibles: {e}"}
+            continue
+
+        for report_type, formats in reports.items():
+            try:
+                tasks.append((site, report_type, build_report_data(report_type, sources), formats))
+            except Exception as e:
+                results[(site, report_type)] = {'success': False, 'error': str(e)}
+
+    # 2. Rendus en parallèle
+    if max_workers <= 1 or len(tasks) <= 1:
+        for site, report_type, report_data, formats in tasks:
+            results[(site, report_type)] = _render_report(site, report_type, report_data, formats, output_dir, options)
+    else:
+        # « spawn » : pas de fork d'un processus multithread (serveur web, nettoyeur d'exports)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks)), mp_context=context,
+                                 initializer=_init_worker) as executor:
+            futures = {
+                executor.submit(_render_report, site, report_type, report_data, formats, output_dir, options):
+                    (site, report_type)
+                for site, report_type, report_data, formats in tasks
+            }
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = {'success': False, 'error': str(e)}
+
+    # 3. Manifeste : une entrée par travail demandé, dans l'ordre de la demande
+    entries = []
+    for job in valid_jobs:
+        result = results.get((job['site'], job['report_type']), {'success': False, 'error': 'Rapport non généré'})
+        entry = {**job, 'render_ms': result.get('duration_ms')}
+        path = result.get('files', {}).get(job['format']) if result.get('success') else None
+        if path:
+            entry.update({'status': 'success', 'path': path, 'size': result['sizes'][job['format']]})
+        else:
+            entry.update({'status': 'failed', 'error': result.get('error', 'Fichier non produit')})
+        entries.append(entry)
+    entries.extend(rejected)
+
+    failed = sum(1 for entry in entries if entry['status'] == 'failed')
+    manifest = {
+        'run_id': run_id,
+        'started_at': started_at,
+        'finished_at': datetime.now().isoformat(),
+        'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+        'output_dir': output_dir,
+        'workers': max_workers,
+        'options': options,
+        'snapshots': snapshots,
+        'jobs': entries,
+        'summary': {
+            'total': len(entries),
+            'succeeded': len(entries) - failed,
+            'failed': failed
+        }
+    }
+    _write_manifest(output_dir, manifest)
+    logger.info(
+        f"Lot {run_id} terminé en {manifest['duration_ms']:.0f} ms: "
+        f"{manifest['summary']['succeeded']} réussis, {failed} échecs"
+    )
+    return manifest
+
+
+def start_bulk_generation(jobs: List[Dict[str, Any]], **options) -> str:
+    """
+    Lance un lot dans un thread d'arrière-plan
+
+    Args:
+        jobs: Travaux {'site', 'report_type', 'format'}
+        **options: Options de run_bulk_generation
+
+    Returns:
+        str: Identifiant du lot
+    """
+    run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+    def run():
+        try:
+            run_bulk_generation(jobs, run_id=run_id, **options)
+        except Exception as e:
+            logger.error(f"Erreur lors de la génération du lot {run_id}: {e}")
+        finally:
+            with _running_runs_lock:
+                _running_runs.pop(run_id, None)
+
+    thread = threading.Thread(target=run, name=f'bulk-reports-{run_id}', daemon=True)
+    with _running_runs_lock:
+        _running_runs[run_id] = thread
+    thread.start()
+    return run_id
+
+
+def get_bulk_run(run_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Renvoie l'état d'un lot lancé avec start_bulk_generation
+
+    Args:
+        run_id: Identifiant du lot
+
+    Returns:
+        Optional[Dict[str, Any]]: {'status': 'running'} ou manifeste du lot terminé, None si inconnu
+    """
+    with _running_runs_lock:
+        if run_id in _running_runs:
+            return {'run_id': run_id, 'status': 'running'}
+    if not _SAFE_NAME_PATTERN.match(run_id):
+        return None
+    manifest_path = os.path.join(BULK_REPORTS_DIR, run_id, BULK_MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return {**json.load(f), 'status': 'finished'}
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Génération groupée des rapports d'infographies")
+    parser.add_argument('--jobs', help="Fichier JSON de travaux [{'site', 'report_type', 'format'}, ...]")
+    parser.add_argument('--sites', default=DEFAULT_SITE, help="Sites séparés par des virgules")
+    parser.add_argument('--types', default=','.join(REPORT_TYPES), help="Types de rapports séparés par des virgules")
+    parser.add_argument('--formats', default='png', help="Formats séparés par des virgules")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de processus de rendu")
+    parser.add_argument('--output', help="Répertoire du lot")
+    parser.add_argument('--dpi', type=int, default=150, help="Résolution des rendus")
+    parser.add_argument('--optimize', action='store_true', help="Produire des fichiers optimisés en taille")
+    parser.add_argument('--no-ai', action='store_true', help="Ne pas enrichir les données avec l'IA")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.jobs:
+        with open(args.jobs, 'r', encoding='utf-8') as f:
+            jobs = json.load(f)
+    else:
+        jobs = [
+            {'site': site, 'report_type': report_type, 'format': fmt}
+            for site in args.sites.split(',')
+            for report_type in args.types.split(',')
+            for fmt in args.formats.split(',')
+        ]
+
+    manifest = run_bulk_generation(
+        jobs,
+        output_dir=args.output,
+        max_workers=args.workers,
+        dpi=args.dpi,
+        use_ai=not args.no_ai,
+        optimize=args.optimize
+    )
+    summary = manifest['summary']
+    print(f"Lot {manifest['run_id']}: {summary['succeeded']}/{summary['total']} réussis "
+          f"en {manifest['duration_ms'] / 1000:.1f} s")
+    print(f"Manifeste: {os.path.join(manifest['output_dir'], BULK_MANIFEST_FILENAME)}")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Module des histogrammes de latence des clones IA.
+Les durées sont comptées dans des classes de largeur logarithmique fixe
+(chaque borne vaut 2^(1/4) fois la précédente, soit au plus ~19 %
+d'erreur relative sur un percentile), par type de demande, pour la durée
+totale, l'attente en file et l'exécution. Les vues portent sur toute la
+vie du clone et sur une fenêtre glissante des dernières minutes.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+# Bornes supérieures des classes de latence, en secondes (0,5 ms à ~131 s)
+LATENCY_BUCKETS = tuple(0.0005 * 2 ** (i / 4) for i in range(73))
+
+# Percentiles publiés
+PERCENTILES = (50, 95, 99)
+
+# Fenêtre glissante : 10 tranches de 30 secondes (5 minutes)
+WINDOW_SECONDS = 300
+WINDOW_SLOT_SECONDS = 30
+
+# Durées mesurées pour chaque demande
+LATENCY_KINDS = ('total', 'queue_wait', 'execution')
+
+# Regroupement des types de demande inconnus (le type vient du client)
+OTHER_REQUEST_TYPE = 'other'
+
+
+class LatencyHistogram:
+    """Histogramme de latences à classes fixes"""
+
+    def __init__(self):
+        """Initialise un histogramme vide (une classe de plus pour les dépassements)"""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """
+        Comptabilise une durée
+
+        Args:
+            value: Durée en secondes
+        """
+        value = max(0.0, value)
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """
+        Ajoute les mesures d'un autre histogramme
+
+        Args:
+            other: Histogramme à fusionner
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estime un percentile (borne supérieure de sa classe, plafonnée au maximum observé)
+
+        Args:
+            percent: Percentile entre 0 et 100
+
+        Returns:
+            float: Latence estimée en secondes (0 si aucune mesure)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * percent // 100))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                if index < len(LATENCY_BUCKETS):
+                    return min(LATENCY_BUCKETS[index], self.max)
+                break
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Résume l'histogramme
+
+        Returns:
+            Dict[str, Any]: Nombre de mesures, moyenne, maximum et percentiles (en secondes)
+        """
+        summary = {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max
+        }
+        for percent in PERCENTILES:
+            summary[f'p{percent}'] = self.percentile(percent)
+        return summary
+
+
+def _new_section() -> Dict[str, Any]:
+    """Crée les compteurs d'un type de demande"""
+    return {
+        'latency': {kind: LatencyHistogram() for kind in LATENCY_KINDS},
+        'errors': {}
+    }
+
+
+class LatencyRecorder:
+    """Latences et erreurs d'un clone par type de demande, sur toute sa vie et sur une fenêtre glissante"""
+
+    def __init__(self, window_seconds: int = WINDOW_SECONDS, slot_seconds: int = WINDOW_SLOT_SECONDS,
+                 known_types: Optional[Iterable[str]] = None):
+        """
+        Initialise l'enregistreur
+
+        Args:
+            window_seconds: Durée de la fenêtre glissante en secondes
+            slot_seconds: Durée d'une tranche de la fenêtre en secondes
+            known_types: Types de demande suivis séparément, les autres étant
+                         regroupés sous 'other' (tous les types si None)
+        """
+        self.window_seconds = window_seconds
+        self.slot_seconds = slot_seconds
+        self.known_types = frozenset(known_types) if known_types is not None else None
+        self.lifetime: Dict[str, Dict[str, Any]] = {}
+        # Tranches récentes : (numéro de tranche, compteurs par type de demande)
+        self.slots = deque()
+        self._lock = threading.Lock()
+
+    def _sections(self, request_type: str, now: float):
+        """Renvoie les compteurs du type de demande, à vie et dans la tranche courante (verrou tenu)"""
+        if self.known_types is not None and request_type not in self.known_types:
+            request_type = OTHER_REQUEST_TYPE
+        slot_id = int(now // self.slot_seconds)
+        if not self.slots or self.slots[-1][0] != slot_id:
+            self.slots.append((slot_id, {}))
+            oldest = slot_id - self.window_seconds // self.slot_seconds
+            while self.slots[0][0] <= oldest:
+                self.slots.popleft()
+        lifetime = self.lifetime.setdefault(request_type, _new_section())
+        current = self.slots[-1][1].setdefault(request_type, _new_section())
+        return lifetime, current
+
+    def record(self, request_type: str, total: float, queue_wait: float, execution: float,
+               now: Optional[float] = None) -> None:
+        """
+        Enregistre les durées d'une demande traitée
+
+        Args:
+            request_type: Type de demande
+            total: Durée totale en secondes (de la soumission au résultat)
+            queue_wait: Attente en file en secondes
+            execution: Durée d'exécution en secondes
+            now: Instant de la mesure (maintenant si None)
+        """
+        durations = {'total': total, 'queue_wait': queue_wait, 'execution': execution}
+        with self._lock:
+            for section in self._sections(request_type, now or time.time()):
+                for kind, value in durations.items():
+                    section['latency'][kind].record(value)
+
+    def record_error(self, request_type: str, error_code: str, now: Optional[float] = None) -> None:
+        """
+        Enregistre une demande en erreur
+
+        Args:
+            request_type: Type de demande
+            error_code: Code d'erreur (overloaded, timeout, unavailable, failed)
+            now: Instant de l'erreur (maintenant si None)
+        """
+        with self._lock:
+            for section in self._sections(request_type, now or time.time()):
+                section['errors'][error_code] = section['errors'].get(error_code, 0) + 1
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Résume les latences et les erreurs
+
+        Args:
+            now: Instant de référence de la fenêtre (maintenant si None)
+
+        Returns:
+            Dict[str, Any]: Vues 'lifetime' et 'window' par type de demande
+        """
+        oldest = int((now or time.time()) // self.slot_seconds) - self.window_seconds // self.slot_seconds
+        with self._lock:
+            window: Dict[str, Dict[str, Any]] = {}
+            for slot_id, sections in self.slots:
+                if slot_id <= oldest:
+                    continue
+                for request_type, section in sections.items():
+                    merged = window.setdefault(request_type, _new_section())
+                    for kind in LATENCY_KINDS:
+                        merged['latency'][kind].merge(section['latency'][kind])
+                    for error_code, count in section['errors'].items():
+                        merged['errors'][error_code] = merged['errors'].get(error_code, 0) + count
+
+            return {
+                'window_seconds': self.window_seconds,
+                'lifetime': {request_type: self._summarize(section)
+                             for request_type, section in self.lifetime.items()},
+                'window': {request_type: self._summarize(section)
+                           for request_type, section in window.items()}
+            }
+
+    @staticmethod
+    def _summarize(section: Dict[str, Any]) -> Dict[str, Any]:
+        """Résume les compteurs d'un type de demande"""
+        return {
+            **{kind: section['latency'][kind].to_dict() for kind in LATENCY_KINDS},
+            'errors': dict(section['errors'])
+        }
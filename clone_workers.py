@@ -0,0 +1,288 @@
+"""
+Module des pools de travail des clones IA.
+Chaque clone traite ses demandes dans un pool d'exécuteurs (threads ou
+processus) précédé d'une file d'attente bornée : au-delà de sa capacité, une
+demande est refusée immédiatement au lieu d'attendre, chaque demande a un
+délai maximal, et un clone mis en pause ou supprimé termine les demandes
+déjà acceptées avant de libérer ses exécuteurs.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Types d'exécuteurs disponibles
+EXECUTOR_TYPES = ('thread', 'process')
+
+# Configuration par défaut du pool d'un clone
+DEFAULT_WORKER_CONFIG = {
+    'executor': 'thread',
+    'max_workers': 2,
+    'queue_size': 32,
+    'timeout': 10.0
+}
+MAX_WORKERS_LIMIT = 32
+
+
+def normalize_worker_config(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Complète et borne une configuration de pool
+
+    Args:
+        config: Configuration partielle (valeurs par défaut pour les clés absentes ou invalides)
+
+    Returns:
+        Dict[str, Any]: Configuration complète
+    """
+    normalized = dict(DEFAULT_WORKER_CONFIG)
+    for key, value in (config or {}).items():
+        if key not in DEFAULT_WORKER_CONFIG:
+            continue
+        try:
+            if key == 'executor':
+                if value in EXECUTOR_TYPES:
+                    normalized[key] = value
+            elif key == 'max_workers':
+                normalized[key] = max(1, min(int(value), MAX_WORKERS_LIMIT))
+            elif key == 'queue_size':
+                normalized[key] = max(0, int(value))
+            elif key == 'timeout':
+                if float(value) > 0:
+                    normalized[key] = float(value)
+        except (TypeError, ValueError):
+            logger.warning(f"Valeur invalide ignorée pour {key}: {value}")
+    return normalized
+
+
+def timed_call(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float, float]:
+    """
+    Exécute une tâche en relevant ses instants de début et de fin
+
+    Args:
+        fn: Fonction à exécuter
+        *args: Arguments de la fonction
+
+    Returns:
+        Tuple: (résultat, début, fin) ; les instants (time.time) restent
+               comparables d'un processus à l'autre
+    """
+    started_at = time.time()
+    result = fn(*args)
+    return result, started_at, time.time()
+
+
+# Clones reconstruits dans chaque processus d'exécution, par identifiant
+_worker_clones: Dict[str, Any] = {}
+
+def process_clone_request(clone_state: Dict[str, Any], request_type: str, data: Dict[str, Any]) -> Any:
+    """
+    Traite une demande dans un processus d'exécution
+
+    Le clone est reconstruit une fois par processus (puis à chaque changement
+    de version ou de paramètres) à partir de son état.
+
+    Args:
+        clone_state: Paramètres du clone (AIClone.worker_state)
+        request_type: Type de demande
+        data: Données à analyser
+
+    Returns:
+        Any: Résultat de l'analyse
+    """
+    from ai_clone_manager import AIClone
+
+    cached = _worker_clones.get(clone_state['clone_id'])
+    if cached is None or cached[0] != clone_state:
+        clone = AIClone(
+            name=clone_state['name'],
+            specialization=clone_state['specialization'],
+            learning_rate=clone_state['learning_rate'],
+            confidence_threshold=clone_state['confidence_threshold'],
+            clone_id=clone_state['clone_id']
+        )
+        clone.version = clone_state['version']
+        cached = (clone_state, clone)
+        _worker_clones[clone_state['clone_id']] = cached
+    return cached[1]._process_by_type(request_type, data)
+
+
+class PoolFuture(Future):
+    """
+    Résultat d'une tâche du pool, délivré seulement après la libération de sa place
+
+    Le résultat de l'exécuteur est recopié ici par le rappel de fin de tâche,
+    une fois le compteur de demandes en cours décrémenté : un appelant qui
+    reçoit le résultat voit déjà le pool libéré (utile à la répartition).
+    """
+
+    def __init__(self, task: Future):
+        """
+        Args:
+            task: Tâche soumise à l'exécuteur
+        """
+        super().__init__()
+        self._task = task
+
+    def cancel(self) -> bool:
+        """Annule la tâche si elle n'a pas commencé (l'annulation est recopiée par le rappel)"""
+        return self._task.cancel()
+
+
+class CloneWorkerPool:
+    """Pool d'exécuteurs d'un clone, avec file d'attente bornée et arrêt progressif"""
+
+    def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialise le pool (les exécuteurs sont démarrés à la première demande)
+
+        Args:
+            name: Nom du pool (pour les journaux et les noms de threads)
+            config: Configuration du pool (voir DEFAULT_WORKER_CONFIG)
+        """
+        self.name = name
+        self.config = normalize_worker_config(config)
+        self.capacity = self.config['max_workers'] + self.config['queue_size']
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._accepting = True
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'in_flight': 0
+        }
+
+    def _create_executor(self):
+        """Crée l'exécuteur configuré"""
+        if self.config['executor'] == 'process':
+            # « spawn » : pas de fork d'un processus multithread (serveur web)
+            return ProcessPoolExecutor(
+                max_workers=self.config['max_workers'],
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.config['max_workers'],
+            thread_name_prefix=f"clone-{self.name}"
+        )
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        Confie une tâche au pool
+
+        Args:
+            fn: Fonction à exécuter (sérialisable pour un pool de processus)
+            *args: Arguments de la fonction
+
+        Returns:
+            PoolFuture: Résultat à venir, sous la forme (résultat, début, fin) de timed_call
+
+        Raises:
+            queue.Full: Si le pool et sa file d'attente sont pleins
+            RuntimeError: Si le pool est en cours d'arrêt
+        """
+        with self._lock:
+            if not self._accepting:
+                raise RuntimeError(f"Pool {self.name} en cours d'arrêt")
+            if self.stats['in_flight'] >= self.capacity:
+                self.stats['rejected'] += 1
+                raise queue.Full(f"Pool {self.name} saturé ({self.capacity} demandes en cours)")
+            if self._executor is None:
+                self._executor = self._create_executor()
+            # Place réservée avant la soumission : la tâche peut démarrer aussitôt
+            self.stats['in_flight'] += 1
+            try:
+                task = self._executor.submit(timed_call, fn, *args)
+            except Exception:
+                self.stats['in_flight'] -= 1
+                raise
+            self.stats['submitted'] += 1
+        future = PoolFuture(task)
+        task.add_done_callback(lambda done: self._task_done(done, future))
+        return future
+
+    def _task_done(self, task: Future, future: PoolFuture) -> None:
+        """Libère la place d'une tâche terminée ou annulée, puis délivre son résultat"""
+        with self._lock:
+            self.stats['in_flight'] -= 1
+            if not task.cancelled():
+                self.stats['completed'] += 1
+            self._slot_freed.notify_all()
+
+        if task.cancelled():
+            Future.cancel(future)
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def record_timeout(self) -> None:
+        """Comptabilise une demande abandonnée après son délai maximal"""
+        with self._lock:
+            self.stats['timeouts'] += 1
+
+    def wait_for_capacity(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend qu'une place se libère dans le pool
+
+        Args:
+            timeout: Délai maximal d'attente en secondes
+
+        Returns:
+            bool: True si une demande peut être soumise (ou si le pool s'arrête)
+        """
+        with self._lock:
+            return self._slot_freed.wait_for(
+                lambda: not self._accepting or self.stats['in_flight'] < self.capacity,
+                timeout=timeout
+            )
+
+    def stop_accepting(self) -> None:
+        """Refuse les nouvelles demandes (les demandes acceptées continuent)"""
+        with self._lock:
+            self._accepting = False
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Refuse les nouvelles demandes, attend la fin des demandes acceptées puis arrête les exécuteurs
+
+        Args:
+            timeout: Délai maximal d'attente en secondes (None pour attendre sans limite)
+
+        Returns:
+            bool: True si toutes les demandes acceptées se sont terminées dans le délai
+        """
+        with self._lock:
+            self._accepting = False
+            drained = self._slot_freed.wait_for(lambda: self.stats['in_flight'] == 0, timeout=timeout)
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            # Les demandes encore en file après le délai sont annulées
+            executor.shutdown(wait=drained, cancel_futures=not drained)
+        if not drained:
+            logger.warning(f"Pool {self.name} arrêté avec des demandes en cours")
+        return drained
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Renvoie l'état du pool
+
+        Returns:
+            Dict[str, Any]: Compteurs, capacité et configuration
+        """
+        with self._lock:
+            return {
+                **self.stats,
+                'capacity': self.capacity,
+                'accepting': self._accepting,
+                **self.config
+            }
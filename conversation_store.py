@@ -0,0 +1,866 @@
+"""
+Module de stockage des conversations de l'assistant de sécurité.
+Chaque conversation est un journal JSONL en ajout seul (un échange par ligne) :
+enregistrer un message n'écrit que ce message. Un index SQLite unique tient à
+jour, à chaque ajout, l'identifiant, la date de création, le nombre de messages
+et l'aperçu de chaque conversation, ainsi que la position de chaque message
+dans son journal. Lister les conversations ne lit aucun fichier de
+conversation, et une page de messages est lue d'un seul accès au journal.
+Les pages sont parcourues par curseur (date/identifiant pour les
+conversations, rang pour les messages).
+Les données réseau jointes aux messages, le plus souvent identiques d'un
+échange à l'autre, sont stockées une seule fois, adressées par l'empreinte de
+leur contenu ; les messages n'en conservent que la référence.
+Un index plein texte (SQLite FTS5) des questions et des réponses, mis à jour à
+chaque ajout, permet la recherche classée dans toutes les conversations.
+"""
+
+import base64
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows : verrou de processus uniquement
+    fcntl = None
+
+from data_hashing import canonicalize, compute_data_hash
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Constantes du stockage des conversations
+DEFAULT_CONVERSATIONS_DIR = os.path.join('instance', 'conversations')
+INDEX_FILENAME = 'index.db'
+LOG_EXTENSION = '.jsonl'
+LEGACY_EXTENSION = '.json'
+PREVIEW_LENGTH = 50
+NETWORK_DIRNAME = 'network'
+# Nombre de contextes réseau gardés en mémoire pour la lecture des messages
+NETWORK_CACHE_SIZE = 64
+# Version du schéma de l'index (un index plus ancien est mis à niveau à l'ouverture)
+INDEX_SCHEMA_VERSION = 5
+# Première version où les données réseau sont stockées par référence
+NETWORK_REF_SCHEMA_VERSION = 3
+# Première version indexée pour la recherche plein texte (un index plus ancien est reconstruit)
+FULL_TEXT_SCHEMA_VERSION = 4
+# Première version où les anciennes conversations JSON ont été converties en journaux
+LEGACY_FILES_SCHEMA_VERSION = 5
+
+# Tailles de page par défaut et maximales
+DEFAULT_CONVERSATIONS_PAGE_SIZE = 20
+DEFAULT_MESSAGES_PAGE_SIZE = 50
+DEFAULT_SEARCH_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+
+# Mots de liaison reconnus dans les requêtes de recherche
+SEARCH_OR_WORDS = ('or', 'ou')
+SEARCH_AND_WORDS = ('and', 'et')
+SNIPPET_TOKENS = 12
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode la position d'une page en curseur opaque
+
+    Args:
+        values: Clé de tri du dernier élément renvoyé
+
+    Returns:
+        str: Curseur utilisable dans une URL
+    """
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Décode un curseur produit par encode_cursor
+
+    Args:
+        cursor: Curseur opaque
+
+    Returns:
+        List[Any]: Clé de tri du dernier élément de la page précédente
+
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Curseur invalide: {cursor}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"Curseur invalide: {cursor}")
+    return values
+
+
+def build_search_query(text: str) -> str:
+    """
+    Construit une requête FTS5 à partir d'une saisie libre
+
+    Chaque mot est cherché tel quel (la syntaxe FTS5 de l'utilisateur n'est pas
+    interprétée) ; les mots sont combinés par ET, sauf autour de « ou »/« or ».
+    Un mot terminé par * est cherché comme préfixe.
+
+    Args:
+        text: Saisie de l'utilisateur (par exemple « KRACK ou WPS »)
+
+    Returns:
+        str: Requête FTS5
+
+    Raises:
+        ValueError: Si la saisie ne contient aucun mot
+    """
+    parts: List[str] = []
+    for term in re.findall(r'\w+\*?', text or ''):
+        word = term.rstrip('*')
+        if word.lower() in SEARCH_OR_WORDS:
+            if parts and parts[-1] != 'OR':
+                parts.append('OR')
+        elif word.lower() not in SEARCH_AND_WORDS:
+            parts.append(f'"{word}"' + ('*' if term.endswith('*') else ''))
+    if parts and parts[-1] == 'OR':
+        parts.pop()
+    if not parts:
+        raise ValueError("La recherche doit contenir au moins un mot")
+    return ' '.join(parts)
+
+
+def clamp_page_size(limit: Any, default: int) -> int:
+    """
+    Borne une taille de page demandée
+
+    Args:
+        limit: Taille demandée (éventuellement absente ou non numérique)
+        default: Taille par défaut
+
+    Returns:
+        int: Taille comprise entre 1 et MAX_PAGE_SIZE
+    """
+    try:
+        limit = int(limit) if limit is not None else default
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+class ConversationStore:
+    """Journaux de conversations en ajout seul, avec index des métadonnées et des messages"""
+
+    def __init__(self, conversations_dir: str):
+        """
+        Initialise le stockage, migre les anciennes conversations JSON et ouvre l'index
+
+        Args:
+            conversations_dir: Répertoire des conversations
+        """
+        self.conversations_dir = conversations_dir
+        self.index_path = os.path.join(conversations_dir, INDEX_FILENAME)
+        self.network_dir = os.path.join(conversations_dir, NETWORK_DIRNAME)
+        self._lock = threading.Lock()
+        self._conn = None
+        self.fts_available = False
+        # Référence -> contexte réseau sérialisé, du moins au plus récemment lu
+        self._network_cache: 'OrderedDict[str, str]' = OrderedDict()
+        os.makedirs(self.network_dir, exist_ok=True)
+        self._open()
+
+    def _open(self) -> None:
+        """Ouvre l'index SQLite, le reconstruit s'il est nouveau ou ancien et migre les anciens fichiers"""
+        try:
+            self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS conversations ("
+                "id TEXT PRIMARY KEY, created_at TEXT NOT NULL, updated_at TEXT NOT NULL, "
+                "message_count INTEGER NOT NULL, preview TEXT NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS conversations_by_date ON conversations (created_at, id);"
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "conversation_id TEXT NOT NULL, seq INTEGER NOT NULL, timestamp TEXT NOT NULL, "
+                "offset INTEGER NOT NULL, length INTEGER NOT NULL, "
+                "PRIMARY KEY (conversation_id, seq)) WITHOUT ROWID;"
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de l'ouverture de l'index des conversations {self.index_path}: {e}")
+            self._conn = None
+            return
+
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+                "user_input, response, conversation_id UNINDEXED, seq UNINDEXED, timestamp UNINDEXED, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            self._conn.commit()
+            self.fts_available = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Recherche plein texte indisponible (FTS5 non pris en charge par SQLite): {e}")
+
+        if version < INDEX_SCHEMA_VERSION:
+            if version < NETWORK_REF_SCHEMA_VERSION:
+                self.migrate_network_data()
+            if version < FULL_TEXT_SCHEMA_VERSION:
+                self.rebuild_index()
+            if version < LEGACY_FILES_SCHEMA_VERSION:
+                self.migrate_legacy_files()
+            self._conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+            self._conn.commit()
+
+    def _log_path(self, conversation_id: str) -> str:
+        """Chemin du journal d'une conversation"""
+        return os.path.join(self.conversations_dir, f"{conversation_id}{LOG_EXTENSION}")
+
+    def _open_locked_log(self, conversation_id: str):
+        """
+        Ouvre le journal d'une conversation en ajout sous verrou exclusif partagé avec les autres processus
+
+        Un journal réécrit (os.replace) entre l'ouverture et l'obtention du
+        verrou est rouvert, afin de ne jamais écrire dans l'ancien fichier.
+
+        Raises:
+            OSError: Si le journal ne peut pas être ouvert
+        """
+        log_path = self._log_path(conversation_id)
+        while True:
+            f = open(log_path, "ab")
+            if fcntl is None:
+                return f
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                if os.fstat(f.fileno()).st_ino == os.stat(log_path).st_ino:
+                    return f
+            except FileNotFoundError:
+                pass
+            f.close()
+
+    def _store_network_data(self, network_data: Any) -> Optional[str]:
+        """
+        Enregistre un contexte réseau une seule fois, adressé par l'empreinte de son contenu
+
+        Args:
+            network_data: Données réseau jointes à un message
+
+        Returns:
+            Optional[str]: Référence du contexte, ou None en cas d'échec d'écriture
+        """
+        ref = compute_data_hash(network_data)
+        path = os.path.join(self.network_dir, f"{ref}.json")
+        if os.path.exists(path):
+            return ref
+        try:
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(canonicalize(network_data))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.error(f"Erreur d'I/O lors de l'enregistrement des données réseau {ref}: {e}")
+            return None
+        return ref
+
+    def _externalize(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Remplace les données réseau d'un message par leur référence"""
+        if not message.get("network_data"):
+            return message
+        ref = self._store_network_data(message["network_data"])
+        if ref is None:
+            return message
+        message = {key: value for key, value in message.items() if key != "network_data"}
+        message["network_ref"] = ref
+        return message
+
+    def _load_network_data(self, ref: str) -> Any:
+        """Charge un contexte réseau par sa référence (None s'il est introuvable)"""
+        with self._lock:
+            serialized = self._network_cache.get(ref)
+            if serialized is not None:
+                self._network_cache.move_to_end(ref)
+        if serialized is None:
+            try:
+                with open(os.path.join(self.network_dir, f"{ref}.json"), "r", encoding="utf-8") as f:
+                    serialized = f.read()
+            except OSError as e:
+                logger.warning(f"Données réseau {ref} introuvables: {e}")
+                return None
+            with self._lock:
+                self._network_cache[ref] = serialized
+                if len(self._network_cache) > NETWORK_CACHE_SIZE:
+                    self._network_cache.popitem(last=False)
+        # Chaque message reçoit sa propre copie du contexte
+        return json.loads(serialized)
+
+    def _resolve(self, message: Dict[str, Any], include_network_data: bool = True) -> Dict[str, Any]:
+        """Restaure (ou omet) les données réseau d'un message lu dans un journal"""
+        ref = message.pop("network_ref", None)
+        if not include_network_data:
+            message.pop("network_data", None)
+        elif ref:
+            message["network_data"] = self._load_network_data(ref)
+        return message
+
+    def _scan_log(self, conversation_id: str) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """
+        Lit le journal d'une conversation en relevant la position de chaque échange
+
+        Args:
+            conversation_id: Identifiant de la conversation
+
+        Returns:
+            List[Tuple[int, int, Dict[str, Any]]]: Position, longueur (octets) et contenu de chaque échange
+        """
+        log_path = self._log_path(conversation_id)
+        if not os.path.exists(log_path):
+            return []
+
+        entries = []
+        try:
+            with open(log_path, "rb") as f:
+                offset = 0
+                for line_number, line in enumerate(f, 1):
+                    length = len(line)
+                    if line.strip():
+                        try:
+                            entries.append((offset, length, json.loads(line)))
+                        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                            # Ligne tronquée (écriture interrompue) : les autres échanges restent lisibles
+                            logger.warning(f"Ligne {line_number} invalide dans la conversation {conversation_id}: {e}")
+                    offset += length
+        except PermissionError as e:
+            logger.error(f"Erreur de permission lors de la lecture de la conversation {conversation_id}: {e}")
+        except OSError as e:
+            logger.error(f"Erreur d'I/O lors de la lecture de la conversation {conversation_id}: {e}")
+        return entries
+
+    def _index_log(self, conversation_id: str) -> int:
+        """Indexe un journal complet (métadonnées et positions des messages) ; le verrou doit être détenu"""
+        if self._conn is None:
+            return 0
+        entries = self._scan_log(conversation_id)
+        self._conn.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation_id,))
+        self._conn.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
+        if self.fts_available:
+            self._conn.execute("DELETE FROM messages_fts WHERE conversation_id = ?", (conversation_id,))
+        if not entries:
+            return 0
+
+        messages = [message for _, _, message in entries]
+        self._conn.executemany(
+            "INSERT INTO messages (conversation_id, seq, timestamp, offset, length) VALUES (?, ?, ?, ?, ?)",
+            [
+                (conversation_id, seq, message.get("timestamp", ""), offset, length)
+                for seq, (offset, length, message) in enumerate(entries)
+            ]
+        )
+        if self.fts_available:
+            self._conn.executemany(
+                "INSERT INTO messages_fts (user_input, response, conversation_id, seq, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (message.get("user_input") or "", message.get("response") or "",
+                     conversation_id, seq, message.get("timestamp", ""))
+                    for seq, message in enumerate(messages)
+                ]
+            )
+        self._conn.execute(
+            "INSERT INTO conversations (id, created_at, updated_at, message_count, preview) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                conversation_id,
+                messages[0].get("timestamp", ""),
+                messages[-1].get("timestamp", ""),
+                len(messages),
+                (messages[0].get("user_input") or "")[:PREVIEW_LENGTH]
+            )
+        )
+        return len(messages)
+
+    def append(self, conversation_id: str, message: Dict[str, Any]) -> bool:
+        """
+        Ajoute un échange à la fin du journal d'une conversation et met à jour l'index
+
+        Args:
+            conversation_id: Identifiant de la conversation
+            message: Échange à enregistrer (sérialisable en JSON)
+
+        Returns:
+            bool: True si l'échange a été enregistré
+        """
+        try:
+            data = (json.dumps(self._externalize(message), ensure_ascii=False) + "\n").encode("utf-8")
+        except TypeError as e:
+            logger.error(f"Erreur de type lors de la sérialisation JSON: {e}")
+            return False
+
+        timestamp = message.get("timestamp") or datetime.now().isoformat()
+        with self._lock:
+            try:
+                f = self._open_locked_log(conversation_id)
+            except PermissionError as e:
+                logger.error(f"Erreur de permission lors de la sauvegarde de la conversation: {e}")
+                return False
+            except OSError as e:
+                logger.error(f"Erreur d'I/O lors de la sauvegarde de la conversation: {e}")
+                return False
+
+            # Verrou exclusif partagé avec les autres processus : l'écriture et
+            # la mise à jour de l'index restent dans le même ordre pour tous
+            with f:
+                try:
+                    f.write(data)
+                    f.flush()
+                    offset = f.tell() - len(data)
+                except OSError as e:
+                    logger.error(f"Erreur d'I/O lors de la sauvegarde de la conversation: {e}")
+                    return False
+
+                if self._conn is not None:
+                    self._index_message(conversation_id, message, timestamp, offset, len(data))
+        return True
+
+    def _index_message(self, conversation_id: str, message: Dict[str, Any], timestamp: str,
+                       offset: int, length: int) -> None:
+        """
+        Indexe un échange écrit dans le journal (verrous tenus)
+
+        Le numéro d'ordre est calculé et inséré dans une même transaction
+        exclusive ; une collision échoue au lieu de remplacer une autre entrée.
+        """
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT message_count FROM conversations WHERE id = ?", (conversation_id,)
+            ).fetchone()
+            seq = row[0] if row else 0
+            self._conn.execute(
+                "INSERT INTO conversations (id, created_at, updated_at, message_count, preview) "
+                "VALUES (?, ?, ?, 1, ?) "
+                "ON CONFLICT(id) DO UPDATE SET updated_at = excluded.updated_at, "
+                "message_count = message_count + 1",
+                (conversation_id, timestamp, timestamp, (message.get("user_input") or "")[:PREVIEW_LENGTH])
+            )
+            self._conn.execute(
+                "INSERT INTO messages (conversation_id, seq, timestamp, offset, length) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (conversation_id, seq, timestamp, offset, length)
+            )
+            if self.fts_available:
+                self._conn.execute(
+                    "INSERT INTO messages_fts (user_input, response, conversation_id, seq, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (message.get("user_input") or "", message.get("response") or "",
+                     conversation_id, seq, timestamp)
+                )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            if self._conn.in_transaction:
+                self._conn.rollback()
+            logger.error(f"Erreur lors de la mise à jour de l'index des conversations {conversation_id}: {e}")
+
+    def read_log(self, conversation_id: str) -> List[Dict[str, Any]]:
+        """
+        Lit tous les échanges d'une conversation
+
+        Args:
+            conversation_id: Identifiant de la conversation
+
+        Returns:
+            List[Dict[str, Any]]: Échanges dans l'ordre d'enregistrement (liste vide si absente)
+        """
+        return [self._resolve(message) for _, _, message in self._scan_log(conversation_id)]
+
+    def read_messages_page(
+        self,
+        conversation_id: str,
+        limit: int = DEFAULT_MESSAGES_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_network_data: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Lit une page de messages d'une conversation, dans l'ordre chronologique
+
+        Seuls les octets des messages de la page sont lus dans le journal.
+
+        Args:
+            conversation_id: Identifiant de la conversation
+            limit: Nombre maximal de messages
+            cursor: Curseur renvoyé par la page précédente (None pour la première page)
+            include_network_data: False pour omettre les données réseau de chaque message
+
+        Returns:
+            Dict[str, Any]: Messages ('messages', chacun avec son rang 'seq') et curseur
+                            de la page suivante ('next_cursor', None en fin de conversation)
+
+        Raises:
+            ValueError: Si le curseur est invalide
+        """
+        after = -1
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 1 or not isinstance(values[0], int):
+                raise ValueError(f"Curseur invalide: {cursor}")
+            after = values[0]
+
+        page = {"messages": [], "next_cursor": None}
+        if self._conn is None:
+            return page
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, offset, length FROM messages WHERE conversation_id = ? AND seq > ? "
+                "ORDER BY seq LIMIT ?",
+                (conversation_id, after, limit + 1)
+            ).fetchall()
+        if not rows:
+            return page
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        start = rows[0][1]
+        try:
+            # Les messages consécutifs sont contigus dans le journal : un seul accès suffit
+            with open(self._log_path(conversation_id), "rb") as f:
+                f.seek(start)
+                chunk = f.read(rows[-1][1] + rows[-1][2] - start)
+        except OSError as e:
+            logger.error(f"Erreur d'I/O lors de la lecture de la conversation {conversation_id}: {e}")
+            return page
+
+        for seq, offset, length in rows:
+            try:
+                message = json.loads(chunk[offset - start:offset - start + length])
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                logger.warning(f"Message {seq} invalide dans la conversation {conversation_id}: {e}")
+                continue
+            message = self._resolve(message, include_network_data)
+            message["seq"] = seq
+            page["messages"].append(message)
+
+        if has_more:
+            page["next_cursor"] = encode_cursor([rows[-1][0]])
+        return page
+
+    def get_metadata(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Renvoie les métadonnées indexées d'une conversation
+
+        Args:
+            conversation_id: Identifiant de la conversation
+
+        Returns:
+            Optional[Dict[str, Any]]: Métadonnées, ou None si la conversation est inconnue
+        """
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, created_at, updated_at, message_count, preview FROM conversations WHERE id = ?",
+                (conversation_id,)
+            ).fetchone()
+        return self._row_to_metadata(row) if row else None
+
+    def list_conversations(self) -> List[Dict[str, Any]]:
+        """
+        Liste les métadonnées de toutes les conversations depuis l'index
+
+        Returns:
+            List[Dict[str, Any]]: Métadonnées, de la plus récente à la plus ancienne
+        """
+        if self._conn is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, created_at, updated_at, message_count, preview FROM conversations "
+                "ORDER BY created_at DESC, id DESC"
+            ).fetchall()
+        return [self._row_to_metadata(row) for row in rows]
+
+    def list_conversations_page(
+        self,
+        limit: int = DEFAULT_CONVERSATIONS_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Liste une page de conversations, de la plus récente à la plus ancienne
+
+        Args:
+            limit: Nombre maximal de conversations
+            cursor: Curseur renvoyé par la page précédente (None pour la première page)
+
+        Returns:
+            Dict[str, Any]: Métadonnées ('conversations') et curseur de la page
+                            suivante ('next_cursor', None sur la dernière page)
+
+        Raises:
+            ValueError: Si le curseur est invalide
+        """
+        query = "SELECT id, created_at, updated_at, message_count, preview FROM conversations"
+        params: List[Any] = []
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 2 or not all(isinstance(value, str) for value in values):
+                raise ValueError(f"Curseur invalide: {cursor}")
+            query += " WHERE (created_at, id) < (?, ?)"
+            params += values
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        page = {"conversations": [], "next_cursor": None}
+        if self._conn is None:
+            return page
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        page["conversations"] = [self._row_to_metadata(row) for row in rows[:limit]]
+        if len(rows) > limit:
+            last = page["conversations"][-1]
+            page["next_cursor"] = encode_cursor([last["created_at"], last["id"]])
+        return page
+
+    def search(
+        self,
+        text: str,
+        limit: int = DEFAULT_SEARCH_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Recherche des messages par leur question ou leur réponse, classés par pertinence (BM25)
+
+        Args:
+            text: Mots recherchés (« ou »/« or » entre deux mots pour l'un ou l'autre)
+            limit: Nombre maximal de résultats
+            cursor: Curseur renvoyé par la page précédente (None pour la première page)
+            since: Date ISO de début incluse (par exemple « 2024-05 »)
+            until: Date ISO de fin exclue
+
+        Returns:
+            Dict[str, Any]: Résultats ('hits' : conversation, rang du message, date,
+                            score et extrait surligné) et curseur de la page suivante
+
+        Raises:
+            ValueError: Si la recherche ou le curseur est invalide
+            RuntimeError: Si la recherche plein texte est indisponible
+        """
+        if self._conn is None or not self.fts_available:
+            raise RuntimeError("Recherche plein texte indisponible")
+        match = build_search_query(text)
+
+        inner = (
+            "SELECT rowid, bm25(messages_fts) AS score, conversation_id, seq, timestamp "
+            "FROM messages_fts WHERE messages_fts MATCH ?"
+        )
+        params: List[Any] = [match]
+        if since:
+            inner += " AND timestamp >= ?"
+            params.append(since)
+        if until:
+            inner += " AND timestamp < ?"
+            params.append(until)
+        query = f"SELECT rowid, score, conversation_id, seq, timestamp FROM ({inner})"
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 2 or not isinstance(values[0], (int, float)) or not isinstance(values[1], int):
+                raise ValueError(f"Curseur invalide: {cursor}")
+            query += " WHERE (score, rowid) > (?, ?)"
+            params += values
+        query += " ORDER BY score, rowid LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(query, params).fetchall()
+                page_rows = rows[:limit]
+                # Extraits calculés pour les seuls résultats de la page
+                snippets = dict(self._conn.execute(
+                    "SELECT rowid, snippet(messages_fts, -1, '[', ']', '…', ?) FROM messages_fts "
+                    f"WHERE messages_fts MATCH ? AND rowid IN ({','.join('?' * len(page_rows))})",
+                    [SNIPPET_TOKENS, match] + [row[0] for row in page_rows]
+                ).fetchall()) if page_rows else {}
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Recherche invalide: {e}") from e
+
+        page = {
+            "hits": [
+                {
+                    "conversation_id": conversation_id,
+                    "seq": seq,
+                    "timestamp": timestamp,
+                    # BM25 de FTS5 est négatif : plus il est bas, plus le message est pertinent
+                    "score": round(-score, 4),
+                    "snippet": snippets.get(rowid, "")
+                }
+                for rowid, score, conversation_id, seq, timestamp in page_rows
+            ],
+            "next_cursor": None
+        }
+        if len(rows) > limit:
+            last = page_rows[-1]
+            page["next_cursor"] = encode_cursor([last[1], last[0]])
+        return page
+
+    @staticmethod
+    def _row_to_metadata(row: tuple) -> Dict[str, Any]:
+        """Convertit une ligne de l'index en dictionnaire de métadonnées"""
+        conversation_id, created_at, updated_at, message_count, preview = row
+        return {
+            "id": conversation_id,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "message_count": message_count,
+            "preview": preview
+        }
+
+    def rebuild_index(self) -> int:
+        """
+        Reconstruit l'index à partir des journaux présents sur le disque
+
+        Returns:
+            int: Nombre de conversations indexées
+        """
+        if self._conn is None:
+            return 0
+        count = 0
+        with self._lock:
+            self._conn.execute("DELETE FROM messages")
+            self._conn.execute("DELETE FROM conversations")
+            if self.fts_available:
+                self._conn.execute("DELETE FROM messages_fts")
+            for filename in os.listdir(self.conversations_dir):
+                if filename.endswith(LOG_EXTENSION):
+                    if self._index_log(filename[:-len(LOG_EXTENSION)]):
+                        count += 1
+            self._conn.commit()
+        if count:
+            logger.info(f"Index des conversations reconstruit ({count} conversations)")
+        return count
+
+    def migrate_legacy_files(self) -> int:
+        """
+        Convertit les anciennes conversations (un tableau JSON par fichier) en journaux JSONL indexés
+
+        Appelée une seule fois par index (voir LEGACY_FILES_SCHEMA_VERSION).
+        Chaque conversation est convertie sous le verrou de son journal ; un
+        fichier déjà converti par un autre processus est ignoré.
+
+        Returns:
+            int: Nombre de conversations migrées
+        """
+        migrated = 0
+        for filename in os.listdir(self.conversations_dir):
+            if not filename.endswith(LEGACY_EXTENSION):
+                continue
+            conversation_id = filename[:-len(LEGACY_EXTENSION)]
+            legacy_path = os.path.join(self.conversations_dir, filename)
+
+            with self._lock:
+                try:
+                    log_file = self._open_locked_log(conversation_id)
+                except OSError as e:
+                    logger.error(f"Erreur d'I/O lors de la migration de la conversation {conversation_id}: {e}")
+                    continue
+                with log_file:
+                    if not self._migrate_legacy_file(conversation_id, legacy_path):
+                        continue
+            migrated += 1
+
+        if migrated:
+            logger.info(f"{migrated} conversations migrées au format JSONL")
+        return migrated
+
+    def _migrate_legacy_file(self, conversation_id: str, legacy_path: str) -> bool:
+        """Convertit une ancienne conversation en journal (verrous tenus) ; renvoie True si elle a été migrée"""
+        filename = os.path.basename(legacy_path)
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                messages = json.load(f)
+        except FileNotFoundError:
+            return False
+        except json.JSONDecodeError as e:
+            logger.error(f"Format JSON invalide pour le fichier {filename}: {e}")
+            return False
+        except OSError as e:
+            logger.error(f"Erreur d'I/O lors de la lecture de {filename}: {e}")
+            return False
+        if not isinstance(messages, list):
+            logger.error(f"Conversation {filename} ignorée : un tableau d'échanges est attendu")
+            return False
+
+        try:
+            # Les échanges déjà journalisés sous le nouveau format suivent les anciens
+            messages = [self._externalize(message) for message in messages]
+            messages += [message for _, _, message in self._scan_log(conversation_id)]
+            self._rewrite_log(conversation_id, messages)
+            os.remove(legacy_path)
+        except (OSError, TypeError) as e:
+            logger.error(f"Erreur lors de la migration de la conversation {conversation_id}: {e}")
+            return False
+        if self._conn is not None:
+            self._index_log(conversation_id)
+            self._conn.commit()
+        return True
+
+    def _rewrite_log(self, conversation_id: str, messages: List[Dict[str, Any]]) -> None:
+        """Réécrit atomiquement le journal d'une conversation"""
+        temp_path = f"{self._log_path(conversation_id)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for message in messages:
+                f.write(json.dumps(message, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self._log_path(conversation_id))
+
+    def migrate_network_data(self) -> int:
+        """
+        Remplace les données réseau intégrées aux journaux existants par des références
+
+        Returns:
+            int: Nombre de conversations réécrites
+        """
+        migrated = 0
+        for filename in os.listdir(self.conversations_dir):
+            if not filename.endswith(LOG_EXTENSION):
+                continue
+            conversation_id = filename[:-len(LOG_EXTENSION)]
+            with self._lock:
+                try:
+                    log_file = self._open_locked_log(conversation_id)
+                except OSError as e:
+                    logger.error(f"Erreur lors de la migration des données réseau de {conversation_id}: {e}")
+                    continue
+                with log_file:
+                    messages = [message for _, _, message in self._scan_log(conversation_id)]
+                    if not any(message.get("network_data") for message in messages):
+                        continue
+                    try:
+                        self._rewrite_log(conversation_id, [self._externalize(message) for message in messages])
+                    except (OSError, TypeError) as e:
+                        logger.error(f"Erreur lors de la migration des données réseau de {conversation_id}: {e}")
+                        continue
+                    if self._conn is not None:
+                        self._index_log(conversation_id)
+                        self._conn.commit()
+            migrated += 1
+
+        if migrated:
+            logger.info(f"Données réseau dédupliquées dans {migrated} conversations")
+        return migrated
+
+
+# Instances partagées, par répertoire de conversations
+_store_instances: Dict[str, ConversationStore] = {}
+_store_instances_lock = threading.Lock()
+
+def get_conversation_store(conversations_dir: str = DEFAULT_CONVERSATIONS_DIR) -> ConversationStore:
+    """Récupère l'instance partagée du stockage des conversations d'un répertoire"""
+    key = os.path.abspath(conversations_dir)
+    with _store_instances_lock:
+        if key not in _store_instances:
+            _store_instances[key] = ConversationStore(conversations_dir)
+        return _store_instances[key]
@@ -0,0 +1,37 @@
+"""
+Module d'empreintes des données.
+Sérialisation JSON canonique (clés triées, séparateurs compacts) et empreinte
+SHA-256 partagées par les caches d'insights et de rendus et par le stockage
+des conversations : des données égales donnent la même clé quel que soit
+l'ordre de leurs clés.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+
+def canonicalize(data: Any) -> str:
+    """
+    Sérialise des données de manière canonique (clés triées, séparateurs compacts)
+
+    Args:
+        data: Données à sérialiser
+
+    Returns:
+        str: Représentation JSON stable des données
+    """
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def compute_data_hash(data: Any) -> str:
+    """
+    Calcule l'empreinte stable de données (indépendante de l'ordre des clés)
+
+    Args:
+        data: Données à hasher
+
+    Returns:
+        str: Empreinte SHA-256 hexadécimale du JSON canonique
+    """
+    return hashlib.sha256(canonicalize(data).encode('utf-8')).hexdigest()
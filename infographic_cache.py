@@ -0,0 +1,519 @@
+"""
+Module de cache des rendus d'infographies.
+Associe une empreinte stable des données d'entrée (type de rapport, données,
+format, résolution, option IA) au fichier déjà rendu afin d'éviter de
+régénérer plusieurs fois la même infographie, et fournit un nettoyeur
+d'arrière-plan qui borne la taille et l'âge du répertoire d'exports.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from data_hashing import compute_data_hash
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Répertoire racine des exports d'infographies
+DEFAULT_EXPORT_DIR = os.path.join("static", "exports")
+
+# Constantes par défaut du cache
+DEFAULT_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200 Mo
+DEFAULT_CACHE_MAX_AGE = 24 * 3600  # 24 heures
+DEFAULT_INDEX_FILENAME = 'render_cache.db'
+LEGACY_INDEX_FILENAME = 'render_cache.json'
+# Attente maximale (secondes) du verrou de l'index tenu par un autre processus
+INDEX_BUSY_TIMEOUT = 10
+
+# Constantes par défaut du nettoyeur d'exports
+DEFAULT_EXPORT_QUOTA_BYTES = 500 * 1024 * 1024  # 500 Mo
+DEFAULT_EXPORT_MAX_AGE = 24 * 3600  # 24 heures
+DEFAULT_JANITOR_INTERVAL = 600  # 10 minutes
+
+
+class RenderCache:
+    """Cache adressé par contenu pour les fichiers d'infographies générés"""
+
+    def __init__(
+        self,
+        export_dir: str,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        max_age: float = DEFAULT_CACHE_MAX_AGE
+    ):
+        """
+        Initialise le cache de rendus
+
+        L'index est une base SQLite partagée par tous les processus qui
+        exportent dans le même répertoire : chaque opération lit et écrit la
+        base dans une transaction, sans copie en mémoire qui pourrait écraser
+        les entrées d'un autre processus.
+
+        Args:
+            export_dir: Répertoire racine des exports (l'index y est stocké)
+            max_bytes: Taille totale maximale des fichiers en cache (octets)
+            max_age: Âge maximal d'une entrée en secondes
+        """
+        self.export_dir = export_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.index_file = os.path.join(export_dir, DEFAULT_INDEX_FILENAME)
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0
+        }
+        self._lock = threading.Lock()
+        self._conn = None
+        self._open()
+
+    def _open(self) -> None:
+        """Ouvre l'index SQLite et y importe l'ancien index JSON s'il existe"""
+        try:
+            os.makedirs(self.export_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.index_file, timeout=INDEX_BUSY_TIMEOUT, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS renders ("
+                "key TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Erreur lors de l'ouverture de l'index du cache de rendus: {e}")
+            self._conn = None
+            return
+        self._import_legacy_index()
+
+    def _import_legacy_index(self) -> None:
+        """Importe puis supprime l'ancien index JSON (sans remplacer les entrées déjà en base)"""
+        legacy_file = os.path.join(self.export_dir, LEGACY_INDEX_FILENAME)
+        if not os.path.exists(legacy_file):
+            return
+        try:
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO renders (key, path, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    [(key, e.get('path', ''), e.get('size', 0), e.get('created_at', 0), e.get('last_access', 0))
+                     for key, e in entries.items()]
+                )
+                self._conn.commit()
+            os.remove(legacy_file)
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, AttributeError, OSError, sqlite3.Error) as e:
+            logger.error(f"Erreur lors de l'import de l'ancien index du cache de rendus: {e}")
+
+    def _rollback(self) -> None:
+        """Annule la transaction en cours après une erreur"""
+        try:
+            self._conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    def compute_key(
+        self,
+        report_type: str,
+        data: Dict[str, Any],
+        format: str,
+        dpi: int,
+        use_ai: bool,
+        optimize: bool = False
+    ) -> str:
+        """
+        Calcule la clé de cache d'un rendu
+
+        Args:
+            report_type: Type de rapport ('network', 'protocol', 'vulnerability')
+            data: Données d'entrée du rapport
+            format: Format de sortie
+            dpi: Résolution en points par pouce
+            use_ai: Enrichissement IA activé ou non
+            optimize: Sortie optimisée en taille
+
+        Returns:
+            str: Empreinte SHA-256 hexadécimale
+        """
+        key_data = {
+            'report_type': report_type,
+            'data': data,
+            'format': format.lower(),
+            'dpi': int(dpi),
+            'use_ai': bool(use_ai)
+        }
+        # Les clés des rendus standard restent inchangées
+        if optimize:
+            key_data['optimize'] = True
+        return compute_data_hash(key_data)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Renvoie le chemin du rendu associé à la clé s'il est encore valide
+
+        Args:
+            key: Clé de cache
+
+        Returns:
+            Optional[str]: Chemin vers le fichier en cache ou None
+        """
+        with self._lock:
+            if self._conn is None:
+                self.stats['misses'] += 1
+                return None
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                row = self._conn.execute(
+                    "SELECT path, created_at FROM renders WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self._conn.commit()
+                    self.stats['misses'] += 1
+                    return None
+
+                path, created_at = row
+                expired = time.time() - created_at > self.max_age
+                if expired or not os.path.exists(path):
+                    self._remove_entry(key, delete_file=expired)
+                    self._conn.commit()
+                    self.stats['misses'] += 1
+                    return None
+
+                # Le dernier accès est écrit en base pour guider l'éviction de tous les processus
+                self._conn.execute("UPDATE renders SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Erreur lors de la lecture du cache de rendus: {e}")
+                self._rollback()
+                self.stats['misses'] += 1
+                return None
+
+            self.stats['hits'] += 1
+            return path
+
+    def put(self, key: str, path: str) -> None:
+        """
+        Enregistre un rendu dans le cache puis applique la politique d'éviction
+
+        Args:
+            key: Clé de cache
+            path: Chemin vers le fichier rendu
+        """
+        if not os.path.exists(path):
+            return
+
+        now = time.time()
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                # Un fichier réécrit invalide les entrées qui pointaient vers son ancien contenu
+                self._conn.execute("DELETE FROM renders WHERE path = ? AND key != ?", (path, key))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO renders (key, path, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (key, path, os.path.getsize(path), now, now)
+                )
+                self._evict_locked(protect=key)
+                self._conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                logger.error(f"Erreur lors de l'enregistrement dans le cache de rendus: {e}")
+                self._rollback()
+                return
+            self.stats['stores'] += 1
+
+    def evict(self) -> int:
+        """
+        Supprime les entrées expirées puis les moins récemment utilisées
+        jusqu'à respecter la taille maximale
+
+        Returns:
+            int: Nombre d'entrées supprimées
+        """
+        with self._lock:
+            if self._conn is None:
+                return 0
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                evicted = self._evict_locked()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Erreur lors de l'éviction du cache de rendus: {e}")
+                self._rollback()
+                return 0
+            return evicted
+
+    def _evict_locked(self, protect: Optional[str] = None) -> int:
+        """Applique l'éviction (le verrou et la transaction doivent être détenus)"""
+        now = time.time()
+        evicted = 0
+
+        # Éviction par âge
+        expired = self._conn.execute(
+            "SELECT key FROM renders WHERE created_at < ? AND key IS NOT ?", (now - self.max_age, protect)
+        ).fetchall()
+        for (key,) in expired:
+            self._remove_entry(key)
+            evicted += 1
+
+        # Éviction par taille (LRU)
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM renders").fetchone()[0]
+        if total_size > self.max_bytes:
+            by_access = self._conn.execute(
+                "SELECT key, size FROM renders WHERE key IS NOT ? ORDER BY last_access", (protect,)
+            ).fetchall()
+            for key, size in by_access:
+                if total_size <= self.max_bytes:
+                    break
+                total_size -= size
+                self._remove_entry(key)
+                evicted += 1
+
+        self.stats['evictions'] += evicted
+        return evicted
+
+    def _remove_entry(self, key: str, delete_file: bool = True) -> None:
+        """Retire une entrée de l'index et supprime éventuellement son fichier (transaction détenue)"""
+        row = self._conn.execute("SELECT path FROM renders WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return
+        self._conn.execute("DELETE FROM renders WHERE key = ?", (key,))
+        path = row[0]
+        # Ne pas supprimer un fichier encore référencé par une autre entrée
+        if delete_file and path and self._conn.execute(
+                "SELECT 1 FROM renders WHERE path = ? LIMIT 1", (path,)).fetchone() is None:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Erreur lors de la suppression du fichier en cache {path}: {e}")
+
+    def get_last_access(self) -> Dict[str, float]:
+        """
+        Renvoie la date du dernier accès connu pour chaque fichier en cache
+
+        Returns:
+            Dict[str, float]: Chemin absolu du fichier -> horodatage du dernier accès
+        """
+        with self._lock:
+            if self._conn is None:
+                return {}
+            try:
+                rows = self._conn.execute("SELECT path, MAX(last_access) FROM renders GROUP BY path").fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Erreur lors de la lecture du cache de rendus: {e}")
+                return {}
+            last_access = {}
+            for path, accessed_at in rows:
+                path = os.path.abspath(path)
+                last_access[path] = max(last_access.get(path, 0), accessed_at)
+            return last_access
+
+    def clear(self) -> None:
+        """Vide complètement le cache et supprime les fichiers associés"""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                for (key,) in self._conn.execute("SELECT key FROM renders").fetchall():
+                    self._remove_entry(key)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Erreur lors du vidage du cache de rendus: {e}")
+                self._rollback()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Renvoie les statistiques d'utilisation du cache
+
+        Returns:
+            Dict[str, Any]: Compteurs, taux de succès et occupation
+        """
+        with self._lock:
+            entries, total_bytes = 0, 0
+            if self._conn is not None:
+                try:
+                    entries, total_bytes = self._conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM renders"
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.error(f"Erreur lors de la lecture du cache de rendus: {e}")
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(self.stats['hits'] / lookups, 4) if lookups else 0.0,
+                'entries': entries,
+                'total_bytes': total_bytes,
+                'max_bytes': self.max_bytes,
+                'max_age': self.max_age
+            }
+
+
+class ExportJanitor:
+    """Nettoyeur d'arrière-plan du répertoire d'exports (quota en octets, durée de vie, LRU)"""
+
+    def __init__(
+        self,
+        export_dir: str = DEFAULT_EXPORT_DIR,
+        max_bytes: int = DEFAULT_EXPORT_QUOTA_BYTES,
+        max_age: float = DEFAULT_EXPORT_MAX_AGE,
+        interval: float = DEFAULT_JANITOR_INTERVAL,
+        render_cache: Optional[RenderCache] = None
+    ):
+        """
+        Initialise le nettoyeur
+
+        Args:
+            export_dir: Répertoire des exports à surveiller (sous-répertoires compris)
+            max_bytes: Taille totale maximale des exports (octets)
+            max_age: Âge maximal d'un export en secondes
+            interval: Intervalle entre deux passages en secondes
+            render_cache: Cache de rendus dont les dates d'accès guident l'éviction LRU
+        """
+        self.export_dir = export_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.interval = interval
+        self.render_cache = render_cache
+        self.stats = {
+            'sweeps': 0,
+            'removed_files': 0,
+            'freed_bytes': 0,
+            'last_sweep': None
+        }
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _list_exports(self) -> List[Dict[str, Any]]:
+        """Recense les fichiers d'export (hors index du cache de rendus)"""
+        files = []
+        for root, _, filenames in os.walk(self.export_dir):
+            for filename in filenames:
+                # Index du cache de rendus et ses journaux SQLite (-journal, -wal)
+                if filename.startswith(DEFAULT_INDEX_FILENAME) or filename == LEGACY_INDEX_FILENAME \
+                        or filename.endswith('.tmp'):
+                    continue
+                path = os.path.abspath(os.path.join(root, filename))
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append({
+                    'path': path,
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime,
+                    'inode': (stat.st_dev, stat.st_ino)
+                })
+        return files
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Supprime les exports expirés puis les moins récemment utilisés
+        jusqu'à respecter le quota
+
+        Returns:
+            Dict[str, int]: Nombre de fichiers supprimés et octets libérés
+        """
+        # Le cache de rendus applique d'abord sa propre politique d'éviction
+        last_access = {}
+        if self.render_cache is not None:
+            self.render_cache.evict()
+            last_access = self.render_cache.get_last_access()
+
+        now = time.time()
+        files = self._list_exports()
+        removed = 0
+
+        def remove(file_info) -> bool:
+            nonlocal removed
+            try:
+                os.remove(file_info['path'])
+                removed += 1
+                return True
+            except FileNotFoundError:
+                return True
+            except OSError as e:
+                logger.error(f"Erreur lors de la suppression de l'export {file_info['path']}: {e}")
+                return False
+
+        # Les liens physiques partagent le même contenu : un inode n'est libéré qu'avec son dernier lien
+        inode_sizes = {f['inode']: f['size'] for f in files}
+        inode_links: Dict[Any, int] = {}
+        for file_info in files:
+            inode_links[file_info['inode']] = inode_links.get(file_info['inode'], 0) + 1
+
+        def release(file_info) -> int:
+            inode_links[file_info['inode']] -= 1
+            return inode_sizes[file_info['inode']] if inode_links[file_info['inode']] == 0 else 0
+
+        total_size = sum(inode_sizes.values())
+        freed = 0
+
+        # Éviction par âge
+        kept = []
+        for file_info in files:
+            if now - file_info['mtime'] > self.max_age and remove(file_info):
+                freed += release(file_info)
+            else:
+                kept.append(file_info)
+        total_size -= freed
+
+        # Éviction par taille (LRU)
+        if total_size > self.max_bytes:
+            by_access = sorted(kept, key=lambda f: last_access.get(f['path'], f['mtime']))
+            for file_info in by_access:
+                if total_size <= self.max_bytes:
+                    break
+                if remove(file_info):
+                    released = release(file_info)
+                    total_size -= released
+                    freed += released
+
+        self.stats['sweeps'] += 1
+        self.stats['removed_files'] += removed
+        self.stats['freed_bytes'] += freed
+        self.stats['last_sweep'] = now
+        if removed:
+            logger.info(f"Nettoyage des exports: {removed} fichier(s) supprimé(s), {freed} octets libérés")
+        return {'removed_files': removed, 'freed_bytes': freed}
+
+    def _run(self) -> None:
+        """Boucle du thread de nettoyage"""
+        while not self._stop_event.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Erreur lors du nettoyage des exports: {e}")
+            self._stop_event.wait(self.interval)
+
+    def start(self) -> None:
+        """Démarre le nettoyage périodique dans un thread d'arrière-plan"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='export-janitor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Arrête le nettoyage périodique"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Renvoie les statistiques du nettoyeur"""
+        return {
+            **self.stats,
+            'max_bytes': self.max_bytes,
+            'max_age': self.max_age,
+            'interval': self.interval,
+            'running': self._thread is not None and self._thread.is_alive()
+        }
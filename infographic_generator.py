@@ -8,6 +8,7 @@ import json
 import logging
 import os
 import shutil
+import zipfile
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 
@@ -18,6 +19,12 @@ import numpy as np
 from matplotlib.colors import LinearSegmentedColormap
 from matplotlib.patches import Patch
 
+from infographic_cache import DEFAULT_EXPORT_DIR, ExportJanitor, RenderCache
+from infographic_reduction import get_data_reduction_options, lttb_indices, top_n_with_others
+from infographic_layers import StaticLayerCache, apply_static_layers, draw_static_elements, enable_static_layers
+from infographic_previews import PREVIEWS_DIR, PreviewCache
+from infographic_output import save_figure
+
 # Configuration du logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,19 +39,55 @@ except ImportError:
     logger.warning("Module ai_infographic_assistant non disponible, fonctionnalités IA limitées")
 
 # Constantes pour les chemins de fichiers
-EXPORT_DIR = os.path.join("static", "exports")
+EXPORT_DIR = DEFAULT_EXPORT_DIR
 TEMPLATES_DIR = os.path.join("static", "templates")
-PREVIEWS_DIR = os.path.join("static", "img", "previews")
+
+# Résolution des aperçus (SVG) générés en arrière-plan
+PREVIEW_DPI = 72
+
+# Préfixes des fichiers générés par type de rapport
+REPORT_FILE_PREFIXES = {
+    'network': 'network_security',
+    'protocol': 'protocol_analysis',
+    'vulnerability': 'vulnerability_report'
+}
+
+# Formats pouvant être produits à partir d'une même figure
+BUNDLE_FORMATS = ['png', 'pdf', 'svg']
+
+# Formats raster pour lesquels les éléments statiques sont composés depuis un calque en cache
+STATIC_LAYER_FORMATS = ['png']
+
+# Colonnes du tableau comparatif des protocoles
+PROTOCOL_TABLE_HEADERS = ['Protocole', 'Niveau de sécurité', 'Année', 'Statut', 'Vulnérabilités', 'Recommandation']
+PROTOCOL_TABLE_COLUMN_WIDTHS = [0.10, 0.18, 0.07, 0.15, 0.25, 0.25]
 
 
 class InfographicGenerator:
     """Générateur d'infographies pour les données de vulnérabilité réseau"""
     
-    def __init__(self):
-        """Initialisation du générateur d'infographies"""
+    def __init__(self, use_cache: bool = True):
+        """
+        Initialisation du générateur d'infographies
+        
+        Args:
+            use_cache: Réutiliser les rendus identiques déjà générés (par défaut: True)
+        """
         # Créer les répertoires nécessaires s'ils n'existent pas
         os.makedirs(EXPORT_DIR, exist_ok=True)
         
+        # Cache des rendus adressé par le contenu des données
+        self.render_cache = RenderCache(EXPORT_DIR) if use_cache else None
+        
+        # Nettoyeur du répertoire d'exports (démarré par l'application via start())
+        self.export_janitor = ExportJanitor(EXPORT_DIR, render_cache=self.render_cache)
+        
+        # Calques statiques pré-rendus (fonds de jauge, grilles, en-têtes) pour les sorties raster
+        self.static_layer_cache = StaticLayerCache()
+        
+        # Aperçus versionnés par le code du générateur, rendus hors du chemin des requêtes
+        self.preview_cache = PreviewCache(PREVIEWS_DIR)
+        
         # Configurer les styles de matplotlib
         plt.style.use('dark_background')
         
@@ -79,7 +122,8 @@ class InfographicGenerator:
         format: str = 'png',
         dpi: int = 150,
         interactive: bool = False,
-        use_ai: bool = True
+        use_ai: bool = True,
+        optimize: bool = False
     ) -> str:
         """
         Génère une infographie complète de sécurité réseau
@@ -87,15 +131,31 @@ class InfographicGenerator:
         Args:
             network_data: Données sur les réseaux et leur sécurité
             vulnerability_data: Données sur les vulnérabilités détectées
-            output_filename: Nom du fichier de sortie (optionnel)
+            output_filename: Nom du fichier de sortie (optionnel). Un nom explicite force un
+                             nouveau rendu à ce nom, sans consulter le cache des rendus
             format: Format de sortie (png, pdf, svg, html)
             dpi: Résolution en points par pouce (pour PNG et PDF)
             interactive: Inclure des éléments interactifs (pour PDF et HTML)
             use_ai: Utiliser l'IA pour enrichir les données (si disponible)
+            optimize: Produire un fichier optimisé en taille (PNG en palette, SVG avec texte, PDF à polices sous-ensemblées)
             
         Returns:
             str: Chemin vers le fichier infographique généré
         """
+        # Valider le format
+        format = format.lower()
+        if format not in ['png', 'pdf', 'svg', 'html']:
+            format = 'png'
+        
+        # Réutiliser un rendu identique déjà généré
+        cache_key, cached_path = self._lookup_render_cache(
+            'network',
+            {'network_data': network_data, 'vulnerability_data': vulnerability_data},
+            format, dpi, interactive, use_ai, optimize, explicit_output=bool(output_filename)
+        )
+        if cached_path:
+            return cached_path
+        
         # Enrichissement des données avec l'IA si disponible
         if use_ai and ai_assistant is not None:
             try:
@@ -104,11 +164,6 @@ class InfographicGenerator:
             except Exception as e:
                 logger.error(f"Erreur lors de l'enrichissement IA des données: {e}")
         
-        # Valider le format
-        format = format.lower()
-        if format not in ['png', 'pdf', 'svg', 'html']:
-            format = 'png'
-        
         # Générer un nom de fichier basé sur la date et l'heure si non spécifié
         if not output_filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -147,40 +202,16 @@ class InfographicGenerator:
                 return output_path
         
         # Pour les autres formats (png, pdf, svg) ou si le template HTML n'existe pas
-        # Créer une figure avec plusieurs sous-graphiques
-        fig = plt.figure(figsize=(12, 15), dpi=dpi)
-        fig.suptitle("RAPPORT DE SÉCURITÉ RÉSEAU", fontsize=24, fontweight='bold', y=0.98)
-        subtitle = f"Généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}"
-        fig.text(0.5, 0.96, subtitle, fontsize=14, ha='center')
-        
-        # Définir la mise en page des sous-graphiques
-        gs = fig.add_gridspec(4, 2, height_ratios=[1, 1.5, 1.5, 1])
-        
-        # 1. Score de sécurité global (jauge)
-        self._create_security_score_gauge(fig, gs[0, 0], network_data.get('overall_score', 0))
-        
-        # 2. Distribution des protocoles (camembert)
-        self._create_protocol_distribution_chart(fig, gs[0, 1], network_data.get('protocol_distribution', {}))
+        fig = self._build_network_security_figure(network_data, vulnerability_data, dpi, static_layers=format in STATIC_LAYER_FORMATS)
         
-        # 3. Vulnérabilités par type (graphique à barres horizontales)
-        self._create_vulnerability_types_chart(fig, gs[1, 0], vulnerability_data.get('vulnerability_types', {}))
-        
-        # 4. Graphique radar des dimensions de sécurité
-        self._create_security_dimensions_radar(fig, gs[1, 1], network_data.get('security_dimensions', {}))
-        
-        # 5. Top des appareils vulnérables (barres de progression)
-        self._create_vulnerable_devices_chart(fig, gs[2, 0], network_data.get('devices', []))
-        
-        # 6. Tendance de sécurité (graphique linéaire)
-        self._create_security_trend_chart(fig, gs[2, 1], network_data.get('security_trend', []))
-        
-        # 7. Recommandations principales (liste textuelle)
-        self._create_recommendations_section(fig, gs[3, :], vulnerability_data.get('recommendations', []))
+        # Sauvegarder l'image
+        try:
+            save_figure(fig, output_path, format, optimize)
+        finally:
+            plt.close(fig)
         
-        # Ajuster l'espacement et sauvegarder l'image
-        plt.tight_layout(rect=[0, 0, 1, 0.95])
-        plt.savefig(output_path, bbox_inches='tight')
-        plt.close(fig)
+        if cache_key:
+            self.render_cache.put(cache_key, output_path)
         
         logger.info(f"Infographie de sécurité réseau générée: {output_path}")
         return output_path
@@ -192,22 +223,38 @@ class InfographicGenerator:
         format: str = 'png',
         dpi: int = 150,
         interactive: bool = False,
-        use_ai: bool = True
+        use_ai: bool = True,
+        optimize: bool = False
     ) -> str:
         """
         Génère une infographie d'analyse de protocole WiFi
         
         Args:
             protocol_data: Données d'analyse de protocole
-            output_filename: Nom du fichier de sortie (optionnel)
+            output_filename: Nom du fichier de sortie (optionnel). Un nom explicite force un
+                             nouveau rendu à ce nom, sans consulter le cache des rendus
             format: Format de sortie (png, pdf, svg, html)
             dpi: Résolution en points par pouce (pour PNG et PDF)
             interactive: Inclure des éléments interactifs (pour PDF et HTML)
             use_ai: Utiliser l'IA pour enrichir les données (si disponible)
+            optimize: Produire un fichier optimisé en taille (PNG en palette, SVG avec texte, PDF à polices sous-ensemblées)
             
         Returns:
             str: Chemin vers le fichier infographique généré
         """
+        # Valider le format
+        format = format.lower()
+        if format not in ['png', 'pdf', 'svg', 'html']:
+            format = 'png'
+        
+        # Réutiliser un rendu identique déjà généré
+        cache_key, cached_path = self._lookup_render_cache(
+            'protocol', {'protocol_data': protocol_data}, format, dpi, interactive, use_ai, optimize,
+            explicit_output=bool(output_filename)
+        )
+        if cached_path:
+            return cached_path
+        
         # Enrichissement des données avec l'IA si disponible
         if use_ai and ai_assistant is not None:
             try:
@@ -215,10 +262,6 @@ class InfographicGenerator:
                 logger.info("Données enrichies avec l'IA pour le rapport d'analyse de protocole")
             except Exception as e:
                 logger.error(f"Erreur lors de l'enrichissement IA des données: {e}")
-        # Valider le format
-        format = format.lower()
-        if format not in ['png', 'pdf', 'svg', 'html']:
-            format = 'png'
         
         # Générer un nom de fichier basé sur la date et l'heure si non spécifié
         if not output_filename:
@@ -257,38 +300,16 @@ class InfographicGenerator:
                 return output_path
         
         # Pour les autres formats (png, pdf, svg) ou si le template HTML n'existe pas
-        # Créer une figure avec plusieurs sous-graphiques
-        fig = plt.figure(figsize=(12, 16), dpi=dpi)
-        fig.suptitle("ANALYSE DES PROTOCOLES WIFI", fontsize=24, fontweight='bold', y=0.98)
-        subtitle = f"Généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}"
-        fig.text(0.5, 0.96, subtitle, fontsize=14, ha='center')
-        
-        # Définir la mise en page des sous-graphiques
-        gs = fig.add_gridspec(4, 2, height_ratios=[1, 1.5, 1.5, 1.5])
-        
-        # 1. Score moyen des protocoles (jauge)
-        self._create_security_score_gauge(fig, gs[0, 0], protocol_data.get('average_score', 0), 
-                                        title="Score moyen des protocoles")
-        
-        # 2. Distribution des protocoles (camembert)
-        self._create_protocol_distribution_chart(fig, gs[0, 1], protocol_data.get('protocol_distribution', {}))
+        fig = self._build_protocol_analysis_figure(protocol_data, dpi, static_layers=format in STATIC_LAYER_FORMATS)
         
-        # 3. Comparaison des protocoles (tableau)
-        self._create_protocol_comparison_table(fig, gs[1, :], protocol_data.get('protocols', []))
-        
-        # 4. Vulnérabilités par protocole (graphique à barres empilées)
-        self._create_protocol_vulnerabilities_chart(fig, gs[2, 0], protocol_data.get('vulnerability_by_protocol', {}))
-        
-        # 5. Forces relatives des protocoles (graphique radar)
-        self._create_protocol_strength_radar(fig, gs[2, 1], protocol_data.get('protocol_strengths', {}))
-        
-        # 6. Recommandations pour améliorer la sécurité (liste textuelle)
-        self._create_recommendations_section(fig, gs[3, :], protocol_data.get('recommendations', []))
+        # Sauvegarder l'image
+        try:
+            save_figure(fig, output_path, format, optimize)
+        finally:
+            plt.close(fig)
         
-        # Ajuster l'espacement et sauvegarder l'image
-        plt.tight_layout(rect=[0, 0, 1, 0.95])
-        plt.savefig(output_path, bbox_inches='tight')
-        plt.close(fig)
+        if cache_key:
+            self.render_cache.put(cache_key, output_path)
         
         logger.info(f"Infographie d'analyse de protocole générée: {output_path}")
         return output_path
@@ -300,22 +321,38 @@ class InfographicGenerator:
         format: str = 'png',
         dpi: int = 150,
         interactive: bool = False,
-        use_ai: bool = True
+        use_ai: bool = True,
+        optimize: bool = False
     ) -> str:
         """
         Génère une infographie détaillée des vulnérabilités
         
         Args:
             vulnerability_data: Données sur les vulnérabilités détectées
-            output_filename: Nom du fichier de sortie (optionnel)
+            output_filename: Nom du fichier de sortie (optionnel). Un nom explicite force un
+                             nouveau rendu à ce nom, sans consulter le cache des rendus
             format: Format de sortie (png, pdf, svg, html)
             dpi: Résolution en points par pouce (pour PNG et PDF)
             interactive: Inclure des éléments interactifs (pour PDF et HTML)
             use_ai: Utiliser l'IA pour enrichir les données (si disponible)
+            optimize: Produire un fichier optimisé en taille (PNG en palette, SVG avec texte, PDF à polices sous-ensemblées)
             
         Returns:
             str: Chemin vers le fichier infographique généré
         """
+        # Valider le format
+        format = format.lower()
+        if format not in ['png', 'pdf', 'svg', 'html']:
+            format = 'png'
+        
+        # Réutiliser un rendu identique déjà généré
+        cache_key, cached_path = self._lookup_render_cache(
+            'vulnerability', {'vulnerability_data': vulnerability_data},
+            format, dpi, interactive, use_ai, optimize, explicit_output=bool(output_filename)
+        )
+        if cached_path:
+            return cached_path
+        
         # Enrichissement des données avec l'IA si disponible
         if use_ai and ai_assistant is not None:
             try:
@@ -323,11 +360,6 @@ class InfographicGenerator:
                 logger.info("Données enrichies avec l'IA pour le rapport de vulnérabilités")
             except Exception as e:
                 logger.error(f"Erreur lors de l'enrichissement IA des données: {e}")
-                
-        # Valider le format
-        format = format.lower()
-        if format not in ['png', 'pdf', 'svg', 'html']:
-            format = 'png'
         
         # Générer un nom de fichier basé sur la date et l'heure si non spécifié
         if not output_filename:
@@ -366,8 +398,318 @@ class InfographicGenerator:
                 return output_path
         
         # Pour les autres formats (png, pdf, svg) ou si le template HTML n'existe pas
+        fig = self._build_vulnerability_report_figure(vulnerability_data, dpi, static_layers=format in STATIC_LAYER_FORMATS)
+        
+        # Sauvegarder l'image
+        try:
+            save_figure(fig, output_path, format, optimize)
+        finally:
+            plt.close(fig)
+        
+        if cache_key:
+            self.render_cache.put(cache_key, output_path)
+        
+        logger.info(f"Infographie de rapport de vulnérabilité générée: {output_path}")
+        return output_path
+    
+    def generate_infographic_bundle(
+        self,
+        report_type: str,
+        report_data: Dict[str, Any],
+        formats: Optional[List[str]] = None,
+        output_basename: Optional[str] = None,
+        dpi: int = 150,
+        use_ai: bool = True,
+        create_zip: bool = False,
+        optimize: bool = False,
+        output_dir: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Génère une infographie dans plusieurs formats à partir d'une seule mise en page
+        
+        La figure est construite une seule fois puis enregistrée dans chaque format
+        demandé, au lieu d'un rendu complet par format.
+        
+        Args:
+            report_type: Type de rapport ('network', 'protocol', 'vulnerability')
+            report_data: Données du rapport, structurées comme celles de _generate_sample_data
+                         (ex: {'network_data': ..., 'vulnerability_data': ...})
+            formats: Formats à produire parmi png, pdf et svg (par défaut: les trois)
+            output_basename: Nom de base des fichiers, sans extension (optionnel). Comme
+                             output_dir, une valeur explicite force un nouveau rendu de
+                             chaque format, sans consulter le cache des rendus
+            dpi: Résolution en points par pouce (pour PNG et PDF)
+            use_ai: Utiliser l'IA pour enrichir les données (si disponible)
+            create_zip: Regrouper également les fichiers dans une archive ZIP
+            optimize: Produire des fichiers optimisés en taille
+            output_dir: Répertoire des fichiers produits (par défaut: sous-répertoire du type dans EXPORT_DIR)
+            
+        Returns:
+            Dict: Chemins et tailles (octets) des fichiers par format, archive ZIP éventuelle
+                  et formats rendus/en cache
+        """
+        if report_type not in REPORT_FILE_PREFIXES:
+            return {
+                'success': False,
+                'error': f"Type de rapport invalide: {report_type}"
+            }
+        
+        # Valider les formats en conservant l'ordre demandé
+        requested = [f.lower() for f in (formats or BUNDLE_FORMATS)]
+        formats = [f for f in dict.fromkeys(requested) if f in BUNDLE_FORMATS]
+        if not formats:
+            return {
+                'success': False,
+                'error': f"Aucun format valide parmi: {', '.join(requested)}"
+            }
+        
+        explicit_output = bool(output_basename or output_dir)
+        if not output_basename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_basename = f"{REPORT_FILE_PREFIXES[report_type]}_{timestamp}"
+        else:
+            output_basename = os.path.splitext(output_basename)[0]
+        
+        export_subdir = output_dir or os.path.join(EXPORT_DIR, report_type)
+        os.makedirs(export_subdir, exist_ok=True)
+        
+        # Réutiliser les formats déjà rendus pour ces données
+        files = {}
+        cached_formats = []
+        pending = []
+        for fmt in formats:
+            cache_key, cached_path = self._lookup_render_cache(
+                report_type, report_data, fmt, dpi, False, use_ai, optimize, explicit_output=explicit_output
+            )
+            if cached_path:
+                files[fmt] = cached_path
+                cached_formats.append(fmt)
+            else:
+                pending.append((fmt, cache_key))
+        
+        # Une seule mise en page pour tous les formats manquants
+        if pending:
+            data = self._enrich_report_data(report_type, report_data, use_ai)
+            static_layers = all(fmt in STATIC_LAYER_FORMATS for fmt, _ in pending)
+            fig = self._build_report_figure(report_type, data, dpi, static_layers=static_layers)
+            try:
+                for fmt, cache_key in pending:
+                    output_path = os.path.join(export_subdir, f"{output_basename}.{fmt}")
+                    save_figure(fig, output_path, fmt, optimize)
+                    files[fmt] = output_path
+                    if cache_key:
+                        self.render_cache.put(cache_key, output_path)
+            finally:
+                plt.close(fig)
+        
+        files = {fmt: files[fmt] for fmt in formats}
+        
+        # Archive ZIP optionnelle
+        zip_path = None
+        if create_zip:
+            zip_path = os.path.join(export_subdir, f"{output_basename}.zip")
+            with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for fmt, path in files.items():
+                    archive.write(path, arcname=f"{output_basename}.{fmt}")
+        
+        logger.info(
+            f"Lot d'infographies {report_type} généré ({', '.join(formats)}) "
+            f"- rendus: {len(pending)}, en cache: {len(cached_formats)}"
+        )
+        
+        return {
+            'success': True,
+            'report_type': report_type,
+            'files': files,
+            'sizes': {fmt: os.path.getsize(path) for fmt, path in files.items()},
+            'zip': zip_path,
+            'rendered_formats': [fmt for fmt, _ in pending],
+            'cached_formats': cached_formats
+        }
+    
+    def _enrich_report_data(self, report_type: str, report_data: Dict[str, Any], use_ai: bool) -> Dict[str, Any]:
+        """
+        Enrichit les données d'un rapport avec l'IA si disponible
+        
+        Args:
+            report_type: Type de rapport ('network', 'protocol', 'vulnerability')
+            report_data: Données du rapport
+            use_ai: Utiliser l'IA pour enrichir les données
+            
+        Returns:
+            Dict: Données du rapport (enrichies si possible)
+        """
+        data = dict(report_data)
+        if not use_ai or ai_assistant is None:
+            return data
+        
+        enrichers = {
+            'network': ('network_data', ai_assistant.enrich_network_security_data),
+            'protocol': ('protocol_data', ai_assistant.enrich_protocol_analysis_data),
+            'vulnerability': ('vulnerability_data', ai_assistant.enrich_vulnerability_data)
+        }
+        key, enrich = enrichers[report_type]
+        try:
+            data[key] = enrich(data.get(key, {}))
+            logger.info(f"Données enrichies avec l'IA pour le rapport {report_type}")
+        except Exception as e:
+            logger.error(f"Erreur lors de l'enrichissement IA des données: {e}")
+        return data
+    
+    def _build_report_figure(self, report_type: str, report_data: Dict[str, Any], dpi: int, static_layers: bool = False):
+        """Construit la figure correspondant au type de rapport"""
+        if report_type == 'network':
+            return self._build_network_security_figure(
+                report_data.get('network_data', {}), report_data.get('vulnerability_data', {}), dpi, static_layers
+            )
+        elif report_type == 'protocol':
+            return self._build_protocol_analysis_figure(report_data.get('protocol_data', {}), dpi, static_layers)
+        return self._build_vulnerability_report_figure(report_data.get('vulnerability_data', {}), dpi, static_layers)
+    
+    def _lookup_render_cache(
+        self,
+        report_type: str,
+        data: Dict[str, Any],
+        format: str,
+        dpi: int,
+        interactive: bool,
+        use_ai: bool,
+        optimize: bool = False,
+        explicit_output: bool = False
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Calcule la clé de cache d'un rendu et cherche un fichier déjà généré
+        
+        Args:
+            report_type: Type de rapport ('network', 'protocol', 'vulnerability')
+            data: Données d'entrée (avant enrichissement IA)
+            format: Format de sortie validé
+            dpi: Résolution en points par pouce
+            interactive: Rendu HTML interactif demandé
+            use_ai: Enrichissement IA demandé
+            optimize: Sortie optimisée en taille demandée
+            explicit_output: Nom ou répertoire de sortie imposé par l'appelant
+            
+        Returns:
+            Tuple: (clé de cache ou None, chemin du rendu en cache ou None)
+        """
+        # Les exports HTML interactifs sont produits à partir d'un template, sans rendu ;
+        # un fichier de sortie imposé doit exister à ce nom, avec une date de génération à jour
+        if self.render_cache is None or (format == 'html' and interactive) or explicit_output:
+            return None, None
+        
+        try:
+            cache_key = self.render_cache.compute_key(report_type, data, format, dpi, use_ai, optimize)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Impossible de calculer la clé de cache du rendu: {e}")
+            return None, None
+        
+        cached_path = self.render_cache.get(cache_key)
+        if cached_path:
+            logger.info(f"Infographie {report_type} servie depuis le cache: {cached_path}")
+        return cache_key, cached_path
+    
+    def get_render_cache_stats(self) -> Dict[str, Any]:
+        """
+        Renvoie les statistiques du cache de rendus
+        
+        Returns:
+            Dict[str, Any]: Statistiques du cache (vide si le cache est désactivé)
+        """
+        if self.render_cache is None:
+            return {}
+        return self.render_cache.get_stats()
+    
+    def _build_network_security_figure(self, network_data: Dict[str, Any], vulnerability_data: Dict[str, Any], dpi: int, static_layers: bool = False):
+        """Construit et met en page la figure du rapport de sécurité réseau"""
+        # Créer une figure avec plusieurs sous-graphiques
+        fig = plt.figure(figsize=(12, 15), dpi=dpi)
+        # Composer les éléments statiques depuis des calques en cache (sorties raster)
+        if static_layers:
+            enable_static_layers(fig)
+        fig.suptitle("RAPPORT DE SÉCURITÉ RÉSEAU", fontsize=24, fontweight='bold', y=0.98)
+        subtitle = f"Généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}"
+        fig.text(0.5, 0.96, subtitle, fontsize=14, ha='center')
+        
+        # Définir la mise en page des sous-graphiques
+        gs = fig.add_gridspec(4, 2, height_ratios=[1, 1.5, 1.5, 1])
+        
+        # 1. Score de sécurité global (jauge)
+        self._create_security_score_gauge(fig, gs[0, 0], network_data.get('overall_score', 0))
+        
+        # 2. Distribution des protocoles (camembert)
+        self._create_protocol_distribution_chart(fig, gs[0, 1], network_data.get('protocol_distribution', {}))
+        
+        # 3. Vulnérabilités par type (graphique à barres horizontales)
+        self._create_vulnerability_types_chart(fig, gs[1, 0], vulnerability_data.get('vulnerability_types', {}))
+        
+        # 4. Graphique radar des dimensions de sécurité
+        self._create_security_dimensions_radar(fig, gs[1, 1], network_data.get('security_dimensions', {}))
+        
+        # Réduction des grandes séries avant tracé (paramétrable par rapport)
+        reduction = get_data_reduction_options(network_data.get('data_reduction'))
+        
+        # 5. Top des appareils vulnérables (barres de progression)
+        self._create_vulnerable_devices_chart(fig, gs[2, 0], network_data.get('devices', []), reduction)
+        
+        # 6. Tendance de sécurité (graphique linéaire)
+        self._create_security_trend_chart(fig, gs[2, 1], network_data.get('security_trend', []), reduction)
+        
+        # 7. Recommandations principales (liste textuelle)
+        self._create_recommendations_section(fig, gs[3, :], vulnerability_data.get('recommendations', []))
+        
+        # Ajuster l'espacement
+        fig.tight_layout(rect=[0, 0, 1, 0.95])
+        if static_layers:
+            apply_static_layers(fig, self.static_layer_cache)
+        return fig
+    
+    def _build_protocol_analysis_figure(self, protocol_data: Dict[str, Any], dpi: int, static_layers: bool = False):
+        """Construit et met en page la figure d'analyse des protocoles"""
         # Créer une figure avec plusieurs sous-graphiques
         fig = plt.figure(figsize=(12, 16), dpi=dpi)
+        # Composer les éléments statiques depuis des calques en cache (sorties raster)
+        if static_layers:
+            enable_static_layers(fig)
+        fig.suptitle("ANALYSE DES PROTOCOLES WIFI", fontsize=24, fontweight='bold', y=0.98)
+        subtitle = f"Généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}"
+        fig.text(0.5, 0.96, subtitle, fontsize=14, ha='center')
+        
+        # Définir la mise en page des sous-graphiques
+        gs = fig.add_gridspec(4, 2, height_ratios=[1, 1.5, 1.5, 1.5])
+        
+        # 1. Score moyen des protocoles (jauge)
+        self._create_security_score_gauge(fig, gs[0, 0], protocol_data.get('average_score', 0), 
+                                        title="Score moyen des protocoles")
+        
+        # 2. Distribution des protocoles (camembert)
+        self._create_protocol_distribution_chart(fig, gs[0, 1], protocol_data.get('protocol_distribution', {}))
+        
+        # 3. Comparaison des protocoles (tableau)
+        self._create_protocol_comparison_table(fig, gs[1, :], protocol_data.get('protocols', []))
+        
+        # 4. Vulnérabilités par protocole (graphique à barres empilées)
+        self._create_protocol_vulnerabilities_chart(fig, gs[2, 0], protocol_data.get('vulnerability_by_protocol', {}))
+        
+        # 5. Forces relatives des protocoles (graphique radar)
+        self._create_protocol_strength_radar(fig, gs[2, 1], protocol_data.get('protocol_strengths', {}))
+        
+        # 6. Recommandations pour améliorer la sécurité (liste textuelle)
+        self._create_recommendations_section(fig, gs[3, :], protocol_data.get('recommendations', []))
+        
+        # Ajuster l'espacement
+        fig.tight_layout(rect=[0, 0, 1, 0.95])
+        if static_layers:
+            apply_static_layers(fig, self.static_layer_cache)
+        return fig
+    
+    def _build_vulnerability_report_figure(self, vulnerability_data: Dict[str, Any], dpi: int, static_layers: bool = False):
+        """Construit et met en page la figure du rapport de vulnérabilités"""
+        # Créer une figure avec plusieurs sous-graphiques
+        fig = plt.figure(figsize=(12, 16), dpi=dpi)
+        # Composer les éléments statiques depuis des calques en cache (sorties raster)
+        if static_layers:
+            enable_static_layers(fig)
         fig.suptitle("RAPPORT DÉTAILLÉ DES VULNÉRABILITÉS", fontsize=24, fontweight='bold', y=0.98)
         subtitle = f"Généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}"
         fig.text(0.5, 0.96, subtitle, fontsize=14, ha='center')
@@ -390,13 +732,11 @@ class InfographicGenerator:
         # 5. Plan d'action pour remédier aux vulnérabilités (tableau)
         self._create_remediation_plan(fig, gs[3, :], vulnerability_data.get('remediation_plan', []))
         
-        # Ajuster l'espacement et sauvegarder l'image
-        plt.tight_layout(rect=[0, 0, 1, 0.95])
-        plt.savefig(output_path, bbox_inches='tight')
-        plt.close(fig)
-        
-        logger.info(f"Infographie de rapport de vulnérabilité générée: {output_path}")
-        return output_path
+        # Ajuster l'espacement
+        fig.tight_layout(rect=[0, 0, 1, 0.95])
+        if static_layers:
+            apply_static_layers(fig, self.static_layer_cache)
+        return fig
     
     def _create_security_score_gauge(self, fig, position, score, title="Score de sécurité global"):
         """Crée une jauge pour afficher le score de sécurité"""
@@ -412,10 +752,13 @@ class InfographicGenerator:
         else:
             color = '#ff3b30'  # Rouge
         
-        # Créer un graphique en anneau pour la jauge
+        # Fond de la jauge et libellé (éléments statiques)
+        draw_static_elements(fig, ax, ('gauge', title), lambda a: self._draw_gauge_background(a, title))
+        
+        # Créer un graphique en anneau pour la jauge, par-dessus le fond
         ax.pie(
             [score, 100 - score],
-            colors=[color, '#333333'],
+            colors=[color, 'none'],
             startangle=90,
             counterclock=False,
             wedgeprops={'width': 0.3, 'edgecolor': 'none'}
@@ -424,9 +767,6 @@ class InfographicGenerator:
         # Ajouter le texte du score au centre
         ax.text(0, 0, f"{score}", ha='center', va='center', fontsize=36, fontweight='bold')
         
-        # Ajouter des étiquettes pour les niveaux
-        ax.text(0, -0.5, title, ha='center', va='center', fontsize=14)
-        
         # Catégoriser le score
         if score >= 80:
             category = "BON"
@@ -443,13 +783,35 @@ class InfographicGenerator:
         ax.set_aspect('equal')
         ax.axis('off')
     
+    def _draw_gauge_background(self, ax, title):
+        """Dessine l'anneau de fond et le libellé de la jauge"""
+        wedges, _ = ax.pie(
+            [100],
+            colors=['#333333'],
+            startangle=90,
+            counterclock=False,
+            wedgeprops={'width': 0.3, 'edgecolor': 'none'}
+        )
+        
+        # Ajouter des étiquettes pour les niveaux
+        label = ax.text(0, -0.5, title, ha='center', va='center', fontsize=14)
+        
+        ax.set_aspect('equal')
+        ax.axis('off')
+        return list(wedges) + [label]
+    
     def _create_protocol_distribution_chart(self, fig, position, protocol_distribution):
         """Crée un graphique en camembert pour la distribution des protocoles"""
         ax = fig.add_subplot(position)
         
-        # Préparer les données
-        protocols = list(protocol_distribution.keys())
-        counts = list(protocol_distribution.values())
+        # Préparer les données (les parts nulles sont omises)
+        protocols = [key for key, count in protocol_distribution.items() if count]
+        counts = [count for count in protocol_distribution.values() if count]
+        
+        # Aucun réseau analysé : un camembert vide n'est pas représentable
+        if not any(counts):
+            self._draw_no_data(ax, "Distribution des protocoles")
+            return
         
         # Déterminer les couleurs en fonction des protocoles
         colors = [self.protocol_colors.get(p, '#999999') for p in protocols]
@@ -477,6 +839,12 @@ class InfographicGenerator:
         # Configurer l'axes
         ax.set_aspect('equal')
     
+    def _draw_no_data(self, ax, title):
+        """Affiche un graphique vide avec son titre et la mention « Aucune donnée »"""
+        ax.axis('off')
+        ax.set_title(title, fontsize=14, pad=20)
+        ax.text(0.5, 0.5, "Aucune donnée", ha='center', va='center', fontsize=12, alpha=0.6)
+    
     def _create_vulnerability_types_chart(self, fig, position, vulnerability_types):
         """Crée un graphique à barres horizontales pour les types de vulnérabilités"""
         ax = fig.add_subplot(position)
@@ -533,12 +901,25 @@ class InfographicGenerator:
         # Ajouter les valeurs également
         values += values[:1]
         
+        # Grille, repère à 100, étiquettes et titre (éléments statiques)
+        draw_static_elements(
+            fig, ax, ('radar', tuple(categories)),
+            lambda a: self._draw_radar_background(a, categories),
+            hide_decorations=True
+        )
+        
         # Tracer les valeurs
         ax.plot(angles, values, linewidth=2, linestyle='solid', color='#5ac8fa')
         ax.fill(angles, values, color='#5ac8fa', alpha=0.25)
+    
+    def _draw_radar_background(self, ax, categories):
+        """Dessine la grille polaire, le repère à 100, les étiquettes et le titre du radar"""
+        N = len(categories)
+        angles = [n / float(N) * 2 * np.pi for n in range(N)]
+        angles += angles[:1]
         
         # Ajouter un repère à 100 (maximum)
-        ax.plot(angles, [100] * (N + 1), color='#999999', linestyle='--', alpha=0.3)
+        reference, = ax.plot(angles, [100] * (N + 1), color='#999999', linestyle='--', alpha=0.3)
         
         # Étiquettes et ticks
         ax.set_xticks(angles[:-1])
@@ -551,8 +932,9 @@ class InfographicGenerator:
         
         # Ajouter un titre
         ax.set_title("Dimensions de sécurité", fontsize=14, pad=20)
+        return [reference]
     
-    def _create_vulnerable_devices_chart(self, fig, position, devices):
+    def _create_vulnerable_devices_chart(self, fig, position, devices, reduction=None):
         """Crée un graphique à barres horizontales pour les appareils vulnérables"""
         ax = fig.add_subplot(position)
         
@@ -566,11 +948,14 @@ class InfographicGenerator:
                 {'name': 'Ordinateur portable', 'security_score': 85}
             ]
         
-        # Trier les appareils par score croissant
-        devices = sorted(devices, key=lambda x: x.get('security_score', 0))
-        
-        # Limiter aux 5 appareils les plus vulnérables
-        devices = devices[:5]
+        # Conserver les appareils les plus vulnérables (score croissant), les autres étant regroupés
+        reduction = reduction or get_data_reduction_options()
+        devices = top_n_with_others(
+            devices,
+            reduction['devices_top_n'],
+            key=lambda x: x.get('security_score', 0),
+            others_factory=self._build_other_devices_entry if reduction['devices_others_bucket'] else None
+        )
         
         # Préparer les données
         names = [d.get('name', 'Inconnu') for d in devices]
@@ -597,7 +982,15 @@ class InfographicGenerator:
         # Ajouter une grille
         ax.grid(axis='x', linestyle='--', alpha=0.3)
     
-    def _create_security_trend_chart(self, fig, position, trend_data):
+    def _build_other_devices_entry(self, devices):
+        """Construit la barre « Autres » (score moyen) à partir des appareils non affichés"""
+        scores = [d.get('security_score', 0) for d in devices]
+        return {
+            'name': f"Autres ({len(devices)} appareils)",
+            'security_score': round(sum(scores) / len(scores)) if scores else 0
+        }
+    
+    def _create_security_trend_chart(self, fig, position, trend_data, reduction=None):
         """Crée un graphique linéaire pour la tendance de sécurité au fil du temps"""
         ax = fig.add_subplot(position)
         
@@ -609,11 +1002,24 @@ class InfographicGenerator:
             months = [entry.get('date', '') for entry in trend_data]
             scores = [entry.get('score', 0) for entry in trend_data]
         
+        # Sous-échantillonner les longues séries (LTTB) en conservant leur position d'origine
+        reduction = reduction or get_data_reduction_options()
+        positions = lttb_indices(scores, reduction['trend_max_points'])
+        if len(positions) < len(scores):
+            logger.debug(f"Tendance de sécurité réduite de {len(scores)} à {len(positions)} points")
+        months = [months[i] for i in positions]
+        scores = [scores[i] for i in positions]
+        
         # Créer le graphique linéaire
-        ax.plot(months, scores, marker='o', linestyle='-', color='#5ac8fa', linewidth=2)
+        ax.plot(positions, scores, marker='o', linestyle='-', color='#5ac8fa', linewidth=2)
         
         # Remplir la zone sous la courbe
-        ax.fill_between(months, scores, color='#5ac8fa', alpha=0.2)
+        ax.fill_between(positions, scores, color='#5ac8fa', alpha=0.2)
+        
+        # Limiter le nombre d'étiquettes de périodes
+        step = max(1, -(-len(positions) // reduction['trend_max_ticks']))
+        ax.set_xticks(positions[::step])
+        ax.set_xticklabels(months[::step])
         
         # Configurer les axes
         ax.set_ylim(0, 100)
@@ -742,24 +1148,12 @@ class InfographicGenerator:
                 }
             ]
         
-        # Désactiver les axes
-        ax.axis('off')
-        
-        # Ajouter un titre
-        ax.text(0.5, 1.05, "COMPARAISON DES PROTOCOLES DE SÉCURITÉ", ha='center', va='top', fontsize=14, fontweight='bold')
+        # Titre et en-têtes de colonnes (éléments statiques)
+        draw_static_elements(fig, ax, ('protocol_table',), self._draw_protocol_table_header)
         
         # Définir les colonnes
-        headers = ['Protocole', 'Niveau de sécurité', 'Année', 'Statut', 'Vulnérabilités', 'Recommandation']
-        column_widths = [0.10, 0.18, 0.07, 0.15, 0.25, 0.25]
-        x_positions = [sum(column_widths[:i]) for i in range(len(headers))]
-        
-        # Ajouter les en-têtes de colonnes
-        for i, header in enumerate(headers):
-            ax.text(x_positions[i] + column_widths[i]/2, 0.95, header, ha='center', va='center', 
-                   fontsize=10, fontweight='bold')
-        
-        # Ajouter une ligne sous les en-têtes
-        ax.axhline(y=0.90, xmin=0, xmax=1, color='white', alpha=0.5, linestyle='-')
+        column_widths = PROTOCOL_TABLE_COLUMN_WIDTHS
+        x_positions = [sum(column_widths[:i]) for i in range(len(column_widths))]
         
         # Ajouter les données des protocoles
         y_pos = 0.83
@@ -783,7 +1177,8 @@ class InfographicGenerator:
             ax.text(x_positions[3] + column_widths[3]/2, y_pos, status, ha='center', va='center', fontsize=9)
             
             # Afficher les vulnérabilités
-            vuln_text = "\n".join(vulnerabilities)
+            # (liste de vulnérabilités, ou simple nombre dans certaines données)
+            vuln_text = "\n".join(vulnerabilities) if isinstance(vulnerabilities, list) else str(vulnerabilities)
             ax.text(x_positions[4] + 0.01, y_pos, vuln_text, ha='left', va='center', fontsize=8)
             
             # Afficher la recommandation
@@ -796,6 +1191,26 @@ class InfographicGenerator:
             # Mettre à jour la position verticale
             y_pos -= 0.13
     
+    def _draw_protocol_table_header(self, ax):
+        """Dessine le titre, les en-têtes de colonnes et la ligne d'en-tête du tableau des protocoles"""
+        # Désactiver les axes
+        ax.axis('off')
+        
+        # Ajouter un titre
+        title = ax.text(0.5, 1.05, "COMPARAISON DES PROTOCOLES DE SÉCURITÉ", ha='center', va='top', fontsize=14, fontweight='bold')
+        artists = [title]
+        
+        # Ajouter les en-têtes de colonnes
+        column_widths = PROTOCOL_TABLE_COLUMN_WIDTHS
+        x_positions = [sum(column_widths[:i]) for i in range(len(column_widths))]
+        for i, header in enumerate(PROTOCOL_TABLE_HEADERS):
+            artists.append(ax.text(x_positions[i] + column_widths[i]/2, 0.95, header, ha='center', va='center', 
+                                   fontsize=10, fontweight='bold'))
+        
+        # Ajouter une ligne sous les en-têtes
+        artists.append(ax.axhline(y=0.90, xmin=0, xmax=1, color='white', alpha=0.5, linestyle='-'))
+        return artists
+    
     def _create_protocol_vulnerabilities_chart(self, fig, position, vulnerability_data):
         """Crée un graphique à barres empilées pour les vulnérabilités par protocole"""
         ax = fig.add_subplot(position)
@@ -1061,9 +1476,14 @@ class InfographicGenerator:
                 'low': 6
             }
         
-        # Préparer les données
-        severities = list(severity_distribution.keys())
-        counts = list(severity_distribution.values())
+        # Préparer les données (les parts nulles sont omises)
+        severities = [key for key, count in severity_distribution.items() if count]
+        counts = [count for count in severity_distribution.values() if count]
+        
+        # Aucune vulnérabilité : un camembert vide n'est pas représentable
+        if not any(counts):
+            self._draw_no_data(ax, "Distribution par sévérité")
+            return
         
         # Obtenir les couleurs pour chaque sévérité
         colors = [self.vulnerability_colors.get(sev, '#999999') for sev in severities]
@@ -1221,7 +1641,11 @@ class InfographicGenerator:
             
     def generate_preview(self, report_type: str) -> str:
         """
-        Génère ou renvoie un aperçu pour un type de rapport spécifique
+        Renvoie un aperçu pour un type de rapport spécifique, sans rendu sur le chemin de la requête
+        
+        Si l'aperçu de la version courante du générateur n'existe pas encore, l'aperçu
+        fourni avec l'application est renvoyé et la génération est lancée en arrière-plan.
+        Sans aperçu fourni, l'aperçu est rendu immédiatement.
         
         Args:
             report_type: Type de rapport ('network', 'protocol', 'vulnerability')
@@ -1233,46 +1657,36 @@ class InfographicGenerator:
         if report_type not in ['network', 'protocol', 'vulnerability']:
             report_type = 'network'
         
-        # Définir le chemin vers l'aperçu préexistant (SVG)
-        preview_path = os.path.join(PREVIEWS_DIR, f"{report_type}", f"{report_type}_security_preview.svg")
+        if not self.preview_cache.is_current(report_type) and self.preview_cache.has_fallback(report_type):
+            self.preview_cache.warm_up(self._render_preview, [report_type])
+        return self.preview_cache.get_preview(report_type, render=self._render_preview)
+    
+    def warm_up_previews(self, background: bool = True):
+        """
+        Génère les aperçus manquants pour la version courante du générateur
         
-        # Si l'aperçu n'existe pas, utiliser l'aperçu par défaut
-        if not os.path.exists(preview_path):
-            default_preview_path = os.path.join(PREVIEWS_DIR, f"{report_type}_security_preview.svg")
-            
-            # Si l'aperçu par défaut existe, le retourner
-            if os.path.exists(default_preview_path):
-                return default_preview_path
-            
-            # Sinon, générer un nouvel aperçu
-            sample_data = self._generate_sample_data(report_type)
-            
-            # Créer le répertoire d'aperçus si nécessaire
-            preview_dir = os.path.join(PREVIEWS_DIR, report_type)
-            os.makedirs(preview_dir, exist_ok=True)
+        Args:
+            background: Générer dans un thread d'arrière-plan (False pour une génération à la construction)
             
-            # Générer un aperçu et le sauvegarder
-            if report_type == 'network':
-                return self.generate_network_security_infographic(
-                    sample_data.get('network_data', {}),
-                    sample_data.get('vulnerability_data', {}),
-                    output_filename=f"{report_type}_security_preview.svg",
-                    format='svg'
-                )
-            elif report_type == 'protocol':
-                return self.generate_protocol_analysis_infographic(
-                    sample_data.get('protocol_data', {}),
-                    output_filename=f"{report_type}_security_preview.svg",
-                    format='svg'
-                )
-            elif report_type == 'vulnerability':
-                return self.generate_vulnerability_report_infographic(
-                    sample_data.get('vulnerability_data', {}),
-                    output_filename=f"{report_type}_security_preview.svg",
-                    format='svg'
-                )
-        
-        return preview_path
+        Returns:
+            Optional[threading.Thread]: Thread de génération, ou None si rien n'est à faire
+        """
+        return self.preview_cache.warm_up(self._render_preview, list(REPORT_FILE_PREFIXES), background=background)
+    
+    def _render_preview(self, report_type: str, output_path: str) -> None:
+        """
+        Rend l'aperçu SVG d'un type de rapport à partir des données d'exemple
+        
+        Args:
+            report_type: Type de rapport
+            output_path: Chemin du fichier SVG à écrire
+        """
+        sample_data = self._generate_sample_data(report_type)
+        fig = self._build_report_figure(report_type, sample_data, PREVIEW_DPI)
+        try:
+            fig.savefig(output_path, format='svg', bbox_inches='tight')
+        finally:
+            plt.close(fig)
     
     def _generate_sample_data(self, report_type: str) -> Dict[str, Any]:
         """
@@ -1501,10 +1915,42 @@ class InfographicGenerator:
         else:
             return {}
     
+    def get_export_file_info(self, source_path: str) -> Dict[str, Any]:
+        """
+        Renvoie les métadonnées d'un fichier d'export servi directement depuis
+        son emplacement de rendu (sans copie)
+        
+        Args:
+            source_path: Chemin vers le fichier d'export
+            
+        Returns:
+            Dict: Métadonnées du fichier (chemin relatif à static, chemin relatif aux exports, taille, date)
+        """
+        if not os.path.exists(source_path):
+            return {
+                'success': False,
+                'error': 'Fichier source introuvable'
+            }
+        
+        file_stats = os.stat(source_path)
+        filename = os.path.basename(source_path)
+        export_path = os.path.relpath(source_path, EXPORT_DIR).replace(os.sep, '/')
+        
+        return {
+            'success': True,
+            'path': os.path.relpath(source_path, 'static').replace(os.sep, '/'),
+            'export_path': export_path,
+            'filename': filename,
+            'size': self._get_readable_file_size(file_stats.st_size),
+            'date': datetime.fromtimestamp(file_stats.st_mtime).strftime('%d/%m/%Y %H:%M'),
+            'format': os.path.splitext(filename)[1][1:].upper(),
+            'download_url': f"/static/{os.path.relpath(source_path, 'static').replace(os.sep, '/')}"
+        }
+    
     def copy_export_to_user_downloads(self, source_path: str, filename: Optional[str] = None) -> Dict[str, str]:
         """
-        Copie un fichier d'export vers le répertoire de téléchargements de l'utilisateur
-        et renvoie les métadonnées du fichier
+        Place un fichier d'export dans le répertoire de téléchargements de l'utilisateur
+        (lien physique, copie en dernier recours) et renvoie les métadonnées du fichier
         
         Args:
             source_path: Chemin vers le fichier d'export
@@ -1536,9 +1982,15 @@ class InfographicGenerator:
         # Chemin de destination
         destination_path = os.path.join(downloads_dir, filename)
         
-        # Copier le fichier
+        # Lier le fichier (aucune donnée dupliquée), ou le copier si le lien est impossible
         try:
-            shutil.copy2(source_path, destination_path)
+            if os.path.abspath(source_path) != os.path.abspath(destination_path):
+                if os.path.lexists(destination_path):
+                    os.remove(destination_path)
+                try:
+                    os.link(source_path, destination_path)
+                except OSError:
+                    shutil.copy2(source_path, destination_path)
             
             # Obtenir les métadonnées du fichier
             file_stats = os.stat(destination_path)
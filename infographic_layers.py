@@ -0,0 +1,292 @@
+"""
+Module de calques statiques pré-rendus pour les infographies.
+Les éléments qui ne dépendent pas des données (fond de jauge, grille polaire,
+en-têtes de tableaux) sont rendus une seule fois par style, résolution et taille,
+puis recomposés sous forme d'image derrière les éléments de données.
+Ce mécanisme ne concerne que les sorties raster (PNG) : les formats vectoriels
+conservent des éléments vectoriels.
+
+Seule la rastérisation des éléments statiques est évitée : ils sont toujours
+créés sur les axes (draw_fn), même lorsque leur calque est en cache, car
+tight_layout doit mesurer leur emprise à la géométrie de la figure avant mise
+en page. Ce coût, de l'ordre de 5 à 10 % du rendu d'un graphique, est relevé
+dans les statistiques du cache ('live_draw_ms') et par benchmark_infographics.py.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import matplotlib
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Paramètres de style pris en compte dans la clé d'un calque
+STYLE_RC_KEYS = (
+    'axes.facecolor', 'axes.edgecolor', 'text.color', 'xtick.color',
+    'ytick.color', 'grid.color', 'font.family', 'font.size'
+)
+
+
+def current_style_key() -> Tuple[str, ...]:
+    """Renvoie une empreinte du style matplotlib actif"""
+    return tuple(str(matplotlib.rcParams[key]) for key in STYLE_RC_KEYS)
+
+
+class StaticLayerCache:
+    """Cache borné (LRU) des calques statiques rendus en RGBA"""
+
+    def __init__(self, max_entries: int = 32):
+        """
+        Initialise le cache de calques
+
+        Args:
+            max_entries: Nombre maximal de calques conservés en mémoire
+        """
+        self.max_entries = max_entries
+        self.layers: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'live_draw_ms': 0.0}
+        self._lock = threading.Lock()
+
+    def get_layer(
+        self,
+        key: Tuple,
+        size_px: Tuple[int, int],
+        dpi: float,
+        axes_rect: Tuple[float, float, float, float],
+        projection: Optional[str],
+        draw_fn: Callable[[Any], Any]
+    ) -> np.ndarray:
+        """
+        Renvoie le calque associé à la clé, en le rendant si nécessaire
+
+        Args:
+            key: Clé complète du calque (composant, paramètres, style, dpi, taille)
+            size_px: Taille du calque en pixels (largeur, hauteur)
+            dpi: Résolution du rendu
+            axes_rect: Position des axes dans le calque (fraction de la figure)
+            projection: Projection des axes ('polar' ou None)
+            draw_fn: Fonction qui dessine les éléments statiques sur des axes
+
+        Returns:
+            np.ndarray: Image RGBA (hauteur, largeur, 4), première ligne en bas
+        """
+        with self._lock:
+            layer = self.layers.get(key)
+            if layer is not None:
+                self.layers.move_to_end(key)
+                self.stats['hits'] += 1
+                return layer
+            self.stats['misses'] += 1
+
+        layer = self._render(size_px, dpi, axes_rect, projection, draw_fn)
+
+        with self._lock:
+            self.layers[key] = layer
+            while len(self.layers) > self.max_entries:
+                self.layers.popitem(last=False)
+        return layer
+
+    @staticmethod
+    def _render(size_px, dpi, axes_rect, projection, draw_fn) -> np.ndarray:
+        """Rend les éléments statiques dans une figure Agg indépendante"""
+        width_px, height_px = size_px
+        fig = Figure(figsize=(width_px / dpi, height_px / dpi), dpi=dpi)
+        fig.patch.set_alpha(0)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes(axes_rect, projection=projection)
+        draw_fn(ax)
+        canvas.draw()
+        # Première ligne en bas, ordre attendu par draw_image du moteur Agg
+        return np.ascontiguousarray(np.asarray(canvas.buffer_rgba())[::-1])
+
+    def record_live_draw(self, duration_ms: float) -> None:
+        """Comptabilise le temps passé à créer les éléments statiques vivants (non évité par le cache)"""
+        with self._lock:
+            self.stats['live_draw_ms'] += duration_ms
+
+    def clear(self) -> None:
+        """Vide le cache de calques"""
+        with self._lock:
+            self.layers.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Renvoie les statistiques d'utilisation du cache"""
+        with self._lock:
+            return {
+                **self.stats,
+                'entries': len(self.layers),
+                'bytes': sum(layer.nbytes for layer in self.layers.values())
+            }
+
+
+class StaticLayerImage(Artist):
+    """Artiste qui recopie un calque RGBA pré-rendu, pixel pour pixel, sans rééchantillonnage"""
+
+    def __init__(self, layer: np.ndarray, origin: Tuple[float, float], extent: Bbox, zorder: float = 0):
+        """
+        Initialise l'artiste
+
+        Args:
+            layer: Image RGBA (hauteur, largeur, 4) en uint8, première ligne en bas
+            origin: Coin inférieur gauche du calque (fraction de la figure)
+            extent: Emprise exacte des éléments statiques (fraction de la figure)
+            zorder: Ordre de dessin
+        """
+        super().__init__()
+        self.layer = layer
+        self.origin = origin
+        self.extent = extent
+        self.set_zorder(zorder)
+
+    def _origin_px(self) -> Tuple[int, int]:
+        """Position du coin inférieur gauche en pixels (suit le recadrage de savefig)"""
+        x, y = self.figure.transFigure.transform(self.origin)
+        return int(round(x)), int(round(y))
+
+    def get_window_extent(self, renderer=None):
+        """Emprise des éléments statiques en pixels, prise en compte par bbox_inches='tight'"""
+        return self.extent.transformed(self.figure.transFigure)
+
+    def draw(self, renderer):
+        """Dessine le calque directement dans le tampon du moteur de rendu"""
+        if not self.get_visible():
+            return
+        x, y = self._origin_px()
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, x, y, self.layer)
+        gc.restore()
+
+
+def enable_static_layers(fig) -> None:
+    """Active la composition de calques statiques pour une figure"""
+    fig._static_layer_requests = []
+
+
+def draw_static_elements(
+    fig,
+    ax,
+    key: Tuple,
+    draw_fn: Callable[[Any], Optional[List[Any]]],
+    hide_decorations: bool = False
+) -> None:
+    """
+    Dessine les éléments statiques d'un graphique et, si la figure compose des
+    calques, enregistre la demande de remplacement par une image en cache
+
+    Les éléments restent dessinés sur les axes afin que tight_layout en tienne
+    compte ; ils sont masqués au moment de la composition.
+
+    Args:
+        fig: Figure matplotlib
+        ax: Axes du graphique
+        key: Identifiant du calque (composant et paramètres statiques)
+        draw_fn: Fonction qui dessine les éléments statiques et renvoie les artistes créés
+        hide_decorations: Masquer aussi axes, graduations, bordures, titre et fond
+    """
+    start = time.perf_counter()
+    artists = draw_fn(ax) or []
+    requests = getattr(fig, '_static_layer_requests', None)
+    if requests is not None:
+        requests.append({
+            'ax': ax,
+            'key': key,
+            'draw_fn': draw_fn,
+            'artists': artists,
+            'hide_decorations': hide_decorations,
+            'draw_ms': (time.perf_counter() - start) * 1000
+        })
+
+
+def _with_limits(draw_fn, limits):
+    """Enveloppe une fonction de dessin pour imposer les limites des axes de données"""
+    if limits is None:
+        return draw_fn
+
+    def draw(ax):
+        draw_fn(ax)
+        ax.set_xlim(*limits[0])
+        ax.set_ylim(*limits[1])
+    return draw
+
+
+def apply_static_layers(fig, cache: StaticLayerCache) -> int:
+    """
+    Remplace les éléments statiques enregistrés par leurs calques en cache
+
+    Doit être appelée après la mise en page finale (tight_layout).
+
+    Args:
+        fig: Figure matplotlib
+        cache: Cache des calques
+
+    Returns:
+        int: Nombre de calques composés
+    """
+    requests = getattr(fig, '_static_layer_requests', None) or []
+    if not requests:
+        return 0
+
+    renderer = fig.canvas.get_renderer()
+    fig_width_px, fig_height_px = fig.get_size_inches() * fig.dpi
+    style_key = current_style_key()
+    cache.record_live_draw(sum(request['draw_ms'] for request in requests))
+
+    for request in requests:
+        ax = request['ax']
+
+        # Emprise du calque : axes et éléments statiques qui débordent (titre, étiquettes), en pixels entiers
+        ax.apply_aspect()
+        axes_box = ax.get_window_extent(renderer)
+        boxes = [axes_box] + [artist.get_window_extent(renderer) for artist in request['artists']]
+        if request['hide_decorations']:
+            boxes.append(ax.get_tightbbox(renderer))
+        tight_box = Bbox.union(boxes)
+        x0 = math.floor(min(axes_box.x0, tight_box.x0))
+        y0 = math.floor(min(axes_box.y0, tight_box.y0))
+        width_px = max(1, math.ceil(max(axes_box.x1, tight_box.x1)) - x0)
+        height_px = max(1, math.ceil(max(axes_box.y1, tight_box.y1)) - y0)
+
+        axes_rect = tuple(round(v, 6) for v in (
+            (axes_box.x0 - x0) / width_px, (axes_box.y0 - y0) / height_px,
+            axes_box.width / width_px, axes_box.height / height_px
+        ))
+        projection = 'polar' if getattr(ax, 'name', None) == 'polar' else None
+
+        # Les limites des axes cartésiens peuvent dépendre des données (mise à l'échelle automatique)
+        limits = None if projection else (tuple(ax.get_xlim()), tuple(ax.get_ylim()))
+        draw_fn = _with_limits(request['draw_fn'], limits)
+
+        key = (request['key'], style_key, fig.dpi, width_px, height_px, axes_rect, limits)
+        layer = cache.get_layer(key, (width_px, height_px), fig.dpi, axes_rect, projection, draw_fn)
+
+        # Masquer les éléments statiques vivants
+        for artist in request['artists']:
+            artist.set_visible(False)
+        if request['hide_decorations']:
+            ax.xaxis.set_visible(False)
+            ax.yaxis.set_visible(False)
+            for spine in ax.spines.values():
+                spine.set_visible(False)
+            ax.title.set_visible(False)
+            ax.patch.set_visible(False)
+
+        # Placer le calque derrière les axes de données
+        fig.add_artist(StaticLayerImage(
+            layer,
+            (x0 / fig_width_px, y0 / fig_height_px),
+            tight_box.transformed(fig.transFigure.inverted()),
+            zorder=ax.get_zorder() - 1
+        ))
+
+    fig._static_layer_requests = []
+    return len(requests)
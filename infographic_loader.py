@@ -0,0 +1,145 @@
+"""
+Module de chargement différé du générateur d'infographies.
+Le générateur importe matplotlib et NumPy, applique un style et construit des
+palettes : ce coût n'est payé qu'à la première utilisation, ou dans un thread
+d'arrière-plan après le démarrage, et non plus au chargement des routes.
+Les aperçus versionnés sont préparés dans ce même thread, ou à la construction
+via `python infographic_loader.py --build-previews`.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from infographic_previews import FALLBACK_PREVIEWS, PreviewCache
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Instance unique du générateur (créée à la demande)
+_infographic_generator = None
+_infographic_generator_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
+
+# Consultation des aperçus tant que le générateur n'est pas chargé (aucun rendu)
+_preview_cache: Optional[PreviewCache] = None
+
+
+def get_infographic_generator():
+    """
+    Récupère l'instance singleton du générateur d'infographies, en la créant
+    (imports matplotlib/NumPy compris) lors du premier appel
+
+    Returns:
+        InfographicGenerator: Générateur d'infographies
+    """
+    global _infographic_generator
+    if _infographic_generator is None:
+        with _infographic_generator_lock:
+            if _infographic_generator is None:
+                start = time.perf_counter()
+                from infographic_generator import InfographicGenerator
+                generator = InfographicGenerator()
+
+                # Nettoyage périodique du répertoire d'exports (quota et durée de vie configurables)
+                janitor = generator.export_janitor
+                janitor.max_bytes = int(os.environ.get('EXPORT_QUOTA_MB', janitor.max_bytes // (1024 * 1024))) * 1024 * 1024
+                janitor.max_age = float(os.environ.get('EXPORT_TTL_HOURS', janitor.max_age / 3600)) * 3600
+                janitor.start()
+
+                _infographic_generator = generator
+                logger.info(
+                    f"Générateur d'infographies chargé en {(time.perf_counter() - start) * 1000:.0f} ms"
+                )
+    return _infographic_generator
+
+
+def is_infographic_generator_loaded() -> bool:
+    """Indique si le générateur d'infographies a déjà été créé"""
+    return _infographic_generator is not None
+
+
+def get_infographic_previews(report_types: Iterable[str] = tuple(FALLBACK_PREVIEWS)) -> Dict[str, str]:
+    """
+    Renvoie les aperçus à afficher sans jamais bloquer sur un chargement ou un rendu
+
+    Tant que le générateur n'est pas chargé, les aperçus déjà générés pour la version
+    courante (ou ceux fournis avec l'application) sont renvoyés et le préchargement est lancé.
+    Un type sans aucun aperçu disponible est rendu immédiatement par le générateur.
+
+    Args:
+        report_types: Types de rapports
+
+    Returns:
+        Dict[str, str]: Chemin de l'aperçu par type de rapport
+    """
+    global _preview_cache
+    if is_infographic_generator_loaded():
+        generator = get_infographic_generator()
+        return {report_type: generator.generate_preview(report_type) for report_type in report_types}
+
+    warm_up_infographic_generator()
+    if _preview_cache is None:
+        _preview_cache = PreviewCache()
+    return {
+        report_type: _preview_cache.get_preview(report_type)
+        if _preview_cache.is_current(report_type) or _preview_cache.has_fallback(report_type)
+        else get_infographic_generator().generate_preview(report_type)
+        for report_type in report_types
+    }
+
+
+def warm_up_infographic_generator(delay: float = 0.0, previews: bool = True) -> threading.Thread:
+    """
+    Précharge le générateur d'infographies dans un thread d'arrière-plan
+
+    Args:
+        delay: Délai en secondes avant le préchargement (laisse le serveur démarrer)
+        previews: Générer ensuite les aperçus manquants pour la version courante
+
+    Returns:
+        threading.Thread: Thread de préchargement (déjà démarré)
+    """
+    global _warmup_thread
+
+    def warm_up():
+        if delay:
+            time.sleep(delay)
+        try:
+            generator = get_infographic_generator()
+            if previews:
+                generator.warm_up_previews(background=False)
+        except Exception as e:
+            logger.error(f"Erreur lors du préchargement du générateur d'infographies: {e}")
+
+    with _infographic_generator_lock:
+        if _warmup_thread is None or not _warmup_thread.is_alive():
+            _warmup_thread = threading.Thread(target=warm_up, name='infographic-warmup', daemon=True)
+            _warmup_thread.start()
+        return _warmup_thread
+
+
+def build_previews() -> int:
+    """
+    Génère les aperçus manquants de façon synchrone (étape de construction)
+
+    Returns:
+        int: Code de sortie (0 si tous les aperçus sont à jour)
+    """
+    generator = get_infographic_generator()
+    generator.warm_up_previews(background=False)
+    status = generator.preview_cache.get_status()
+    for report_type, info in status.items():
+        print(f"{report_type:<14} {info['version']}  {'à jour' if info['current'] else 'échec'}  {info['path']}")
+    return 0 if all(info['current'] for info in status.values()) else 1
+
+
+if __name__ == '__main__':
+    if '--build-previews' in sys.argv[1:]:
+        logging.basicConfig(level=logging.INFO)
+        sys.exit(build_previews())
+    print("Usage: python infographic_loader.py --build-previews")
+    sys.exit(2)
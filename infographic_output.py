@@ -0,0 +1,101 @@
+"""
+Module d'enregistrement des infographies avec optimisation de la taille.
+Le mode optimisé produit des fichiers plus légers pour le téléchargement,
+le stockage et l'envoi par e-mail :
+- PNG : palette indexée (256 couleurs au plus) et compression maximale ;
+- SVG : texte conservé sous forme de texte (et non de tracés) et coordonnées arrondies ;
+- PDF : polices TrueType sous-ensemblées (seuls les glyphes utilisés) et compression maximale.
+"""
+
+import io
+import logging
+import os
+import re
+from typing import Dict
+
+import matplotlib
+from PIL import Image
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Nombre de couleurs de la palette des PNG optimisés
+OPTIMIZED_PNG_COLORS = 256
+
+# Décimales conservées pour les coordonnées des SVG optimisés
+SVG_COORDINATE_DECIMALS = 2
+
+# Paramètres matplotlib appliqués en mode optimisé, par format
+OPTIMIZED_RC_PARAMS: Dict[str, Dict[str, object]] = {
+    'svg': {'svg.fonttype': 'none'},
+    'pdf': {'pdf.fonttype': 42, 'pdf.compression': 9}
+}
+
+# Métadonnées supprimées (dates de création) pour des fichiers reproductibles
+OPTIMIZED_METADATA = {
+    'svg': {'Date': None},
+    'pdf': {'CreationDate': None}
+}
+
+_SVG_TAG_PATTERN = re.compile(r'<[^>]+>')
+_SVG_FLOAT_PATTERN = re.compile(r'-?\d+\.\d{%d}\d+' % SVG_COORDINATE_DECIMALS)
+
+
+def _round_svg_number(match) -> str:
+    """Arrondit un nombre à SVG_COORDINATE_DECIMALS décimales, sans zéros superflus (1.996 -> 2)"""
+    rounded = f"{float(match.group(0)):.{SVG_COORDINATE_DECIMALS}f}".rstrip('0').rstrip('.')
+    return '0' if rounded == '-0' else rounded
+
+
+def round_svg_coordinates(svg: str) -> str:
+    """
+    Arrondit les nombres décimaux des balises SVG à SVG_COORDINATE_DECIMALS décimales
+
+    Le contenu textuel (entre les balises) et les feuilles de style ne sont pas modifiés.
+
+    Args:
+        svg: Document SVG
+
+    Returns:
+        str: Document SVG aux coordonnées arrondies
+    """
+    return _SVG_TAG_PATTERN.sub(lambda tag: _SVG_FLOAT_PATTERN.sub(_round_svg_number, tag.group(0)), svg)
+
+
+def save_figure(fig, output_path: str, format: str, optimize: bool = False) -> int:
+    """
+    Enregistre une figure dans le format demandé, en optimisant éventuellement la taille
+
+    Args:
+        fig: Figure matplotlib
+        output_path: Chemin du fichier de sortie
+        format: Format de sortie (png, pdf, svg)
+        optimize: Produire un fichier optimisé en taille
+
+    Returns:
+        int: Taille du fichier écrit en octets
+    """
+    if not optimize:
+        fig.savefig(output_path, format=format, bbox_inches='tight')
+        return os.path.getsize(output_path)
+
+    with matplotlib.rc_context(OPTIMIZED_RC_PARAMS.get(format, {})):
+        if format == 'png':
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', bbox_inches='tight')
+            buffer.seek(0)
+            with Image.open(buffer) as image:
+                # L'octree rapide gère directement la transparence (RGBA)
+                quantized = image.quantize(colors=OPTIMIZED_PNG_COLORS, method=Image.Quantize.FASTOCTREE)
+                quantized.save(output_path, format='PNG', optimize=True)
+        elif format == 'svg':
+            buffer = io.StringIO()
+            fig.savefig(buffer, format='svg', bbox_inches='tight', metadata=OPTIMIZED_METADATA['svg'])
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(round_svg_coordinates(buffer.getvalue()))
+        else:
+            fig.savefig(output_path, format=format, bbox_inches='tight', metadata=OPTIMIZED_METADATA.get(format))
+
+    size = os.path.getsize(output_path)
+    logger.info(f"Infographie optimisée enregistrée ({format}, {size} octets): {output_path}")
+    return size
@@ -0,0 +1,244 @@
+"""
+Module de gestion des aperçus d'infographies.
+Les aperçus sont générés en arrière-plan (au démarrage ou à la construction) et
+versionnés par une empreinte du code du générateur : une modification du rendu
+invalide automatiquement les anciens aperçus. Les requêtes ne bloquent pas
+sur un rendu : elles reçoivent l'aperçu à jour s'il existe, sinon l'aperçu
+fourni avec l'application. Si ce dernier manque aussi, l'aperçu est rendu
+immédiatement plutôt que de renvoyer un chemin vers un fichier absent.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from importlib import metadata
+from typing import Callable, Dict, Iterable, Optional
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Répertoires et fichiers des aperçus
+PREVIEWS_DIR = os.path.join("static", "img", "previews")
+GENERATED_PREVIEWS_SUBDIR = 'generated'
+PREVIEW_MANIFEST_FILENAME = 'manifest.json'
+
+# Aperçus fournis avec l'application, servis tant qu'aucun aperçu à jour n'existe
+FALLBACK_PREVIEWS = {
+    'network': 'network_security_preview.svg',
+    'protocol': 'protocol_analysis_preview.svg',
+    'vulnerability': 'vulnerability_report_preview.svg'
+}
+
+# Fichiers source dont dépend le rendu des aperçus
+PREVIEW_SOURCE_FILES = (
+    'infographic_generator.py',
+    'infographic_layers.py',
+    'infographic_reduction.py'
+)
+
+
+def compute_preview_version(source_files: Iterable[str] = PREVIEW_SOURCE_FILES) -> str:
+    """
+    Calcule la version des aperçus à partir du code du générateur et de la version de matplotlib
+
+    Args:
+        source_files: Fichiers source (relatifs au répertoire de ce module)
+
+    Returns:
+        str: Empreinte courte (12 caractères hexadécimaux)
+    """
+    digest = hashlib.sha256()
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for filename in source_files:
+        try:
+            with open(os.path.join(base_dir, filename), 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(filename.encode('utf-8'))
+    try:
+        digest.update(metadata.version('matplotlib').encode('utf-8'))
+    except metadata.PackageNotFoundError:
+        pass
+    return digest.hexdigest()[:12]
+
+
+class PreviewCache:
+    """Aperçus versionnés, générés hors du chemin des requêtes"""
+
+    def __init__(self, previews_dir: str = PREVIEWS_DIR, version: Optional[str] = None):
+        """
+        Initialise le cache d'aperçus
+
+        Args:
+            previews_dir: Répertoire des aperçus fournis (les aperçus générés vont dans un sous-répertoire)
+            version: Version imposée (par défaut: empreinte du code du générateur)
+        """
+        self.previews_dir = previews_dir
+        self.generated_dir = os.path.join(previews_dir, GENERATED_PREVIEWS_SUBDIR)
+        self.manifest_file = os.path.join(self.generated_dir, PREVIEW_MANIFEST_FILENAME)
+        self.version = version or compute_preview_version()
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def get_versioned_path(self, report_type: str) -> str:
+        """Chemin de l'aperçu généré pour la version courante"""
+        return os.path.join(self.generated_dir, f"{report_type}_{self.version}.svg")
+
+    def get_fallback_path(self, report_type: str) -> str:
+        """Chemin de l'aperçu fourni avec l'application"""
+        return os.path.join(self.previews_dir, FALLBACK_PREVIEWS.get(report_type, FALLBACK_PREVIEWS['network']))
+
+    def is_current(self, report_type: str) -> bool:
+        """Indique si l'aperçu de la version courante existe"""
+        return os.path.exists(self.get_versioned_path(report_type))
+
+    def has_fallback(self, report_type: str) -> bool:
+        """Indique si l'aperçu fourni avec l'application existe"""
+        return os.path.exists(self.get_fallback_path(report_type))
+
+    def get_preview(self, report_type: str, render: Optional[Callable[[str, str], None]] = None) -> str:
+        """
+        Renvoie le meilleur aperçu disponible, sans rendu tant qu'un fichier existe
+
+        Args:
+            report_type: Type de rapport ('network', 'protocol', 'vulnerability')
+            render: Fonction de rendu utilisée si ni l'aperçu à jour ni l'aperçu fourni n'existent
+
+        Returns:
+            str: Aperçu à jour s'il existe, sinon aperçu fourni avec l'application,
+                 sinon aperçu rendu immédiatement (si render est fourni)
+        """
+        if self.is_current(report_type):
+            return self.get_versioned_path(report_type)
+        if render is not None and not self.has_fallback(report_type) and self.build(report_type, render):
+            return self.get_versioned_path(report_type)
+        return self.get_fallback_path(report_type)
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        """Charge le manifeste des aperçus générés"""
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, Dict]) -> None:
+        """Enregistre le manifeste des aperçus générés (écriture atomique)"""
+        tmp_file = f"{self.manifest_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_file, self.manifest_file)
+
+    def build(self, report_type: str, render: Callable[[str, str], None]) -> bool:
+        """
+        Génère l'aperçu de la version courante et supprime les versions précédentes
+
+        Args:
+            report_type: Type de rapport
+            render: Fonction de rendu (type de rapport, chemin de sortie SVG)
+
+        Returns:
+            bool: True si l'aperçu a été généré
+        """
+        os.makedirs(self.generated_dir, exist_ok=True)
+        output_path = self.get_versioned_path(report_type)
+        # Nom propre à l'appelant : un rendu immédiat peut croiser celui d'arrière-plan
+        tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        start = time.perf_counter()
+        try:
+            render(report_type, tmp_path)
+            os.replace(tmp_path, output_path)
+        except Exception as e:
+            logger.error(f"Erreur lors de la génération de l'aperçu {report_type}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+        duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        with self._lock:
+            manifest = self._load_manifest()
+            manifest[report_type] = {
+                'version': self.version,
+                'path': output_path,
+                'generated_at': datetime.now().isoformat(),
+                'duration_ms': duration_ms
+            }
+            self._save_manifest(manifest)
+
+        # Supprimer les aperçus des versions précédentes
+        prefix = f"{report_type}_"
+        for filename in os.listdir(self.generated_dir):
+            path = os.path.join(self.generated_dir, filename)
+            if filename.startswith(prefix) and filename.endswith('.svg') and path != output_path:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"Impossible de supprimer l'ancien aperçu {path}: {e}")
+
+        logger.info(f"Aperçu {report_type} (version {self.version}) généré en {duration_ms} ms")
+        return True
+
+    def warm_up(
+        self,
+        render: Callable[[str, str], None],
+        report_types: Iterable[str] = tuple(FALLBACK_PREVIEWS),
+        background: bool = True
+    ) -> Optional[threading.Thread]:
+        """
+        Génère les aperçus manquants pour la version courante
+
+        Args:
+            render: Fonction de rendu (type de rapport, chemin de sortie SVG)
+            report_types: Types de rapports à préparer
+            background: Générer dans un thread d'arrière-plan
+
+        Returns:
+            Optional[threading.Thread]: Thread de génération, ou None si rien n'est à faire
+                                        ou si la génération a été faite immédiatement
+        """
+        with self._lock:
+            missing = [t for t in report_types if t not in self._pending and not self.is_current(t)]
+            self._pending.update(missing)
+        if not missing:
+            return None
+
+        def build_missing():
+            for report_type in missing:
+                try:
+                    self.build(report_type, render)
+                finally:
+                    with self._lock:
+                        self._pending.discard(report_type)
+
+        if not background:
+            build_missing()
+            return None
+
+        thread = threading.Thread(target=build_missing, name='preview-warmup', daemon=True)
+        thread.start()
+        self._thread = thread
+        return thread
+
+    def get_status(self) -> Dict[str, Dict]:
+        """
+        Renvoie l'état des aperçus pour la version courante
+
+        Returns:
+            Dict[str, Dict]: Par type de rapport, aperçu servi, actualité et génération en cours
+        """
+        with self._lock:
+            pending = set(self._pending)
+        return {
+            report_type: {
+                'version': self.version,
+                'current': self.is_current(report_type),
+                'pending': report_type in pending,
+                'path': self.get_preview(report_type)
+            }
+            for report_type in FALLBACK_PREVIEWS
+        }
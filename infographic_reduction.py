@@ -0,0 +1,123 @@
+"""
+Module de réduction des données avant tracé des infographies.
+Borne le nombre d'éléments dessinés (et donc le temps de rendu et la taille
+des fichiers SVG/PDF) quelle que soit la taille des données d'entrée :
+sous-échantillonnage LTTB pour les séries temporelles, top-N avec une catégorie
+« Autres » pour les graphiques à barres.
+"""
+
+import heapq
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Paramètres de réduction par défaut (surchargés par rapport via 'data_reduction')
+DEFAULT_DATA_REDUCTION = {
+    'trend_max_points': 60,       # Points conservés pour une série temporelle
+    'trend_max_ticks': 12,        # Étiquettes affichées sur l'axe des abscisses
+    'devices_top_n': 5,           # Appareils affichés individuellement
+    'devices_others_bucket': True  # Regrouper les autres appareils dans une barre « Autres »
+}
+
+
+def get_data_reduction_options(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Fusionne les paramètres de réduction d'un rapport avec les valeurs par défaut
+
+    Args:
+        overrides: Paramètres propres au rapport (clés de DEFAULT_DATA_REDUCTION)
+
+    Returns:
+        Dict[str, Any]: Paramètres de réduction complets
+    """
+    options = dict(DEFAULT_DATA_REDUCTION)
+    for key, value in (overrides or {}).items():
+        if key in options:
+            options[key] = value
+        else:
+            logger.warning(f"Paramètre de réduction inconnu ignoré: {key}")
+    return options
+
+
+def lttb_indices(values: Sequence[float], threshold: int) -> List[int]:
+    """
+    Sélectionne les points d'une série par l'algorithme LTTB
+    (Largest-Triangle-Three-Buckets), qui préserve la forme visuelle de la courbe
+
+    Les abscisses sont les positions des points (séries régulières ou catégorielles).
+
+    Args:
+        values: Ordonnées de la série
+        threshold: Nombre de points à conserver (au moins 3)
+
+    Returns:
+        List[int]: Indices des points conservés, dans l'ordre (premier et dernier inclus)
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    selected = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Moyenne du seau suivant (troisième sommet du triangle)
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_count = next_end - next_start
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / next_count
+
+        # Point du seau courant qui forme le plus grand triangle
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        a_y = values[a]
+        best_index = start
+        best_area = -1.0
+        for j in range(start, end):
+            area = abs((a - avg_x) * (values[j] - a_y) - (a - j) * (avg_y - a_y))
+            if area > best_area:
+                best_area = area
+                best_index = j
+
+        selected.append(best_index)
+        a = best_index
+
+    selected.append(n - 1)
+    return selected
+
+
+def top_n_with_others(
+    items: Sequence[Dict[str, Any]],
+    n: int,
+    key: Callable[[Dict[str, Any]], float],
+    others_factory: Optional[Callable[[List[Dict[str, Any]]], Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Conserve les n éléments de plus petite clé (triés) et regroupe éventuellement les autres
+
+    Args:
+        items: Éléments à réduire
+        n: Nombre d'éléments conservés individuellement
+        key: Clé de tri (les plus petites valeurs sont conservées)
+        others_factory: Construit l'élément « Autres » à partir des éléments écartés
+                        (None pour simplement les ignorer)
+
+    Returns:
+        List[Dict[str, Any]]: Éléments conservés, suivis de l'élément « Autres » le cas échéant
+    """
+    if len(items) <= n:
+        return sorted(items, key=key)
+
+    # Sélection partielle : O(len * log n) au lieu d'un tri complet
+    top = heapq.nsmallest(n, enumerate(items), key=lambda pair: key(pair[1]))
+    kept_positions = {position for position, _ in top}
+    result = [item for _, item in top]
+
+    if others_factory is not None:
+        others = [item for position, item in enumerate(items) if position not in kept_positions]
+        result.append(others_factory(others))
+    return result
@@ -0,0 +1,110 @@
+"""
+Module de détection des intentions par mots-clés.
+Tous les mots-clés des intentions sont compilés au démarrage dans un automate
+d'Aho-Corasick : un message est classé en un seul parcours, avec la position de
+chaque mot-clé trouvé (y compris les occurrences qui se chevauchent), et les
+intentions sont renvoyées dans leur ordre de priorité.
+"""
+
+import logging
+from collections import deque
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+
+class IntentMatcher:
+    """Automate multi-motifs classant un texte selon des intentions ordonnées par priorité"""
+
+    def __init__(self, intents: Sequence[Tuple[str, Iterable[str]]]):
+        """
+        Compile l'automate à partir des mots-clés de chaque intention
+
+        Args:
+            intents: Couples (intention, mots-clés), de la plus prioritaire à la moins prioritaire
+        """
+        self.priority = [intent for intent, _ in intents]
+        # Transitions, liens d'échec et sorties (mot-clé, intention) de chaque état
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+
+        for intent, keywords in intents:
+            for keyword in keywords:
+                self._add_keyword(keyword.lower(), intent)
+        self._build_failure_links()
+
+    def _add_keyword(self, keyword: str, intent: str) -> None:
+        """Ajoute un mot-clé au trie de l'automate"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append((keyword, intent))
+
+    def _build_failure_links(self) -> None:
+        """Calcule les liens d'échec (parcours en largeur) et propage les sorties"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Trouve toutes les occurrences des mots-clés en un seul parcours du texte
+
+        Args:
+            text: Texte à analyser (déjà en minuscules)
+
+        Returns:
+            List[Dict[str, Any]]: Occurrences (intention, mot-clé, début, fin), par position de début
+        """
+        matches = []
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for keyword, intent in self._output[state]:
+                matches.append({
+                    'intent': intent,
+                    'keyword': keyword,
+                    'start': index - len(keyword) + 1,
+                    'end': index + 1
+                })
+        matches.sort(key=lambda match: (match['start'], match['end']))
+        return matches
+
+    def classify(self, text: str) -> Dict[str, Any]:
+        """
+        Classe un texte selon les intentions reconnues
+
+        Args:
+            text: Texte à classer
+
+        Returns:
+            Dict[str, Any]: Intention la plus prioritaire ('intent', None si aucune),
+                            intentions reconnues par ordre de priorité ('intents')
+                            et occurrences des mots-clés avec leur position ('matches')
+        """
+        matches = self.find_all(text.lower())
+        found = {match['intent'] for match in matches}
+        intents = [intent for intent in self.priority if intent in found]
+        return {
+            'intent': intents[0] if intents else None,
+            'intents': intents,
+            'matches': matches
+        }
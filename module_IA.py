@@ -1,23 +1,79 @@
 """
 Module d'IA pour l'analyse de sécurité réseau et l'enrichissement des données
 """
+import copy
+import hashlib
 import logging
 import random
-from typing import Dict, List, Any, Optional, Union
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Hashable, List, Any, Optional, Tuple, Union
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Nombre maximal de résultats mémorisés par instance en mode déterministe
+DEFAULT_MEMO_SIZE = 4096
+
+
+def memoized_insight(key: Callable[..., Hashable]):
+    """
+    Mémorise le résultat d'une méthode d'insight pure (mode déterministe uniquement)
+    
+    Args:
+        key: Fonction recevant les arguments de la méthode et renvoyant la clé
+             des entrées qui donnent le même résultat
+    """
+    def decorator(method):
+        name = method.__name__
+        
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.deterministic:
+                return method(self, *args, **kwargs)
+            
+            memo_key = (name, key(*args, **kwargs))
+            with self._memo_lock:
+                if memo_key in self._memo:
+                    self._memo.move_to_end(memo_key)
+                    self.memo_stats['hits'] += 1
+                    # Les résultats modifiables ne sont jamais partagés entre appelants
+                    return copy.deepcopy(self._memo[memo_key])
+                self.memo_stats['misses'] += 1
+            
+            result = method(self, *args, **kwargs)
+            with self._memo_lock:
+                self._memo[memo_key] = result
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+            return copy.deepcopy(result)
+        return wrapper
+    return decorator
+
+
 class SecurityAnalysisAI:
     """
     Classe de simulation d'IA pour l'analyse de sécurité réseau
     Note: Cette implémentation utilise des données simulées à des fins de démonstration
     """
     
-    def __init__(self):
-        """Initialise le module d'IA de sécurité"""
+    def __init__(self, deterministic: bool = False, memo_size: int = DEFAULT_MEMO_SIZE):
+        """
+        Initialise le module d'IA de sécurité
+        
+        Args:
+            deterministic: Produire toujours le même insight pour les mêmes entrées
+                           (tirages amorcés par l'empreinte des entrées, résultats mémorisés)
+            memo_size: Nombre maximal de résultats mémorisés (LRU) en mode déterministe
+        """
         logger.info("Module d'IA de sécurité initialisé")
+        self.deterministic = deterministic
+        self.memo_size = memo_size
+        self._memo: 'OrderedDict[Tuple, Any]' = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.memo_stats = {'hits': 0, 'misses': 0}
         self.protocol_insights = {
             'WPA3': 'Offre le plus haut niveau de sécurité avec authentification SAE',
             'WPA2': 'Sécurité adéquate pour la plupart des usages avec chiffrement AES',
@@ -41,41 +97,115 @@ class SecurityAnalysisAI:
             'computer': 'Cible principale des attaques, maintenir les logiciels à jour'
         }
     
+    # Mode déterministe
+    
+    def _rng(self, *inputs: Any):
+        """
+        Source de tirages pour une analyse
+        
+        Args:
+            inputs: Entrées de l'analyse (nom de la méthode compris)
+            
+        Returns:
+            Générateur amorcé par l'empreinte des entrées en mode déterministe,
+            sinon le générateur global du module random
+        """
+        if not self.deterministic:
+            return random
+        digest = hashlib.sha256(repr(inputs).encode('utf-8')).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+    
+    def get_memo_stats(self) -> Dict[str, Any]:
+        """
+        Renvoie les statistiques de mémorisation des insights
+        
+        Returns:
+            Dict[str, Any]: Succès, échecs, taille courante et maximale
+        """
+        with self._memo_lock:
+            return {
+                **self.memo_stats,
+                'size': len(self._memo),
+                'max_size': self.memo_size,
+                'deterministic': self.deterministic
+            }
+    
+    def clear_memo(self) -> None:
+        """Vide les résultats mémorisés"""
+        with self._memo_lock:
+            self._memo.clear()
+    
+    # Traitement par lots
+    
+    @staticmethod
+    def _map_distinct(items: List[Any], analyze: Callable[[Any], Any],
+                      key: Callable[[Any], Hashable]) -> List[Any]:
+        """
+        Applique une analyse une seule fois par entrée distincte d'un lot
+        
+        Args:
+            items: Entrées du lot
+            analyze: Analyse d'une entrée
+            key: Clé des entrées donnant le même résultat
+            
+        Returns:
+            List[Any]: Résultats dans l'ordre des entrées (les doublons partagent le même résultat)
+        """
+        results = {}
+        output = []
+        for item in items:
+            item_key = key(item)
+            if item_key not in results:
+                results[item_key] = analyze(item)
+            output.append(results[item_key])
+        return output
+    
     # Méthodes d'analyse de données de sécurité réseau
     
+    @memoized_insight(key=lambda recommendation: recommendation.get('title', '') if recommendation else None)
     def generate_recommendation_insight(self, recommendation: Dict[str, Any]) -> Optional[str]:
         """Génère un insight IA pour une recommandation de sécurité"""
         if not recommendation:
             return None
             
-        title = recommendation.get('title', '')
-        priority = recommendation.get('priority', 'medium')
-        
-        insights = [
-            f"Cette action devrait être priorisée en raison de son impact direct sur la sécurité globale",
-            f"L'implémentation de cette recommandation pourrait améliorer le score de sécurité d'environ {random.randint(5, 15)}%",
-            f"Basé sur les tendances récentes, cette vulnérabilité est de plus en plus ciblée par les attaques",
-            f"Cette correction constitue une étape fondamentale pour la conformité aux bonnes pratiques de cybersécurité"
-        ]
+        rng = self._rng('recommendation_insight', recommendation.get('title', ''))
+        title = recommendation.get('title', '').lower()
         
-        if "mise à jour" in title.lower() or "mettre à jour" in title.lower():
+        if "mise à jour" in title or "mettre à jour" in title:
             return "Les mises à jour sont cruciales car elles corrigent des vulnérabilités connues que les attaquants ciblent activement"
         
-        if "segmentation" in title.lower() or "isolation" in title.lower():
+        if "segmentation" in title or "isolation" in title:
             return "La segmentation du réseau limite la propagation horizontale des attaques et constitue une stratégie de défense en profondeur efficace"
             
-        if "mot de passe" in title.lower() or "authentification" in title.lower():
+        if "mot de passe" in title or "authentification" in title:
             return "L'utilisation d'authentification forte est particulièrement importante dans un contexte où 80% des violations commencent par des identifiants compromis"
+        
+        insights = [
+            f"Cette action devrait être priorisée en raison de son impact direct sur la sécurité globale",
+            f"L'implémentation de cette recommandation pourrait améliorer le score de sécurité d'environ {rng.randint(5, 15)}%",
+            f"Basé sur les tendances récentes, cette vulnérabilité est de plus en plus ciblée par les attaques",
+            f"Cette correction constitue une étape fondamentale pour la conformité aux bonnes pratiques de cybersécurité"
+        ]
             
-        return random.choice(insights)
+        return rng.choice(insights)
     
+    def generate_recommendation_insights(self, recommendations: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Génère les insights d'un lot de recommandations (une analyse par titre distinct)"""
+        return self._map_distinct(
+            recommendations, self.generate_recommendation_insight,
+            key=lambda rec: rec.get('title', '') if rec else None
+        )
+    
+    @memoized_insight(key=lambda device_type, device_name, security_score: (
+        device_type.lower(), device_name.lower(), security_score))
     def analyze_device_security(self, device_type: str, device_name: str, security_score: int) -> Optional[str]:
         """Analyse la sécurité d'un appareil spécifique"""
         device_type_lower = device_type.lower()
+        device_name_lower = device_name.lower()
         
         # Chercher des correspondances dans les types d'appareils connus
         for key, insight in self.device_insights.items():
-            if key in device_type_lower or key in device_name.lower():
+            if key in device_type_lower or key in device_name_lower:
                 return insight
         
         # Analyse basée sur le score de sécurité
@@ -88,6 +218,15 @@ class SecurityAnalysisAI:
         else:
             return f"Cet appareil dispose d'un bon niveau de sécurité mais reste une cible potentielle"
     
+    def analyze_devices_security(self, devices: List[Tuple[str, str, int]]) -> List[Optional[str]]:
+        """Analyse un lot d'appareils (type, nom, score), une seule fois par appareil distinct"""
+        return self._map_distinct(
+            devices, lambda device: self.analyze_device_security(*device),
+            key=lambda device: (device[0].lower(), device[1].lower(), device[2])
+        )
+    
+    @memoized_insight(key=lambda trend_data: (
+        None if not trend_data or len(trend_data) < 2 else ('last', trend_data[-1].get('score', 50))))
     def predict_security_trend(self, trend_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Prédit l'évolution future du score de sécurité"""
         if not trend_data or len(trend_data) < 2:
@@ -95,16 +234,18 @@ class SecurityAnalysisAI:
             
         # Exemple simplifié de prédiction
         last_score = trend_data[-1].get('score', 50)
-        last_date = trend_data[-1].get('date', '')
+        rng = self._rng('security_trend', last_score)
         
         # Simuler une légère amélioration de la sécurité
         predicted_trend = [
-            {'date': 'Prochain mois', 'score': min(100, last_score + random.randint(2, 5)), 'predicted': True},
-            {'date': 'Dans 2 mois', 'score': min(100, last_score + random.randint(5, 10)), 'predicted': True}
+            {'date': 'Prochain mois', 'score': min(100, last_score + rng.randint(2, 5)), 'predicted': True},
+            {'date': 'Dans 2 mois', 'score': min(100, last_score + rng.randint(5, 10)), 'predicted': True}
         ]
         
         return predicted_trend
     
+    @memoized_insight(key=lambda overall_score, device_count, recommendation_count: (
+        overall_score, device_count, recommendation_count))
     def generate_network_security_analysis(self, overall_score: int, device_count: int, recommendation_count: int) -> str:
         """Génère une analyse globale de la sécurité du réseau"""
         if overall_score > 80:
@@ -130,6 +271,7 @@ class SecurityAnalysisAI:
     
     # Méthodes d'analyse de protocoles
     
+    @memoized_insight(key=lambda protocol_name, security_score: (protocol_name.upper(), security_score))
     def analyze_protocol_security(self, protocol_name: str, security_score: int) -> Optional[str]:
         """Analyse la sécurité d'un protocole spécifique"""
         protocol_upper = protocol_name.upper()
@@ -145,6 +287,15 @@ class SecurityAnalysisAI:
         else:
             return "Ce protocole offre une sécurité adéquate mais pourrait bénéficier de configurations supplémentaires."
     
+    def analyze_protocols_security(self, protocols: List[Tuple[str, int]]) -> List[Optional[str]]:
+        """Analyse un lot de protocoles (nom, score), une seule fois par protocole distinct"""
+        return self._map_distinct(
+            protocols, lambda protocol: self.analyze_protocol_security(*protocol),
+            key=lambda protocol: (protocol[0].upper(), protocol[1])
+        )
+    
+    @memoized_insight(key=lambda recommendation: (
+        recommendation.get('title', ''), recommendation.get('description', '')) if recommendation else None)
     def generate_protocol_recommendation(self, recommendation: Dict[str, Any]) -> Optional[str]:
         """Génère une recommandation spécifique pour améliorer la sécurité des protocoles"""
         if not recommendation:
@@ -166,7 +317,14 @@ class SecurityAnalysisAI:
             "En complément, envisagez d'implémenter une surveillance en temps réel pour détecter les anomalies"
         ]
         
-        return random.choice(insights)
+        return self._rng('protocol_recommendation', title, description).choice(insights)
+    
+    def generate_protocol_recommendations(self, recommendations: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Génère les recommandations d'un lot (une seule fois par titre et description distincts)"""
+        return self._map_distinct(
+            recommendations, self.generate_protocol_recommendation,
+            key=lambda rec: (rec.get('title', ''), rec.get('description', '')) if rec else None
+        )
     
     def generate_protocol_comparison(self, protocol_names: List[str]) -> Dict[str, Any]:
         """Génère une analyse comparative des protocoles"""
@@ -199,19 +357,21 @@ class SecurityAnalysisAI:
     
     # Méthodes d'analyse de vulnérabilités
     
+    @memoized_insight(key=lambda vuln_id, vuln_title, vuln_severity: (vuln_title.lower(), vuln_severity))
     def analyze_vulnerability(self, vuln_id: str, vuln_title: str, vuln_severity: str) -> Optional[str]:
         """Analyse une vulnérabilité spécifique"""
         if vuln_severity in self.vulnerability_insights:
             return self.vulnerability_insights[vuln_severity]
         
         # Analyse basée sur le titre/ID de la vulnérabilité
-        if "injection" in vuln_title.lower():
+        title = vuln_title.lower()
+        if "injection" in title:
             return "Les vulnérabilités d'injection peuvent permettre l'exécution de code arbitraire et compromettre tout le système."
         
-        if "authentification" in vuln_title.lower() or "auth" in vuln_title.lower():
+        if "authentification" in title or "auth" in title:
             return "Les failles d'authentification sont parmi les plus exploitées et peuvent donner un accès non autorisé aux systèmes."
         
-        if "firmware" in vuln_title.lower():
+        if "firmware" in title:
             return "Les vulnérabilités de firmware peuvent être difficiles à corriger mais représentent un risque persistant."
         
         generic_insights = [
@@ -220,23 +380,32 @@ class SecurityAnalysisAI:
             "La correction de cette vulnérabilité devrait être intégrée dans votre cycle de gestion des correctifs"
         ]
         
-        return random.choice(generic_insights)
+        return self._rng('vulnerability', title, vuln_severity).choice(generic_insights)
+    
+    def analyze_vulnerabilities(self, vulnerabilities: List[Tuple[str, str, str]]) -> List[Optional[str]]:
+        """Analyse un lot de vulnérabilités (id, titre, sévérité), une seule fois par titre et sévérité distincts"""
+        return self._map_distinct(
+            vulnerabilities, lambda vuln: self.analyze_vulnerability(*vuln),
+            key=lambda vuln: (vuln[1].lower(), vuln[2])
+        )
     
+    @memoized_insight(key=lambda title, difficulty: (title or '').lower())
     def generate_remediation_recommendation(self, title: str, difficulty: str) -> Optional[str]:
         """Génère une recommandation pour la remédiation d'une vulnérabilité"""
         if not title:
             return None
         
-        if "mise à jour" in title.lower() or "update" in title.lower():
+        title = title.lower()
+        if "mise à jour" in title or "update" in title:
             return "Priorisez les mises à jour de sécurité et envisagez d'implémenter un système de gestion automatisée des mises à jour."
         
-        if "mot de passe" in title.lower() or "password" in title.lower():
+        if "mot de passe" in title or "password" in title:
             return "Utilisez un gestionnaire de mots de passe organisationnel et renforcez l'authentification avec une solution MFA."
         
-        if "segmentation" in title.lower():
+        if "segmentation" in title:
             return "La segmentation du réseau limite considérablement la capacité des attaquants à se déplacer latéralement."
         
-        if "pare-feu" in title.lower() or "firewall" in title.lower():
+        if "pare-feu" in title or "firewall" in title:
             return "Adoptez une approche de liste blanche plutôt que de liste noire pour les règles de pare-feu."
         
         generic_recommendations = [
@@ -246,17 +415,26 @@ class SecurityAnalysisAI:
             "Former les équipes aux bonnes pratiques associées peut réduire les risques de récurrence"
         ]
         
-        return random.choice(generic_recommendations)
+        return self._rng('remediation', title).choice(generic_recommendations)
     
+    def generate_remediation_recommendations(self, steps: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """Génère les recommandations d'un lot d'étapes (titre, difficulté), une seule fois par titre distinct"""
+        return self._map_distinct(
+            steps, lambda step: self.generate_remediation_recommendation(*step),
+            key=lambda step: (step[0] or '').lower()
+        )
+    
+    @memoized_insight(key=lambda date, count, description: (count > 10, description.lower()))
     def analyze_vulnerability_trend(self, date: str, count: int, description: str) -> Optional[str]:
         """Analyse la tendance des vulnérabilités détectées au fil du temps"""
         if count > 10:
             return "Le nombre élevé de vulnérabilités détectées à cette période suggère une augmentation significative de la surface d'attaque ou une amélioration des capacités de détection."
         
-        if "nouvelle" in description.lower() or "ajout" in description.lower():
+        description = description.lower()
+        if "nouvelle" in description or "ajout" in description:
             return "L'introduction de nouveaux équipements est souvent associée à un pic de vulnérabilités. Renforcez les procédures de sécurité préalables à l'intégration."
         
-        if "mise à jour" in description.lower() or "correction" in description.lower():
+        if "mise à jour" in description or "correction" in description:
             return "La diminution des vulnérabilités après cette période démontre l'efficacité des corrections appliquées."
         
         generic_insights = [
@@ -265,7 +443,14 @@ class SecurityAnalysisAI:
             "L'analyse historique suggère un cycle de vulnérabilité type pour ce profil réseau"
         ]
         
-        return random.choice(generic_insights)
+        return self._rng('vulnerability_trend', description).choice(generic_insights)
+    
+    def analyze_vulnerability_trends(self, entries: List[Tuple[str, int, str]]) -> List[Optional[str]]:
+        """Analyse un lot de points de chronologie (date, nombre, description), une seule fois par nombre et description distincts"""
+        return self._map_distinct(
+            entries, lambda entry: self.analyze_vulnerability_trend(*entry),
+            key=lambda entry: (entry[1] > 10, entry[2].lower())
+        )
     
     def generate_advanced_security_recommendations(self, total_vulns: int, critical_vulns: int) -> List[Dict[str, Any]]:
         """Génère des recommandations avancées basées sur l'analyse des vulnérabilités"""
@@ -39,16 +39,22 @@ PROTOCOL_ANALYSES_FILE = os.path.join("instance", "protocol_analyses.json")
 class ProtocolAnalyzer:
     """Analyseur de protocoles de sécurité WiFi"""
 
-    def __init__(self):
-        """Initialisation de l'analyseur de protocoles"""
+    def __init__(self, analyses_file: str = PROTOCOL_ANALYSES_FILE):
+        """
+        Initialisation de l'analyseur de protocoles
+        
+        Args:
+            analyses_file: Fichier de stockage des analyses (un fichier par site)
+        """
         self.analyses = []
+        self.analyses_file = analyses_file
         self.load_analyses()
 
     def load_analyses(self) -> None:
         """Charge les analyses précédentes depuis le fichier, ou initialise si nécessaire"""
-        if os.path.exists(PROTOCOL_ANALYSES_FILE):
+        if os.path.exists(self.analyses_file):
             try:
-                with open(PROTOCOL_ANALYSES_FILE, "r", encoding="utf-8") as f:
+                with open(self.analyses_file, "r", encoding="utf-8") as f:
                     self.analyses = json.load(f)
                     logger.info("Analyses de protocole chargées avec succès")
             except (json.JSONDecodeError, IOError) as e:
@@ -61,14 +67,14 @@ class ProtocolAnalyzer:
     def save_analyses(self) -> None:
         """Sauvegarde les analyses dans un fichier JSON"""
         try:
-            os.makedirs(os.path.dirname(PROTOCOL_ANALYSES_FILE), exist_ok=True)
-            with open(PROTOCOL_ANALYSES_FILE, "w", encoding="utf-8") as f:
+            os.makedirs(os.path.dirname(self.analyses_file) or ".", exist_ok=True)
+            with open(self.analyses_file, "w", encoding="utf-8") as f:
                 json.dump(self.analyses, f, ensure_ascii=False, indent=2)
             logger.info("Analyses de protocole sauvegardées avec succès")
         except IOError as e:
             logger.error(f"Erreur lors de la sauvegarde des analyses: {e}")
 
-    def analyze_network_protocol(self, network: Dict) -> Dict:
+    def analyze_network_protocol(self, network: Dict, save: bool = True) -> Dict:
         """
         Analyse un réseau spécifique pour détecter les failles de protocole
         
@@ -84,6 +90,7 @@ class ProtocolAnalyzer:
                     "frequency": str,
                     "channel": int
                 }
+            save: Sauvegarder immédiatement l'historique des analyses
                 
         Returns:
             Dict: Résultat de l'analyse avec les vulnérabilités et recommandations
@@ -123,7 +130,8 @@ class ProtocolAnalyzer:
         
         # Sauvegarder l'analyse
         self.analyses.append(result)
-        self.save_analyses()
+        if save:
+            self.save_analyses()
         
         return result
 
@@ -139,9 +147,13 @@ class ProtocolAnalyzer:
         """
         results = []
         for network in networks:
-            result = self.analyze_network_protocol(network)
+            result = self.analyze_network_protocol(network, save=False)
             results.append(result)
         
+        # Une seule écriture de l'historique pour l'ensemble des réseaux
+        if results:
+            self.save_analyses()
+        
         return results
 
     def get_protocol_analysis_summary(self) -> Dict:
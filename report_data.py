@@ -0,0 +1,432 @@
+"""
+Module de préparation des données des rapports d'infographies.
+Les sources d'un site (appareils notés, statut du réseau, analyses de protocoles)
+sont rassemblées une seule fois, puis les données attendues par le générateur
+sont construites pour chaque type de rapport à partir de ce même instantané.
+Tous les compteurs des rapports sont calculés en un seul parcours des appareils,
+et ReportDataBuilder conserve les données construites tant que leur version ne change pas.
+"""
+
+import copy
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Types de rapports pris en charge
+REPORT_TYPES = ('network', 'protocol', 'vulnerability')
+
+# Fichier des réseaux WiFi détectés utilisé par défaut pour l'analyse des protocoles
+DEFAULT_WIFI_RESULTS_FILE = 'attached_assets/wifi_results.json'
+
+# Ordre de priorité des sévérités (la plus grave d'abord)
+SEVERITY_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+# Nombre de vulnérabilités et de recommandations reprises dans les rapports
+MAX_REPORTED_ISSUES = 5
+
+# Mots-clés de classement des problèmes de sécurité par catégorie
+VULNERABILITY_CATEGORY_KEYWORDS = {
+    'configuration': 'config',
+    'patch': 'patch',
+    'authentication': 'auth',
+    'encryption': 'crypt'
+}
+
+_KEYWORD_CATEGORIES = {keyword: category for category, keyword in VULNERABILITY_CATEGORY_KEYWORDS.items()}
+_CATEGORY_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in _KEYWORD_CATEGORIES))
+
+
+def _device_summary(device: Dict[str, Any]) -> Dict[str, Any]:
+    """Résumé d'un appareil noté, avec ses problèmes de sécurité détaillés et leur description"""
+    issues = [
+        issue if isinstance(issue, dict) else {'description': str(issue)}
+        for issue in device.get('security_issues', [])
+    ]
+    return {
+        'name': device.get('name') or device.get('mac_address'),
+        'mac_address': device.get('mac_address'),
+        'security_score': device.get('security_score', 0),
+        'last_updated': device.get('last_updated'),
+        'issues_count': len(issues),
+        'security_issues': [issue.get('description', '') for issue in issues],
+        'issues': issues
+    }
+
+
+def _sort_issues(issues: List[Tuple[Dict, Dict]]) -> List[Tuple[Dict, Dict]]:
+    """Trie les problèmes du plus grave au moins grave (sévérité, puis score de l'appareil)"""
+    return sorted(issues, key=lambda pair: (SEVERITY_ORDER.get(pair[0].get('severity'), 99), pair[1]['security_score']))
+
+
+def _recommendations(sorted_issues: List[Tuple[Dict, Dict]]) -> List[Dict[str, str]]:
+    """Recommandations issues des problèmes les plus graves (une par solution)"""
+    recommendations = []
+    seen = set()
+    for issue, device in sorted_issues:
+        solution = issue.get('solution') or issue.get('description', '')
+        if solution in seen:
+            continue
+        seen.add(solution)
+        recommendations.append({
+            'priority': issue.get('severity', 'medium'),
+            'description': solution,
+            'details': f"{issue.get('description', '')} ({device['name']})"
+        })
+        if len(recommendations) >= MAX_REPORTED_ISSUES:
+            break
+    return recommendations
+
+
+def _empty_buckets() -> Dict[str, Any]:
+    """Compteurs d'un groupe d'appareils (tous les appareils ou appareils vulnérables)"""
+    return {
+        'devices': [],
+        'issues': [],
+        'issues_count': 0,
+        'severity_distribution': {'critical': 0, 'high': 0, 'medium': 0, 'low': 0},
+        'issue_severities': {severity: 0 for severity in SEVERITY_ORDER},
+        'vulnerability_types': {**{category: 0 for category in VULNERABILITY_CATEGORY_KEYWORDS}, 'other': 0}
+    }
+
+
+def compute_device_buckets(devices: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Calcule en un seul parcours des appareils tous les compteurs des rapports
+
+    Chaque appareil est résumé une fois et ses problèmes ne sont examinés qu'une fois
+    (une seule recherche des mots-clés de catégorie sur l'ensemble de ses descriptions).
+
+    Args:
+        devices: Appareils notés (DeviceSecurityScoring.devices)
+
+    Returns:
+        Dict[str, Any]: Statut du réseau, résumés des appareils et compteurs
+                        pour tous les appareils ('all') et les appareils vulnérables ('vulnerable')
+    """
+    all_devices = _empty_buckets()
+    vulnerable = _empty_buckets()
+    score_total = 0
+    risk_counts = {'high_risk_count': 0, 'medium_risk_count': 0, 'low_risk_count': 0}
+
+    for device in devices:
+        summary = _device_summary(device)
+        score = summary['security_score']
+        score_total += score
+
+        # Niveaux de risque du statut réseau (mêmes seuils que get_network_security_status)
+        if score < 50:
+            risk_counts['high_risk_count'] += 1
+        elif score < 80:
+            risk_counts['medium_risk_count'] += 1
+        else:
+            risk_counts['low_risk_count'] += 1
+
+        if score < 30:
+            band = 'critical'
+        elif score < 50:
+            band = 'high'
+        elif score < 70:
+            band = 'medium'
+        else:
+            band = 'low'
+
+        text = ' '.join(summary['security_issues']).lower()
+        categories = _CATEGORY_PATTERN.findall(text)
+        matched = {_KEYWORD_CATEGORIES[keyword] for keyword in categories} or {'other'}
+        issues = [(issue, summary) for issue in summary['issues']]
+
+        # Les appareils dont le score est inférieur à 70 sont considérés comme vulnérables
+        groups = (all_devices, vulnerable) if band != 'low' else (all_devices,)
+        for group in groups:
+            group['devices'].append(summary)
+            group['issues'].extend(issues)
+            group['issues_count'] += summary['issues_count']
+            group['severity_distribution'][band] += 1
+            for category in matched:
+                group['vulnerability_types'][category] += 1
+            for issue, _ in issues:
+                severity = issue.get('severity')
+                if severity in group['issue_severities']:
+                    group['issue_severities'][severity] += 1
+
+    for group in (all_devices, vulnerable):
+        group['issues'] = _sort_issues(group['issues'])
+
+    device_count = len(all_devices['devices'])
+    return {
+        'network_status': {
+            'overall_score': round(score_total / device_count, 1) if device_count else 0,
+            'device_count': device_count,
+            **risk_counts,
+            'last_updated': datetime.now().isoformat()
+        },
+        'all': all_devices,
+        'vulnerable': vulnerable
+    }
+
+
+def collect_report_sources(
+    security_scoring,
+    protocol_analyzer=None,
+    wifi_results_file: Optional[str] = DEFAULT_WIFI_RESULTS_FILE,
+    report_types: Iterable[str] = REPORT_TYPES
+) -> Dict[str, Any]:
+    """
+    Rassemble en une fois les sources nécessaires aux rapports demandés
+
+    Args:
+        security_scoring: Système de notation des appareils (DeviceSecurityScoring)
+        protocol_analyzer: Analyseur de protocoles (requis pour le rapport 'protocol')
+        wifi_results_file: Fichier JSON des réseaux WiFi détectés
+        report_types: Types de rapports à préparer
+
+    Returns:
+        Dict[str, Any]: Instantané des sources (statut réseau, appareils, analyses de protocoles)
+    """
+    buckets = compute_device_buckets(security_scoring.devices)
+    sources = {
+        'collected_at': datetime.now().isoformat(),
+        'network_status': buckets['network_status'],
+        'devices': buckets['all']['devices'],
+        'device_buckets': {'all': buckets['all'], 'vulnerable': buckets['vulnerable']}
+    }
+
+    if 'protocol' in report_types:
+        if protocol_analyzer is None:
+            raise ValueError("Un analyseur de protocoles est requis pour le rapport 'protocol'")
+        with open(wifi_results_file, 'r') as f:
+            wifi_data = json.load(f)
+        sources['protocol'] = {
+            'networks': protocol_analyzer.analyze_all_networks(wifi_data),
+            'summary': protocol_analyzer.get_protocol_analysis_summary(),
+            'comparison': protocol_analyzer.get_protocol_comparison(),
+            'timeline': protocol_analyzer.get_protocol_timeline()
+        }
+
+    return sources
+
+
+def build_report_data(report_type: str, sources: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Construit les données d'un rapport à partir d'un instantané des sources
+
+    Args:
+        report_type: Type de rapport ('network', 'protocol', 'vulnerability')
+        sources: Instantané renvoyé par collect_report_sources
+
+    Returns:
+        Dict[str, Any]: Données du rapport, structurées comme celles de
+                        InfographicGenerator._generate_sample_data
+    """
+    if report_type not in REPORT_TYPES:
+        raise ValueError(f"Type de rapport invalide: {report_type}")
+
+    if report_type == 'protocol':
+        if 'protocol' not in sources:
+            raise ValueError("Les analyses de protocoles n'ont pas été collectées")
+        protocol = sources['protocol']
+        summary = protocol['summary']
+        return {
+            'protocol_data': {
+                **protocol,
+                'average_score': summary.get('average_score', 0),
+                'protocol_distribution': summary.get('protocol_distribution', {}),
+                'protocols': protocol['comparison'].get('protocols', []),
+                'recommendations': summary.get('recommendations', [])
+            }
+        }
+
+    buckets = sources.get('device_buckets')
+    if buckets is None:
+        # Instantané sans compteurs précalculés
+        computed = compute_device_buckets(sources['devices'])
+        buckets = {'all': computed['all'], 'vulnerable': computed['vulnerable']}
+
+    if report_type == 'network':
+        devices = buckets['all']
+        network_stats = sources['network_status']
+        network_data = {
+            'security_score': network_stats['overall_score'],
+            'overall_score': network_stats['overall_score'],
+            'total_devices': network_stats['device_count'],
+            'vulnerable_devices': network_stats['high_risk_count'] + network_stats['medium_risk_count'],
+            'secure_devices': network_stats['low_risk_count'],
+            'security_distribution': {
+                'high_risk': network_stats['high_risk_count'],
+                'medium_risk': network_stats['medium_risk_count'],
+                'low_risk': network_stats['low_risk_count']
+            },
+            'devices': devices['devices'],
+            # Distribution des protocoles, si les réseaux du site ont été analysés
+            'protocol_distribution': sources.get('protocol', {}).get('summary', {}).get('protocol_distribution', {})
+        }
+
+        # Données de vulnérabilité simplifiées
+        distribution = devices['severity_distribution']
+        vulnerability_data = {
+            'total_vulnerabilities': devices['issues_count'],
+            'critical_vulnerabilities': distribution['critical'] + distribution['high'],
+            'severity_distribution': dict(distribution),
+            'vulnerability_types': dict(devices['vulnerability_types']),
+            'recommendations': _recommendations(devices['issues'])
+        }
+        return {'network_data': network_data, 'vulnerability_data': vulnerability_data}
+
+    # Rapport de vulnérabilités : appareils dont le score est inférieur à 70
+    vulnerable = buckets['vulnerable']
+    distribution = vulnerable['severity_distribution']
+    vulnerability_data = {
+        'vulnerable_devices': vulnerable['devices'],
+        'summary': {
+            'total': len(vulnerable['issues']),
+            **vulnerable['issue_severities']
+        },
+        'critical_vulnerabilities': [
+            {
+                'cve_id': issue.get('id', ''),
+                'description': issue.get('description', ''),
+                'severity': issue.get('severity', 'low'),
+                'affected_device': device['name'],
+                'status': 'Non corrigé'
+            }
+            for issue, device in vulnerable['issues'][:MAX_REPORTED_ISSUES]
+        ],
+        'remediation_plan': [
+            {
+                'action': recommendation['description'],
+                'priority': recommendation['priority'],
+                'impact': recommendation['details']
+            }
+            for recommendation in _recommendations(vulnerable['issues'])
+        ],
+        'total_vulnerabilities': vulnerable['issues_count'],
+        'critical_devices': distribution['critical'] + distribution['high'],
+        # Par définition, les appareils avec score >= 70 ne sont pas vulnérables
+        'severity_distribution': dict(distribution),
+        'vulnerability_types': dict(vulnerable['vulnerability_types'])
+    }
+    return {'vulnerability_data': vulnerability_data}
+
+
+class ReportDataBuilder:
+    """
+    Préparation des données des rapports mise en cache par version des données
+
+    Les sources ne sont rassemblées qu'une fois par version : tant que les appareils
+    (DeviceSecurityScoring.data_version) et le fichier des réseaux WiFi ne changent pas,
+    l'export de plusieurs rapports ou formats réutilise les mêmes données.
+    """
+
+    def __init__(self, security_scoring, protocol_analyzer=None,
+                 wifi_results_file: str = DEFAULT_WIFI_RESULTS_FILE):
+        """
+        Initialise le constructeur de données
+
+        Args:
+            security_scoring: Système de notation des appareils (DeviceSecurityScoring)
+            protocol_analyzer: Analyseur de protocoles (requis pour le rapport 'protocol')
+            wifi_results_file: Fichier JSON des réseaux WiFi détectés
+        """
+        self.security_scoring = security_scoring
+        self.protocol_analyzer = protocol_analyzer
+        self.wifi_results_file = wifi_results_file
+        self._lock = threading.Lock()
+        self._devices_version = None
+        self._device_sources = None
+        self._protocol_version = None
+        self._protocol_sources = None
+        self._reports: Dict[Tuple, Dict[str, Any]] = {}
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def _get_protocol_version(self) -> Tuple:
+        """Version des analyses de protocoles : fichier WiFi et historique de l'analyseur"""
+        try:
+            stat = os.stat(self.wifi_results_file)
+            file_version = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_version = None
+        history = getattr(self.protocol_analyzer, 'analyses', None)
+        return (file_version, len(history) if history is not None else None)
+
+    def get_data_version(self, report_type: str) -> Tuple:
+        """
+        Version des données d'un type de rapport
+
+        Args:
+            report_type: Type de rapport ('network', 'protocol', 'vulnerability')
+
+        Returns:
+            Tuple: Clé de version (change dès que les sources du rapport changent)
+        """
+        if report_type == 'protocol':
+            return (report_type, self._get_protocol_version())
+        if report_type == 'network' and self.protocol_analyzer is not None:
+            # La distribution des protocoles du rapport réseau suit l'historique des analyses
+            return (report_type, self.security_scoring.data_version, self._get_protocol_version())
+        return (report_type, self.security_scoring.data_version)
+
+    def _get_sources(self, report_type: str) -> Dict[str, Any]:
+        """Sources du rapport, rassemblées seulement si leur version a changé"""
+        if report_type == 'protocol':
+            version = self._get_protocol_version()
+            if self._protocol_sources is None or version != self._protocol_version:
+                self._protocol_sources = collect_report_sources(
+                    self.security_scoring, self.protocol_analyzer, self.wifi_results_file, report_types=['protocol']
+                )
+                # L'analyse ajoute des entrées à l'historique : la version est relevée après coup
+                self._protocol_version = self._get_protocol_version()
+            return self._protocol_sources
+
+        version = self.security_scoring.data_version
+        if self._device_sources is None or version != self._devices_version:
+            self._device_sources = collect_report_sources(self.security_scoring, report_types=[])
+            self._devices_version = version
+        if report_type == 'network' and self.protocol_analyzer is not None:
+            # Distribution des protocoles tirée de l'historique des analyses, sans nouvelle analyse
+            summary = self.protocol_analyzer.get_protocol_analysis_summary()
+            return {**self._device_sources, 'protocol': {'summary': summary}}
+        return self._device_sources
+
+    def get_report_data(self, report_type: str) -> Dict[str, Any]:
+        """
+        Données d'un rapport, construites une seule fois par version des données
+
+        Args:
+            report_type: Type de rapport ('network', 'protocol', 'vulnerability')
+
+        Returns:
+            Dict[str, Any]: Données du rapport (copie modifiable par l'appelant)
+        """
+        if report_type not in REPORT_TYPES:
+            raise ValueError(f"Type de rapport invalide: {report_type}")
+
+        with self._lock:
+            key = self.get_data_version(report_type)
+            report_data = self._reports.get(key)
+            if report_data is None:
+                self.stats['misses'] += 1
+                report_data = build_report_data(report_type, self._get_sources(report_type))
+                # L'analyse des protocoles modifie sa propre version : clé relevée après construction
+                key = self.get_data_version(report_type)
+                # Seule la version courante de chaque type de rapport est conservée
+                self._reports = {k: v for k, v in self._reports.items() if k[0] != report_type}
+                self._reports[key] = report_data
+            else:
+                self.stats['hits'] += 1
+
+            # L'enrichissement IA modifie les données : chaque appelant reçoit sa copie
+            return copy.deepcopy(report_data)
+
+    def invalidate(self):
+        """Vide le cache (les sources seront rassemblées à nouveau)"""
+        with self._lock:
+            self._device_sources = None
+            self._protocol_sources = None
+            self._reports = {}
@@ -3,13 +3,14 @@ Routes principales pour l'application NetSecure Pro
 """
 import json
 import logging
+import os
 import random
 from datetime import datetime, timedelta
 from functools import wraps
 
 from flask import (
     render_template, request, redirect, url_for, flash, jsonify,
-    session, abort, current_app
+    session, abort, current_app, send_from_directory
 )
 from flask_login import (
     current_user, login_user, logout_user, login_required
@@ -21,25 +22,39 @@ from forms import LoginForm, RegistrationForm, SaveTopologyForm
 from models import User, UserReport, SavedTopology, SecurityMascot
 from network_topology import NetworkTopology
 from security_scoring import DeviceSecurityScoring
-from assistant_securite import AssistantSecurite
+from assistant_securite import AssistantSecurite, split_response_chunks
 from protocol_analyzer import ProtocolAnalyzer
-from infographic_generator import InfographicGenerator
+from infographic_cache import DEFAULT_EXPORT_DIR
+from infographic_loader import get_infographic_generator, get_infographic_previews, warm_up_infographic_generator
 from ai_infographic_assistant import AIInfographicAssistant
 from recommendations import RecommendationSystem
+from report_data import ReportDataBuilder
 from threat_color_wheel import get_threat_wheel
 
 # Configuration du logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Durée de mise en cache des exports téléchargés (secondes)
+EXPORT_DOWNLOAD_MAX_AGE = 3600
+
+# Exports téléchargeables : fichiers des sous-répertoires de rapports, formats d'export connus
+# (les index de cache et autres fichiers internes de static/exports ne sont pas servis)
+DOWNLOADABLE_EXPORT_SUBDIRS = ('network', 'protocol', 'vulnerability')
+DOWNLOADABLE_EXPORT_EXTENSIONS = ('.png', '.svg', '.pdf', '.html', '.zip')
+
+# Fichier de scan fournissant le contexte réseau du chatbot
+CHATBOT_NETWORK_DATA_FILE = 'attached_assets/wifi_results.json'
+
 # Initialiser les classes principales
 network_topology = NetworkTopology()
 security_scoring = DeviceSecurityScoring()
 assistant_securite = AssistantSecurite()
 protocol_analyzer = ProtocolAnalyzer()
-infographic_generator = InfographicGenerator()
 ai_assistant = AIInfographicAssistant()
 recommendation_system = RecommendationSystem()
+# Données des rapports préparées une fois par version des données
+report_data_builder = ReportDataBuilder(security_scoring, protocol_analyzer)
 
 # Importer et initialiser le gestionnaire de mascottes
 from mascot_creator import MascotCreator
@@ -59,6 +74,10 @@ def register_routes(app):
     """
     Enregistre toutes les routes de l'application
     """
+    # Précharger le générateur d'infographies en arrière-plan plutôt qu'au chargement du module
+    if app.config.get('INFOGRAPHIC_WARMUP', True):
+        warm_up_infographic_generator(delay=app.config.get('INFOGRAPHIC_WARMUP_DELAY', 5.0))
+    
     # Contexte global pour tous les templates
     @app.context_processor
     def inject_now():
@@ -337,16 +356,31 @@ def register_routes(app):
     @app.route('/api/chatbot/history', methods=['GET'])
     @login_required
     def chatbot_history():
-        """API: Récupérer l'historique des conversations"""
-        conversations = assistant_securite.get_all_conversations()
-        return jsonify(conversations)
+        """API: Récupérer une page de l'historique des conversations (paramètres: limit, cursor)"""
+        try:
+            page = assistant_securite.get_conversations_page(
+                limit=request.args.get('limit'),
+                cursor=request.args.get('cursor')
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(page)
         
     @app.route('/api/chatbot/conversation/<conversation_id>', methods=['GET'])
     @login_required
     def chatbot_conversation(conversation_id):
-        """API: Récupérer une conversation spécifique"""
-        conversation = assistant_securite.get_conversation_history(conversation_id)
-        return jsonify(conversation)
+        """API: Récupérer une page d'une conversation (paramètres: limit, cursor, include_network_data)"""
+        include_network_data = request.args.get('include_network_data', 'true') == 'true'
+        try:
+            page = assistant_securite.get_conversation_page(
+                conversation_id,
+                limit=request.args.get('limit'),
+                cursor=request.args.get('cursor'),
+                include_network_data=include_network_data
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(page)
     
     # ======================================================
     # Routes pour l'analyse IA
@@ -814,16 +848,17 @@ def register_routes(app):
     @login_required
     def infographic_export_hub():
         """Hub central pour l'exportation des infographies"""
-        # Obtenir des aperçus pour chaque type de rapport
-        network_preview = infographic_generator.generate_preview('network')
-        protocol_preview = infographic_generator.generate_preview('protocol')
-        vulnerability_preview = infographic_generator.generate_preview('vulnerability')
+        # Obtenir des aperçus pour chaque type de rapport (sans rendu ni chargement bloquant)
+        previews = {
+            report_type: os.path.relpath(path, 'static').replace(os.sep, '/')
+            for report_type, path in get_infographic_previews().items()
+        }
         
         return render_template(
             'infographic_export_hub.html',
-            network_preview=network_preview,
-            protocol_preview=protocol_preview,
-            vulnerability_preview=vulnerability_preview
+            network_preview=previews['network'],
+            protocol_preview=previews['protocol'],
+            vulnerability_preview=previews['vulnerability']
         )
     
     @app.route('/generate-infographic', methods=['POST'])
@@ -833,6 +868,7 @@ def register_routes(app):
         report_type = request.form.get('report_type')
         export_format = request.form.get('format', 'png')
         use_ai = request.form.get('use_ai', 'true') == 'true'
+        optimize = request.form.get('optimize', 'false') == 'true'
         
         # Validation des entrées
         if report_type not in ['network', 'protocol', 'vulnerability']:
@@ -844,7 +880,7 @@ def register_routes(app):
             return redirect(url_for('infographic_export_hub'))
         
         try:
-            return generate_report(report_type, export_format, use_ai)
+            return generate_report(report_type, export_format, use_ai, optimize=optimize)
         except Exception as e:
             logger.error(f"Erreur lors de la génération de l'infographie: {e}")
             flash(f"Erreur lors de la génération de l'infographie: {str(e)}", 'danger')
@@ -857,6 +893,7 @@ def register_routes(app):
         # Paramètres par défaut
         export_format = 'pdf'  # Format par défaut (plus professionnel)
         use_ai = True  # Toujours utiliser l'IA pour enrichir les données
+        optimize = True  # Fichier léger, adapté au partage par e-mail
         
         # Validation des entrées
         if report_type not in ['network', 'protocol', 'vulnerability']:
@@ -866,13 +903,13 @@ def register_routes(app):
         logger.info(f"Génération d'un rapport One-Click pour {report_type} (format: {export_format})")
         
         try:
-            return generate_report(report_type, export_format, use_ai, one_click=True)
+            return generate_report(report_type, export_format, use_ai, one_click=True, optimize=optimize)
         except Exception as e:
             logger.error(f"Erreur lors de la génération du rapport One-Click: {e}")
             flash(f"Erreur lors de la génération du rapport rapide: {str(e)}", 'danger')
             return redirect(url_for('dashboard'))
     
-    def generate_report(report_type, export_format, use_ai, one_click=False):
+    def generate_report(report_type, export_format, use_ai, one_click=False, optimize=False):
         """Fonction utilitaire pour générer un rapport d'infographie"""
         
         if export_format not in ['png', 'pdf', 'svg']:
@@ -880,101 +917,42 @@ def register_routes(app):
             return redirect(url_for('infographic_export_hub'))
         
         try:
+            # Chargé à la première utilisation (matplotlib, NumPy)
+            infographic_generator = get_infographic_generator()
+            
+            # Données du rapport (réutilisées tant que les appareils et les réseaux n'ont pas changé)
+            report_data = report_data_builder.get_report_data(report_type)
+            
             # Générer l'infographie
             if report_type == 'network':
-                # Récupérer les données pour le rapport réseau
-                network_stats = security_scoring.get_network_security_status()
-                device_scores = security_scoring.get_all_device_scores()
-                
-                # Préparer les données pour l'infographie
-                network_data = {
-                    'security_score': network_stats['security_score'],
-                    'total_devices': network_stats['total_devices'],
-                    'vulnerable_devices': network_stats['vulnerable_devices'],
-                    'secure_devices': network_stats['secure_devices'],
-                    'device_types': network_stats['device_types'],
-                    'security_distribution': network_stats['security_distribution'],
-                    'devices': device_scores
-                }
-                
-                # Obtenir les données de vulnérabilité simplifiées
-                vulnerability_data = {
-                    'total_vulnerabilities': sum(d['issues_count'] for d in device_scores),
-                    'critical_vulnerabilities': sum(1 for d in device_scores if d['security_score'] < 50),
-                    'severity_distribution': {
-                        'critical': sum(1 for d in device_scores if d['security_score'] < 30),
-                        'high': sum(1 for d in device_scores if 30 <= d['security_score'] < 50),
-                        'medium': sum(1 for d in device_scores if 50 <= d['security_score'] < 70),
-                        'low': sum(1 for d in device_scores if 70 <= d['security_score'])
-                    }
-                }
-                
-                # Générer l'infographie
                 output_file = infographic_generator.generate_network_security_infographic(
-                    network_data=network_data,
-                    vulnerability_data=vulnerability_data,
+                    network_data=report_data['network_data'],
+                    vulnerability_data=report_data['vulnerability_data'],
                     format=export_format,
-                    use_ai=use_ai
+                    use_ai=use_ai,
+                    optimize=optimize
                 )
             
             elif report_type == 'protocol':
-                # Charger les données de protocole
-                with open('attached_assets/wifi_results.json', 'r') as f:
-                    wifi_data = json.load(f)
-                
-                # Analyser les protocoles de sécurité
-                protocol_results = protocol_analyzer.analyze_all_networks(wifi_data)
-                protocol_summary = protocol_analyzer.get_protocol_analysis_summary()
-                
-                # Préparer les données pour l'infographie
-                protocol_data = {
-                    'networks': protocol_results,
-                    'summary': protocol_summary,
-                    'comparison': protocol_analyzer.get_protocol_comparison(),
-                    'timeline': protocol_analyzer.get_protocol_timeline()
-                }
-                
-                # Générer l'infographie
                 output_file = infographic_generator.generate_protocol_analysis_infographic(
-                    protocol_data=protocol_data,
+                    protocol_data=report_data['protocol_data'],
                     format=export_format,
-                    use_ai=use_ai
+                    use_ai=use_ai,
+                    optimize=optimize
                 )
             
             else:  # vulnerability
-                # Récupérer les appareils vulnérables
-                device_scores = security_scoring.get_all_device_scores()
-                vulnerable_devices = [d for d in device_scores if d['security_score'] < 70]
-                
-                # Préparer les données pour l'infographie
-                vulnerability_data = {
-                    'vulnerable_devices': vulnerable_devices,
-                    'total_vulnerabilities': sum(d['issues_count'] for d in vulnerable_devices),
-                    'critical_vulnerabilities': sum(1 for d in vulnerable_devices if d['security_score'] < 50),
-                    'severity_distribution': {
-                        'critical': sum(1 for d in vulnerable_devices if d['security_score'] < 30),
-                        'high': sum(1 for d in vulnerable_devices if 30 <= d['security_score'] < 50),
-                        'medium': sum(1 for d in vulnerable_devices if 50 <= d['security_score'] < 70),
-                        'low': 0  # Par définition, les appareils avec score >= 70 ne sont pas vulnérables
-                    },
-                    'vulnerability_types': {
-                        'configuration': sum(1 for d in vulnerable_devices if any('config' in issue.lower() for issue in d['security_issues'])),
-                        'patch': sum(1 for d in vulnerable_devices if any('patch' in issue.lower() for issue in d['security_issues'])),
-                        'authentication': sum(1 for d in vulnerable_devices if any('auth' in issue.lower() for issue in d['security_issues'])),
-                        'encryption': sum(1 for d in vulnerable_devices if any('crypt' in issue.lower() for issue in d['security_issues'])),
-                        'other': sum(1 for d in vulnerable_devices if not any(keyword in ' '.join(d['security_issues']).lower() for keyword in ['config', 'patch', 'auth', 'crypt']))
-                    }
-                }
-                
-                # Générer l'infographie
                 output_file = infographic_generator.generate_vulnerability_report_infographic(
-                    vulnerability_data=vulnerability_data,
+                    vulnerability_data=report_data['vulnerability_data'],
                     format=export_format,
-                    use_ai=use_ai
+                    use_ai=use_ai,
+                    optimize=optimize
                 )
             
-            # Préparer les métadonnées pour l'affichage
-            file_info = infographic_generator.copy_export_to_user_downloads(output_file)
+            # Préparer les métadonnées pour l'affichage (fichier servi depuis son emplacement de rendu)
+            file_info = infographic_generator.get_export_file_info(output_file)
+            if file_info.get('success'):
+                file_info['download_url'] = url_for('download_export', export_path=file_info['export_path'])
             
             # Préparer des noms lisibles pour les types de rapports
             report_names = {
@@ -1001,6 +979,27 @@ def register_routes(app):
             flash(f"Erreur lors de la génération de l'infographie: {str(e)}", 'danger')
             return redirect(url_for('infographic_export_hub'))
     
+    @app.route('/exports/download/<path:export_path>')
+    @login_required
+    def download_export(export_path):
+        """Télécharge un export en flux depuis son emplacement de rendu (requêtes partielles et cache HTTP)"""
+        subdir, _, filename = export_path.partition('/')
+        if (subdir not in DOWNLOADABLE_EXPORT_SUBDIRS or not filename or '/' in filename
+                or os.path.splitext(filename)[1].lower() not in DOWNLOADABLE_EXPORT_EXTENSIONS):
+            abort(404)
+        
+        response = send_from_directory(
+            os.path.abspath(DEFAULT_EXPORT_DIR),
+            export_path,
+            as_attachment=True,
+            conditional=True,
+            max_age=EXPORT_DOWNLOAD_MAX_AGE
+        )
+        # Les exports sont propres à l'utilisateur connecté
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
+    
     # ======================================================
     # Routes pour la gamification
     # ======================================================
@@ -1148,6 +1147,60 @@ def register_routes(app):
             'devices': device_scores
         })
     
+    def stream_chatbot_response(sid, request_id, user_input, conversation_id):
+        """Génère la réponse du chatbot, la diffuse par fragments puis la sauvegarde en arrière-plan"""
+        try:
+            network_data = assistant_securite.read_network_context(CHATBOT_NETWORK_DATA_FILE)
+            exchange = assistant_securite.compose_exchange(
+                user_input,
+                conversation_id=conversation_id,
+                network_data=network_data
+            )
+            
+            for index, chunk in enumerate(split_response_chunks(exchange['response'])):
+                socketio.emit('chatbot_chunk', {
+                    'request_id': request_id,
+                    'conversation_id': conversation_id,
+                    'index': index,
+                    'text': chunk
+                }, to=sid)
+                socketio.sleep(0)
+            
+            socketio.emit('chatbot_done', {
+                'request_id': request_id,
+                'conversation_id': conversation_id,
+                'response': exchange['response'],
+                'timestamp': exchange['timestamp']
+            }, to=sid)
+        except Exception as e:
+            logger.error(f"Erreur lors de la génération de la réponse du chatbot: {e}")
+            socketio.emit('chatbot_error', {
+                'request_id': request_id,
+                'conversation_id': conversation_id,
+                'error': "Erreur lors de la génération de la réponse"
+            }, to=sid)
+            return
+        
+        # La réponse est envoyée : la conversation est sauvegardée sans retarder le client
+        assistant_securite.save_exchange_async(exchange)
+    
+    @socketio.on('chatbot_query')
+    def handle_chatbot_query(data):
+        """Chatbot en temps réel : accuse réception immédiatement, la réponse suit par fragments"""
+        if not current_user.is_authenticated:
+            return {'accepted': False, 'error': 'Authentification requise'}
+        
+        data = data or {}
+        user_input = data.get('query') or data.get('message')
+        if not user_input:
+            return {'accepted': False, 'error': 'Query is required'}
+        
+        conversation_id = data.get('conversation_id') or datetime.now().strftime("%Y%m%d%H%M%S")
+        request_id = data.get('request_id') or f"{conversation_id}-{random.randint(0, 999999):06d}"
+        socketio.start_background_task(stream_chatbot_response, request.sid, request_id, user_input, conversation_id)
+        
+        return {'accepted': True, 'conversation_id': conversation_id, 'request_id': request_id}
+    
     @socketio.on('request_topology_update')
     def handle_topology_update():
         """Envoie une mise à jour des données de topologie"""
@@ -9,15 +9,27 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Fichier de données des appareils par défaut
+DEVICES_SECURITY_FILE = os.path.join('instance', 'devices_security.json')
+
 class DeviceSecurityScoring:
     """Système de notation de sécurité des appareils en temps réel"""
     
-    def __init__(self):
-        """Initialise le système de notation de sécurité"""
+    def __init__(self, devices_file=DEVICES_SECURITY_FILE):
+        """
+        Initialise le système de notation de sécurité
+        
+        Args:
+            devices_file: Fichier de données des appareils (un fichier par site)
+        """
         self.devices = []
+        self.devices_file = devices_file
+        
+        # Version des données, incrémentée à chaque chargement ou modification (cache des rapports)
+        self.data_version = 0
         
         # Créer le dossier de données si nécessaire
-        os.makedirs('instance', exist_ok=True)
+        os.makedirs(os.path.dirname(devices_file) or '.', exist_ok=True)
         
         # Charger les données des appareils
         self.load_devices()
@@ -29,9 +41,10 @@ class DeviceSecurityScoring:
     def load_devices(self):
         """Charge les données des appareils"""
         try:
-            if os.path.exists('instance/devices_security.json'):
-                with open('instance/devices_security.json', 'r') as f:
+            if os.path.exists(self.devices_file):
+                with open(self.devices_file, 'r') as f:
                     self.devices = json.load(f)
+                self.data_version += 1
                 logger.info("Données de sécurité des appareils chargées")
             else:
                 logger.info("Aucun fichier de données d'appareils existant")
@@ -40,8 +53,10 @@ class DeviceSecurityScoring:
     
     def save_devices(self):
         """Sauvegarde les données des appareils"""
+        # Toute modification des appareils passe par une sauvegarde
+        self.data_version += 1
         try:
-            with open('instance/devices_security.json', 'w') as f:
+            with open(self.devices_file, 'w') as f:
                 json.dump(self.devices, f, indent=2)
             logger.info("Données de sécurité des appareils sauvegardées")
         except Exception as e:
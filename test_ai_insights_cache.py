@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du cache des insights IA des infographies
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ai_infographic_assistant import AIInfographicAssistant
+from ai_insights_cache import InsightCache
+from data_hashing import compute_data_hash
+from module_IA import SecurityAnalysisAI
+
+
+class TestInsightCache(unittest.TestCase):
+    """Tests du cache adressé par contenu"""
+
+    def setUp(self):
+        """Crée un répertoire temporaire pour la base du cache"""
+        self.cache_dir = tempfile.mkdtemp(prefix='insights_')
+        self.db_path = os.path.join(self.cache_dir, 'insights.db')
+
+    def tearDown(self):
+        """Supprime la base du cache"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_hash_depends_on_content_only(self):
+        """L'empreinte ignore l'ordre des clés mais distingue des données de même taille"""
+        first = {'devices': [{'name': 'A', 'score': 40}], 'overall_score': 60}
+        reordered = {'overall_score': 60, 'devices': [{'score': 40, 'name': 'A'}]}
+        other = {'devices': [{'name': 'B', 'score': 90}], 'overall_score': 60}
+        self.assertEqual(compute_data_hash(first), compute_data_hash(reordered))
+        self.assertNotEqual(compute_data_hash(first), compute_data_hash(other))
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        """Les entrées les moins récemment utilisées sont évincées au-delà des bornes"""
+        cache = InsightCache(self.db_path, max_entries=2)
+        cache.put('a', {'v': 1})
+        cache.put('b', {'v': 2})
+        cache.get('a')
+        cache.put('c', {'v': 3})
+        self.assertEqual(cache.keys(), ['a', 'c'])
+
+        small = InsightCache(os.path.join(self.cache_dir, 'small.db'), max_bytes=40)
+        small.put('x', {'payload': 'x' * 20})
+        small.put('y', {'payload': 'y' * 20})
+        self.assertEqual(small.keys(), ['y'])
+        self.assertLessEqual(small.get_stats()['total_bytes'], 40)
+
+    def test_ttl_and_incremental_persistence(self):
+        """Les entrées persistent d'une instance à l'autre et expirent après leur TTL"""
+        cache = InsightCache(self.db_path, ttl=60)
+        cache.put('a', {'v': 1})
+        cache.put('b', {'v': 2})
+
+        reopened = InsightCache(self.db_path, ttl=60)
+        self.assertEqual(reopened.get('b'), {'v': 2})
+
+        with mock.patch('ai_insights_cache.time.time', return_value=os.path.getmtime(self.db_path) + 3600):
+            self.assertIsNone(reopened.get('a'))
+        self.assertEqual(reopened.get_stats()['expirations'], 1)
+
+    def test_hits_do_not_write_until_flushed(self):
+        """Un succès ne touche pas la base ; la récence est écrite par lots à la fermeture"""
+        cache = InsightCache(self.db_path)
+        cache.put('a', {'v': 1})
+        cache.put('b', {'v': 2})
+
+        with mock.patch.object(cache, '_conn', wraps=cache._conn) as conn:
+            self.assertEqual(cache.get('a'), {'v': 1})
+            conn.execute.assert_not_called()
+            conn.commit.assert_not_called()
+        cache.close()
+
+        self.assertEqual(InsightCache(self.db_path).keys(), ['b', 'a'])
+
+
+class TestAssistantCache(unittest.TestCase):
+    """Tests de l'utilisation du cache par l'assistant"""
+
+    def setUp(self):
+        """Crée un assistant dont le module IA est observé"""
+        self.cache_dir = tempfile.mkdtemp(prefix='assistant_')
+        self.assistant = AIInfographicAssistant(cache_dir=self.cache_dir)
+        self.assistant.security_ai = mock.Mock(wraps=SecurityAnalysisAI())
+
+    def tearDown(self):
+        """Supprime la base du cache"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_same_data_hits_and_different_data_misses(self):
+        """Des données identiques réutilisent le cache, des données différentes de même taille non"""
+        data = {'overall_score': 60, 'devices': [{'name': 'A', 'security_score': 40}]}
+        with mock.patch.object(AIInfographicAssistant, 'is_available', return_value=True):
+            enriched = self.assistant.enrich_network_security_data(data)
+            self.assertIn('ai_security_analysis', enriched['devices'][0])
+            self.assertNotIn('ai_security_analysis', data['devices'][0])
+            self.assertEqual(self.assistant.enrich_network_security_data(data), enriched)
+            self.assistant.enrich_network_security_data(
+                {'overall_score': 60, 'devices': [{'name': 'B', 'security_score': 90}]}
+            )
+
+        stats = self.assistant.get_cache_stats()
+        self.assertEqual((stats['hits'], stats['stores']), (1, 2))
+        self.assertEqual(stats['cache_types'], {'network': 2})
+        self.assertEqual(self.assistant.security_ai.generate_network_security_analysis.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la génération groupée des rapports pour plusieurs sites
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import bulk_reports
+from report_data import build_report_data
+from security_scoring import DeviceSecurityScoring
+
+
+class TestBulkReports(unittest.TestCase):
+    """Tests de la génération groupée"""
+
+    def setUp(self):
+        """Crée deux sites avec leurs données d'appareils"""
+        self.sites_dir = tempfile.mkdtemp(prefix='sites_')
+        self.output_dir = tempfile.mkdtemp(prefix='bulk_')
+        for site in ('site-a', 'site-b'):
+            DeviceSecurityScoring(devices_file=os.path.join(self.sites_dir, site, 'devices_security.json'))
+
+    def tearDown(self):
+        """Supprime les données des sites et les rapports produits"""
+        shutil.rmtree(self.sites_dir, ignore_errors=True)
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def test_report_data_matches_generator_layout(self):
+        """Les données réelles ont la structure attendue par le générateur"""
+        sources = bulk_reports.build_site_snapshot('site-a', ['network', 'vulnerability'], self.sites_dir)
+        network = build_report_data('network', sources)
+        self.assertEqual(network['network_data']['total_devices'], 5)
+        self.assertTrue(all('name' in d for d in network['network_data']['devices']))
+
+        vulnerability = build_report_data('vulnerability', sources)['vulnerability_data']
+        self.assertIsInstance(vulnerability['critical_vulnerabilities'], list)
+        self.assertEqual(vulnerability['summary']['total'],
+                         sum(d['issues_count'] for d in vulnerability['vulnerable_devices']))
+
+    def test_snapshot_built_once_per_site(self):
+        """Les sources d'un site sont rassemblées une seule fois pour tous ses rapports"""
+        jobs = [
+            {'site': site, 'report_type': report_type, 'format': fmt}
+            for site in ('site-a', 'site-b')
+            for report_type in ('network', 'vulnerability')
+            for fmt in ('png', 'svg')
+        ]
+        with mock.patch('bulk_reports.build_site_snapshot', wraps=bulk_reports.build_site_snapshot) as snapshot:
+            manifest = bulk_reports.run_bulk_generation(
+                jobs, output_dir=self.output_dir, max_workers=1, dpi=30, use_ai=False, sites_dir=self.sites_dir
+            )
+
+        self.assertEqual(snapshot.call_count, 2)
+        self.assertEqual(manifest['summary'], {'total': 8, 'succeeded': 8, 'failed': 0})
+        for entry in manifest['jobs']:
+            self.assertTrue(os.path.exists(entry['path']))
+            self.assertEqual(os.path.getsize(entry['path']), entry['size'])
+
+    def test_failures_are_recorded_in_manifest(self):
+        """Les sites inconnus et les travaux invalides sont consignés comme échecs"""
+        jobs = [
+            {'site': 'inconnu', 'report_type': 'network', 'format': 'png'},
+            {'site': 'site-a', 'report_type': 'inconnu', 'format': 'png'},
+            {'site': '../site-a', 'report_type': 'network', 'format': 'png'}
+        ]
+        manifest = bulk_reports.run_bulk_generation(
+            jobs, output_dir=self.output_dir, max_workers=1, use_ai=False, sites_dir=self.sites_dir
+        )
+
+        self.assertEqual(manifest['summary']['failed'], 3)
+        self.assertIn('error', manifest['snapshots']['inconnu'])
+        with open(os.path.join(self.output_dir, bulk_reports.BULK_MANIFEST_FILENAME)) as f:
+            self.assertEqual(json.load(f)['run_id'], manifest['run_id'])
+
+
+if __name__ == '__main__':
+    unittest.main()
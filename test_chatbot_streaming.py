@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests des réponses diffusées et de la sauvegarde différée du chatbot
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from assistant_securite import AssistantSecurite, split_response_chunks
+from conversation_store import ConversationStore
+
+
+class TestChatbotStreaming(unittest.TestCase):
+    """Tests du découpage des réponses et de la sauvegarde en arrière-plan"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Crée l'assistant, ses conversations dans un répertoire temporaire"""
+        cls.class_dir = tempfile.mkdtemp(prefix='chatbot_')
+        cls.assistant = AssistantSecurite(conversations_dir=os.path.join(cls.class_dir, 'conversations'))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Supprime le répertoire des conversations de l'assistant"""
+        shutil.rmtree(cls.class_dir, ignore_errors=True)
+
+    def setUp(self):
+        """Redirige les conversations vers un répertoire temporaire"""
+        self.temp_dir = tempfile.mkdtemp(prefix='chatbot_')
+        self.assistant.conversation_store = ConversationStore(os.path.join(self.temp_dir, 'conversations'))
+
+    def tearDown(self):
+        """Supprime le répertoire temporaire"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_chunks_rebuild_response(self):
+        """Les fragments redonnent la réponse et sont coupés entre les mots"""
+        response = "Pour un chiffrement optimal, utilisez WPA3 avec authentification SAE. " * 5
+        chunks = split_response_chunks(response, chunk_size=40)
+        self.assertEqual(''.join(chunks), response)
+        self.assertTrue(all(len(chunk) <= 40 for chunk in chunks))
+        self.assertTrue(all(chunk.endswith(' ') for chunk in chunks[:-1]))
+        self.assertEqual(split_response_chunks('x' * 90, chunk_size=40), ['x' * 40, 'x' * 40, 'x' * 10])
+        self.assertEqual(split_response_chunks(''), [])
+
+    def test_exchange_saved_only_in_background(self):
+        """La réponse est composée sans écriture ; la sauvegarde est différée et ordonnée"""
+        store = self.assistant.conversation_store
+        exchange = self.assistant.compose_exchange("Bonjour", conversation_id='20240101120000',
+                                                   network_data=[{'ssid': 'Box', 'security': 'WPA2'}])
+        self.assertEqual(exchange['user_input'], 'bonjour')
+        self.assertEqual(exchange['network_data'], {'ssid': 'Box', 'security': 'WPA2'})
+        self.assertIsNone(store.get_metadata('20240101120000'))
+
+        second = self.assistant.compose_exchange("Quelles menaces ?", conversation_id='20240101120000')
+        self.assistant.save_exchange_async(exchange)
+        self.assistant.save_exchange_async(second)
+        self.assistant.flush_pending_saves(timeout=5)
+
+        messages = store.read_log('20240101120000')
+        self.assertEqual([m['user_input'] for m in messages], ['bonjour', 'quelles menaces ?'])
+        self.assertEqual(messages[0]['response'], exchange['response'])
+
+    def test_network_context_read_once_until_changed(self):
+        """Le fichier de scan n'est relu que s'il change, et chaque lecture renvoie une copie"""
+        path = os.path.join(self.temp_dir, 'wifi_results.json')
+        with open(path, 'w') as f:
+            json.dump({'ssid': 'Box'}, f)
+
+        with mock.patch('assistant_securite.json.load', wraps=json.load) as load:
+            first = self.assistant.read_network_context(path)
+            first['ssid'] = 'modifié'
+            self.assertEqual(self.assistant.read_network_context(path), {'ssid': 'Box'})
+            self.assertEqual(load.call_count, 1)
+
+            with open(path, 'w') as f:
+                json.dump({'ssid': 'Box-5G'}, f)
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+            self.assertEqual(self.assistant.read_network_context(path), {'ssid': 'Box-5G'})
+            self.assertEqual(load.call_count, 2)
+
+        self.assertEqual(self.assistant.read_network_context(os.path.join(self.temp_dir, 'absent.json')), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests des histogrammes de latence des clones IA
+"""
+import unittest
+from unittest import mock
+
+from ai_clone_manager import AIClone
+from clone_metrics import LATENCY_BUCKETS, LatencyHistogram, LatencyRecorder
+
+
+class TestCloneMetrics(unittest.TestCase):
+    """Tests des percentiles, de la fenêtre glissante et de la mesure des demandes"""
+
+    def test_percentiles_within_bucket_precision(self):
+        """Les percentiles sont estimés à la précision des classes, sans dépasser le maximum"""
+        histogram = LatencyHistogram()
+        for millis in range(1, 1001):
+            histogram.record(millis / 1000)
+
+        summary = histogram.to_dict()
+        self.assertEqual(summary['count'], 1000)
+        self.assertAlmostEqual(summary['mean'], 0.5005)
+        for percent, expected in ((50, 0.5), (95, 0.95), (99, 0.99)):
+            self.assertGreaterEqual(summary[f'p{percent}'], expected)
+            self.assertLessEqual(summary[f'p{percent}'], expected * 2 ** 0.25)
+        self.assertEqual(summary['max'], 1.0)
+        self.assertLessEqual(summary['p99'], summary['max'])
+
+        # Au-delà de la dernière classe, le maximum observé est renvoyé
+        histogram.record(LATENCY_BUCKETS[-1] * 10)
+        self.assertEqual(histogram.percentile(100), LATENCY_BUCKETS[-1] * 10)
+        self.assertEqual(LatencyHistogram().percentile(99), 0.0)
+
+    def test_window_forgets_old_measurements(self):
+        """La fenêtre ne garde que les dernières minutes, la vue à vie garde tout"""
+        recorder = LatencyRecorder(window_seconds=300, slot_seconds=30)
+        recorder.record('analyze_network', total=2.0, queue_wait=1.5, execution=0.5, now=1000)
+        recorder.record_error('analyze_network', 'timeout', now=1000)
+        recorder.record('analyze_network', total=0.1, queue_wait=0.0, execution=0.1, now=1400)
+
+        snapshot = recorder.snapshot(now=1400)
+        lifetime = snapshot['lifetime']['analyze_network']
+        window = snapshot['window']['analyze_network']
+        self.assertEqual((lifetime['total']['count'], window['total']['count']), (2, 1))
+        self.assertEqual(lifetime['errors'], {'timeout': 1})
+        self.assertEqual(window['errors'], {})
+        self.assertEqual(lifetime['queue_wait']['max'], 1.5)
+        self.assertEqual(window['execution']['max'], 0.1)
+        self.assertEqual(recorder.snapshot(now=2000)['window'], {})
+
+    def test_clone_records_latency_and_errors(self):
+        """Un clone mesure attente, exécution et erreurs de ses demandes"""
+        clone = AIClone("Clone mesuré", "network")
+        clone.process_request("analyze_network", {"overall_score": 70})
+        with mock.patch.object(clone, '_process_by_type', side_effect=ValueError("données invalides")):
+            failed = clone.process_request("analyze_network", {})
+        for request_type in ("type_inconnu_1", "type_inconnu_2"):
+            clone.process_request(request_type, {})
+        clone.status = "paused"
+        clone.process_request("analyze_network", {})
+        clone.drain_workers(timeout=5)
+
+        self.assertEqual(failed["error_code"], "failed")
+        stats = clone.latency_metrics.snapshot()['lifetime']['analyze_network']
+        self.assertEqual(stats['total']['count'], 1)
+        self.assertEqual(stats['errors'], {'failed': 1, 'unavailable': 1})
+        self.assertGreaterEqual(stats['total']['max'], stats['execution']['max'])
+        # Les types fournis par le client hors des types connus sont regroupés
+        lifetime = clone.latency_metrics.snapshot()['lifetime']
+        self.assertEqual(set(lifetime), {'analyze_network', 'other'})
+        self.assertEqual(lifetime['other']['total']['count'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
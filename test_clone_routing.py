@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la répartition des demandes entre clones IA
+"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from ai_clone_manager import AICloneManager
+
+
+class TestCloneRouting(unittest.TestCase):
+    """Tests de l'index de répartition et des politiques de choix du clone"""
+
+    def setUp(self):
+        """Crée un gestionnaire dans un répertoire temporaire"""
+        self.temp_dir = tempfile.mkdtemp(prefix='routing_')
+        self.config_path = os.path.join(self.temp_dir, 'ai_clones.json')
+        self.release = threading.Event()
+
+    def tearDown(self):
+        """Libère les traitements bloqués et supprime le répertoire temporaire"""
+        self.release.set()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_index_follows_create_update_delete(self):
+        """L'index suit les créations, changements de spécialisation et suppressions"""
+        manager = AICloneManager(config_path=self.config_path)
+        default_id = next(iter(manager.clones))
+        network = manager.create_clone("Réseau", "network")
+        protocol = manager.create_clone("Protocole", "protocol")
+
+        self.assertEqual(manager._select_clone("analyze_network"), (network, [network], False))
+        manager.update_clone(network.clone_id, {"specialization": "vulnerability"})
+        self.assertEqual(manager.get_routing_statistics()["index"]["vulnerability"], [network.clone_id])
+        # Plus de clone réseau : repli sur le clone général
+        chosen, _, fallback = manager._select_clone("analyze_network")
+        self.assertEqual((chosen.clone_id, fallback), (default_id, True))
+
+        manager.update_clone(protocol.clone_id, {"status": "paused"})
+        self.assertEqual(manager._select_clone("analyze_protocol")[0].clone_id, default_id)
+        manager.delete_clone(default_id)
+        self.assertNotIn("general", manager.get_routing_statistics()["index"])
+
+    def test_policies_spread_load(self):
+        """Un clone occupé ou lent reçoit moins de demandes que ses pairs"""
+        manager = AICloneManager(config_path=self.config_path, routing_policy="least_outstanding")
+        busy, idle = (manager.create_clone(f"Réseau {i}", "network") for i in range(2))
+        started = threading.Event()
+
+        def blocking_process(request_type, data):
+            started.set()
+            self.release.wait(5)
+            return {}
+
+        with mock.patch.object(busy, '_process_by_type', side_effect=blocking_process):
+            thread = threading.Thread(target=busy.process_request, args=("analyze_network", {}), daemon=True)
+            thread.start()
+            self.assertTrue(started.wait(5))
+            for _ in range(3):
+                result = manager.process_request("analyze_network", {"overall_score": 60})
+                self.assertEqual(result["clone_info"]["clone_id"], idle.clone_id)
+            self.release.set()
+            thread.join(5)
+
+        manager.routing_policy = "ewma_latency"
+        idle.latency_ewma, busy.latency_ewma = 0.5, 0.01
+        result = manager.process_request("analyze_network", {"overall_score": 60})
+        self.assertEqual(result["clone_info"]["clone_id"], busy.clone_id)
+
+        routing = manager.get_clone_statistics()["routing"]
+        self.assertEqual((routing["policy"], routing["decisions"], routing["fallbacks"]), ("ewma_latency", 4, 0))
+        self.assertEqual(routing["by_clone"], {idle.clone_id: 3, busy.clone_id: 1})
+
+        for clone in (busy, idle):
+            clone.drain_workers(timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
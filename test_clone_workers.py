@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests des pools de travail des clones IA
+"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from ai_clone_manager import AIClone, AICloneManager
+
+
+class TestCloneWorkers(unittest.TestCase):
+    """Tests de la file bornée, des délais et de l'arrêt progressif des clones"""
+
+    def setUp(self):
+        """Crée un gestionnaire dans un répertoire temporaire et un traitement bloquant"""
+        self.temp_dir = tempfile.mkdtemp(prefix='clones_')
+        self.manager = AICloneManager(config_path=os.path.join(self.temp_dir, 'ai_clones.json'))
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def tearDown(self):
+        """Libère les traitements bloqués et supprime le répertoire temporaire"""
+        self.release.set()
+        for clone in list(self.manager.clones.values()):
+            clone.drain_workers(timeout=5)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _blocking_process(self, request_type, data):
+        """Traitement qui attend d'être libéré par le test"""
+        self.started.set()
+        self.release.wait(5)
+        return {"request_type": request_type}
+
+    def _start_in_background(self, clone, results):
+        """Lance une demande dans un thread et attend qu'elle occupe le worker"""
+        thread = threading.Thread(
+            target=lambda: results.append(clone.process_request("analyze_network", {})),
+            daemon=True
+        )
+        thread.start()
+        self.assertTrue(self.started.wait(5))
+        return thread
+
+    def test_full_pool_rejects_request(self):
+        """Un clone saturé refuse immédiatement la demande suivante"""
+        clone = AIClone("Clone saturé", "network",
+                        worker_config={"max_workers": 1, "queue_size": 0, "timeout": 5})
+        results = []
+        with mock.patch.object(clone, '_process_by_type', side_effect=self._blocking_process):
+            thread = self._start_in_background(clone, results)
+            rejected = clone.process_request("analyze_network", {})
+            self.release.set()
+            thread.join(5)
+
+        self.assertEqual(rejected["error_code"], "overloaded")
+        self.assertEqual(results[0]["result"], {"request_type": "analyze_network"})
+        stats = clone.get_worker_stats()
+        self.assertEqual((stats["rejected"], stats["completed"], stats["in_flight"]), (1, 1, 0))
+        self.assertEqual(clone.performance_metrics["requests_processed"], 1)
+
+    def test_request_timeout(self):
+        """Une demande trop longue est abandonnée avec une erreur de délai"""
+        clone = AIClone("Clone lent", "network", worker_config={"timeout": 5})
+        with mock.patch.object(clone, '_process_by_type', side_effect=self._blocking_process):
+            result = clone.process_request("analyze_network", {}, timeout=0.05)
+            self.release.set()
+
+        self.assertEqual(result["error_code"], "timeout")
+        self.assertEqual(clone.get_worker_stats()["timeouts"], 1)
+        self.assertEqual(clone.performance_metrics["requests_processed"], 0)
+
+    def test_pause_and_delete_drain_accepted_requests(self):
+        """La mise en pause et la suppression rendent la main et terminent en arrière-plan les demandes acceptées"""
+        clone = self.manager.create_clone("Clone réseau", "network")
+        results = []
+        with mock.patch.object(clone, '_process_by_type', side_effect=self._blocking_process):
+            thread = self._start_in_background(clone, results)
+            pool = clone._worker_pool
+            self.manager.update_clone(clone.clone_id, {"status": "paused"})
+            # La mise en pause n'attend pas la demande en cours
+            self.assertFalse(self.release.is_set())
+            self.assertFalse(pool.get_stats()["accepting"])
+            self.assertEqual(clone.process_request("analyze_network", {})["error_code"], "unavailable")
+            self.release.set()
+            thread.join(5)
+
+        self.assertIn("result", results[0])
+        self.assertFalse(clone.get_worker_stats()["running"])
+
+        self.manager.update_clone(clone.clone_id, {"status": "active"})
+        self.assertIn("result", clone.process_request("analyze_network", {"overall_score": 80}))
+        pool = clone._worker_pool
+        self.assertTrue(self.manager.delete_clone(clone.clone_id))
+        self.assertFalse(clone.get_worker_stats()["running"])
+        self.assertFalse(pool.get_stats()["accepting"])
+
+    def test_batch_results_in_order_across_clones(self):
+        """Un lot est réparti entre les clones éligibles, attend les places libres et garde l'ordre"""
+        clones = [self.manager.create_clone(f"Clone protocole {i}", "protocol") for i in range(2)]
+        for clone in clones:
+            clone.configure_workers({"max_workers": 1, "queue_size": 0})
+        items = [{"request_type": "analyze_protocol", "data": {"protocol_name": f"P{i}"}} for i in range(6)]
+        items.insert(2, {"data": {}})
+        items.append({"request_type": "analyze_protocol", "clone_id": "inconnu"})
+
+        with mock.patch.object(clones[0], '_process_by_type', side_effect=lambda request_type, data: data), \
+                mock.patch.object(clones[1], '_process_by_type', side_effect=lambda request_type, data: data):
+            batch = self.manager.process_batch(items)
+
+        self.assertEqual((batch["succeeded"], batch["failed"]), (6, 2))
+        self.assertEqual(batch["results"][2]["error_code"], "invalid_request")
+        self.assertEqual(batch["results"][-1]["error_code"], "not_found")
+        for item, result in zip(items, batch["results"]):
+            if "result" in result:
+                self.assertEqual(result["result"], item["data"])
+        served_by = {r["clone_info"]["clone_id"] for r in batch["results"] if "result" in r}
+        self.assertEqual(served_by, {c.clone_id for c in clones})
+
+
+if __name__ == '__main__':
+    unittest.main()
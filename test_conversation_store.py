@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du stockage des conversations de l'assistant de sécurité
+"""
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from conversation_store import ConversationStore, build_search_query, encode_cursor
+
+
+class TestConversationStore(unittest.TestCase):
+    """Tests des journaux en ajout seul et de l'index des métadonnées"""
+
+    def setUp(self):
+        """Crée un répertoire de conversations temporaire"""
+        self.conversations_dir = tempfile.mkdtemp(prefix='conversations_')
+
+    def tearDown(self):
+        """Supprime le répertoire de conversations"""
+        shutil.rmtree(self.conversations_dir, ignore_errors=True)
+
+    def test_append_updates_index_without_reading_logs(self):
+        """L'ajout écrit une ligne et tient l'index à jour ; la liste ne lit aucun journal"""
+        store = ConversationStore(self.conversations_dir)
+        store.append('20240101120000', {'timestamp': '2024-01-01T12:00:00', 'user_input': 'Bonjour ' * 10})
+        store.append('20240101120000', {'timestamp': '2024-01-01T12:01:00', 'user_input': 'Et le WEP ?'})
+        store.append('20240302090000', {'timestamp': '2024-03-02T09:00:00', 'user_input': 'Menaces ?'})
+
+        with open(os.path.join(self.conversations_dir, '20240101120000.jsonl')) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        with mock.patch('builtins.open', side_effect=AssertionError('journal lu')):
+            conversations = store.list_conversations()
+        self.assertEqual([c['id'] for c in conversations], ['20240302090000', '20240101120000'])
+        self.assertEqual(conversations[1]['message_count'], 2)
+        self.assertEqual(conversations[1]['created_at'], '2024-01-01T12:00:00')
+        self.assertEqual(conversations[1]['updated_at'], '2024-01-01T12:01:00')
+        self.assertEqual(conversations[1]['preview'], ('Bonjour ' * 10)[:50])
+
+        self.assertEqual([m['user_input'] for m in store.read_log('20240101120000')][1], 'Et le WEP ?')
+
+    def test_concurrent_writers_keep_offsets_and_seqs(self):
+        """Deux magasins sur le même répertoire (comme deux processus) n'écrasent aucune entrée"""
+        stores = [ConversationStore(self.conversations_dir) for _ in range(2)]
+
+        def write(store, writer):
+            for i in range(25):
+                store.append('20240101120000', {'timestamp': '2024-01-01T12:00:00',
+                                                'user_input': f'{writer}-{i}', 'response': 'x' * (i + writer)})
+
+        threads = [threading.Thread(target=write, args=(store, writer)) for writer, store in enumerate(stores)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        page = stores[0].read_messages_page('20240101120000', limit=50, include_network_data=False)
+        self.assertEqual(sorted(m['user_input'] for m in page['messages']),
+                         sorted(f'{w}-{i}' for w in range(2) for i in range(25)))
+        self.assertEqual(stores[1].get_metadata('20240101120000')['message_count'], 50)
+
+    def test_legacy_files_migrated_and_truncated_lines_skipped(self):
+        """Les anciennes conversations JSON sont converties et indexées au démarrage"""
+        legacy = [{'timestamp': '2023-05-01T10:00:00', 'user_input': 'Salut', 'response': 'Bonjour'}]
+        with open(os.path.join(self.conversations_dir, '20230501100000.json'), 'w') as f:
+            json.dump(legacy, f)
+
+        store = ConversationStore(self.conversations_dir)
+        self.assertFalse(os.path.exists(os.path.join(self.conversations_dir, '20230501100000.json')))
+        self.assertEqual(store.read_log('20230501100000'), legacy)
+        self.assertEqual(store.get_metadata('20230501100000')['message_count'], 1)
+
+        # Écriture interrompue : la ligne tronquée est ignorée
+        with open(os.path.join(self.conversations_dir, '20230501100000.jsonl'), 'a') as f:
+            f.write('{"timestamp": "2023-05')
+        self.assertEqual(store.read_log('20230501100000'), legacy)
+
+    def test_legacy_migration_gated_by_index_version(self):
+        """La conversion des anciens fichiers n'a lieu qu'une fois, pour un index antérieur"""
+        ConversationStore(self.conversations_dir)
+        legacy_path = os.path.join(self.conversations_dir, '20230501100000.json')
+        with open(legacy_path, 'w') as f:
+            json.dump([{'timestamp': '2023-05-01T10:00:00', 'user_input': 'Salut'}], f)
+
+        ConversationStore(self.conversations_dir)
+        self.assertTrue(os.path.exists(legacy_path))
+
+        conn = sqlite3.connect(os.path.join(self.conversations_dir, 'index.db'))
+        conn.execute('PRAGMA user_version = 4')
+        conn.close()
+        store = ConversationStore(self.conversations_dir)
+        self.assertFalse(os.path.exists(legacy_path))
+        self.assertEqual(store.get_metadata('20230501100000')['message_count'], 1)
+        self.assertEqual([f for f in os.listdir(self.conversations_dir) if f.endswith('.tmp')], [])
+
+    def test_index_rebuilt_when_missing(self):
+        """Un index supprimé est reconstruit à partir des journaux"""
+        store = ConversationStore(self.conversations_dir)
+        for i in range(3):
+            store.append('20240101120000', {'timestamp': f'2024-01-01T12:0{i}:00', 'user_input': f'Question {i}'})
+        os.remove(store.index_path)
+
+        rebuilt = ConversationStore(self.conversations_dir)
+        self.assertEqual(rebuilt.get_metadata('20240101120000')['message_count'], 3)
+        self.assertEqual(rebuilt.get_metadata('20240101120000')['updated_at'], '2024-01-01T12:02:00')
+
+
+class TestConversationPagination(unittest.TestCase):
+    """Tests de la pagination par curseur"""
+
+    def setUp(self):
+        """Crée un stockage avec plusieurs conversations"""
+        self.conversations_dir = tempfile.mkdtemp(prefix='conversations_')
+        self.store = ConversationStore(self.conversations_dir)
+        for day in range(1, 6):
+            self.store.append(f'202401{day:02d}120000', {
+                'timestamp': f'2024-01-{day:02d}T12:00:00', 'user_input': f'Question {day}'
+            })
+        for i in range(7):
+            self.store.append('20240106120000', {
+                'timestamp': f'2024-01-06T12:00:{i:02d}',
+                'user_input': f'Message {i}',
+                'network_data': {'ssid': 'Box', 'scan': ['x' * 100] * 10}
+            })
+
+    def tearDown(self):
+        """Supprime le répertoire de conversations"""
+        shutil.rmtree(self.conversations_dir, ignore_errors=True)
+
+    def test_conversation_pages_follow_cursor(self):
+        """Les pages de conversations se suivent sans doublon, des plus récentes aux plus anciennes"""
+        ids, cursor, pages = [], None, 0
+        while True:
+            page = self.store.list_conversations_page(limit=2, cursor=cursor)
+            ids += [c['id'] for c in page['conversations']]
+            pages += 1
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, [c['id'] for c in self.store.list_conversations()])
+        self.assertEqual(ids[0], '20240106120000')
+
+        # Une conversation ajoutée entre deux pages n'en décale pas la suite
+        first = self.store.list_conversations_page(limit=2)
+        self.store.append('20240107120000', {'timestamp': '2024-01-07T12:00:00', 'user_input': 'Nouveau'})
+        second = self.store.list_conversations_page(limit=2, cursor=first['next_cursor'])
+        self.assertEqual([c['id'] for c in second['conversations']], ['20240104120000', '20240103120000'])
+
+        with self.assertRaises(ValueError):
+            self.store.list_conversations_page(cursor='pas-un-curseur')
+        with self.assertRaises(ValueError):
+            self.store.list_conversations_page(cursor=encode_cursor([3]))
+
+    def test_message_pages_read_only_requested_messages(self):
+        """Une page de messages est lue sans parcourir le journal et peut omettre les données réseau"""
+        page = self.store.read_messages_page('20240106120000', limit=3, include_network_data=False)
+        self.assertEqual([m['user_input'] for m in page['messages']], ['Message 0', 'Message 1', 'Message 2'])
+        self.assertNotIn('network_data', page['messages'][0])
+
+        with mock.patch.object(self.store, '_scan_log', side_effect=AssertionError('journal parcouru')):
+            second = self.store.read_messages_page('20240106120000', limit=3, cursor=page['next_cursor'])
+        self.assertEqual([m['seq'] for m in second['messages']], [3, 4, 5])
+        self.assertEqual(second['messages'][0]['network_data']['ssid'], 'Box')
+
+        last = self.store.read_messages_page('20240106120000', limit=3, cursor=second['next_cursor'])
+        self.assertEqual([m['seq'] for m in last['messages']], [6])
+        self.assertIsNone(last['next_cursor'])
+
+
+class TestNetworkDataDeduplication(unittest.TestCase):
+    """Tests du stockage des données réseau par référence"""
+
+    NETWORK = {'ssid': 'Box', 'security': 'WPA2', 'networks': [{'bssid': f'00:11:22:33:44:{i:02x}'} for i in range(50)]}
+
+    def setUp(self):
+        """Crée un répertoire de conversations temporaire"""
+        self.conversations_dir = tempfile.mkdtemp(prefix='conversations_')
+
+    def tearDown(self):
+        """Supprime le répertoire de conversations"""
+        shutil.rmtree(self.conversations_dir, ignore_errors=True)
+
+    def test_network_data_stored_once(self):
+        """Un même contexte réseau n'est stocké qu'une fois ; les messages n'en gardent que la référence"""
+        store = ConversationStore(self.conversations_dir)
+        for i in range(5):
+            store.append('20240101120000', {'user_input': f'Q{i}', 'network_data': dict(self.NETWORK)})
+        store.append('20240101120000', {'user_input': 'Sans réseau', 'network_data': None})
+
+        self.assertEqual(len(os.listdir(store.network_dir)), 1)
+        with open(os.path.join(self.conversations_dir, '20240101120000.jsonl')) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertNotIn('network_data', lines[0])
+        self.assertEqual(len({line.get('network_ref') for line in lines[:5]}), 1)
+
+        messages = store.read_log('20240101120000')
+        self.assertEqual(messages[4]['network_data'], self.NETWORK)
+        self.assertIsNone(messages[5]['network_data'])
+        messages[0]['network_data']['ssid'] = 'modifié'
+        self.assertEqual(store.read_log('20240101120000')[0]['network_data']['ssid'], 'Box')
+        page = store.read_messages_page('20240101120000', limit=2)
+        self.assertEqual(page['messages'][1]['network_data'], self.NETWORK)
+
+    def test_existing_logs_migrated(self):
+        """Les journaux aux données réseau intégrées sont réécrits avec des références"""
+        with open(os.path.join(self.conversations_dir, '20240101120000.jsonl'), 'w') as f:
+            for i in range(3):
+                f.write(json.dumps({'user_input': f'Q{i}', 'network_data': self.NETWORK}) + '\n')
+        # Index au format précédent (données réseau intégrées)
+        conn = sqlite3.connect(os.path.join(self.conversations_dir, 'index.db'))
+        conn.execute('PRAGMA user_version = 2')
+        conn.close()
+
+        log_path = os.path.join(self.conversations_dir, '20240101120000.jsonl')
+        size_before = os.path.getsize(log_path)
+        store = ConversationStore(self.conversations_dir)
+        self.assertLess(os.path.getsize(log_path), size_before / 3)
+        self.assertEqual(len(os.listdir(store.network_dir)), 1)
+        page = store.read_messages_page('20240101120000', limit=3)
+        self.assertEqual([m['network_data'] for m in page['messages']], [self.NETWORK] * 3)
+
+
+class TestConversationSearch(unittest.TestCase):
+    """Tests de la recherche plein texte"""
+
+    def setUp(self):
+        """Crée un stockage avec des échanges sur différentes menaces"""
+        self.conversations_dir = tempfile.mkdtemp(prefix='conversations_')
+        self.store = ConversationStore(self.conversations_dir)
+        exchanges = [
+            ('20240410090000', '2024-04-10T09:00:00', 'Mon routeur est-il vulnérable à KRACK ?', 'Mettez à jour le firmware.'),
+            ('20240502100000', '2024-05-02T10:00:00', 'Faut-il désactiver le WPS ?', 'Oui, le PIN WPS est cassable.'),
+            ('20240515110000', '2024-05-15T11:00:00', 'Quelles menaces ?', 'KRACK, KRACK et encore KRACK sur WPA2.'),
+            ('20240520120000', '2024-05-20T12:00:00', 'Sécurité du réseau', 'Utilisez WPA3.'),
+        ]
+        for conversation_id, timestamp, question, answer in exchanges:
+            self.store.append(conversation_id, {'timestamp': timestamp, 'user_input': question, 'response': answer})
+        # Échanges sans rapport, pour que les termes recherchés soient discriminants
+        for i in range(6):
+            self.store.append('20240301080000', {
+                'timestamp': f'2024-03-01T08:00:0{i}', 'user_input': 'Bonjour', 'response': 'Comment puis-je aider ?'
+            })
+
+    def tearDown(self):
+        """Supprime le répertoire de conversations"""
+        shutil.rmtree(self.conversations_dir, ignore_errors=True)
+
+    def test_query_building(self):
+        """La saisie libre est convertie sans interpréter la syntaxe FTS5"""
+        self.assertEqual(build_search_query('KRACK ou WPS'), '"KRACK" OR "WPS"')
+        self.assertEqual(build_search_query('wpa* et "routeur" NEAR('), '"wpa"* "routeur" "NEAR"')
+        with self.assertRaises(ValueError):
+            build_search_query(' ou ? ')
+
+    def test_ranked_filtered_and_paginated_hits(self):
+        """Les résultats sont classés, filtrables par date et paginés par curseur"""
+        hits = self.store.search('krack')['hits']
+        self.assertEqual([hit['conversation_id'] for hit in hits], ['20240515110000', '20240410090000'])
+        self.assertGreater(hits[0]['score'], hits[1]['score'])
+        self.assertIn('[KRACK]', hits[0]['snippet'])
+
+        hits = self.store.search('krack OR wps')['hits']
+        self.assertEqual({hit['conversation_id'] for hit in hits},
+                         {'20240410090000', '20240502100000', '20240515110000'})
+        may = self.store.search('krack ou wps', since='2024-05', until='2024-06')['hits']
+        self.assertEqual({hit['conversation_id'] for hit in may}, {'20240515110000', '20240502100000'})
+
+        # Les accents sont ignorés, et les nouveaux messages sont indexés à l'ajout
+        self.assertEqual(self.store.search('securite')['hits'][0]['conversation_id'], '20240520120000')
+        self.store.append('20240520120000', {'timestamp': '2024-05-20T12:01:00', 'user_input': 'Et le KRACK ?'})
+        first = self.store.search('krack', limit=2)
+        second = self.store.search('krack', limit=2, cursor=first['next_cursor'])
+        found = [(hit['conversation_id'], hit['seq']) for hit in first['hits'] + second['hits']]
+        self.assertEqual(len(set(found)), 3)
+        self.assertIn(('20240520120000', 1), found)
+        self.assertIsNone(second['next_cursor'])
+
+
+if __name__ == '__main__':
+    unittest.main()
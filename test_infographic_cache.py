@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de test pour le cache des rendus d'infographies
+"""
+import json
+import os
+import shutil
+import logging
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+from infographic_cache import ExportJanitor, RenderCache
+from infographic_generator import InfographicGenerator
+
+
+class TestRenderCache(unittest.TestCase):
+    """Tests unitaires pour le cache de rendus adressé par contenu"""
+
+    def setUp(self):
+        """Crée un répertoire d'export temporaire"""
+        self.export_dir = tempfile.mkdtemp(prefix='render_cache_')
+        self.cache = RenderCache(self.export_dir, max_bytes=1024, max_age=3600)
+
+    def tearDown(self):
+        """Supprime le répertoire d'export temporaire"""
+        shutil.rmtree(self.export_dir, ignore_errors=True)
+
+    def _write_artifact(self, name, size=100):
+        """Crée un faux fichier rendu de la taille demandée"""
+        path = os.path.join(self.export_dir, name)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        return path
+
+    def test_key_is_stable_and_order_independent(self):
+        """La clé ne dépend pas de l'ordre des clés du dictionnaire"""
+        key1 = self.cache.compute_key('network', {'a': 1, 'b': [1, 2]}, 'PNG', 150, True)
+        key2 = self.cache.compute_key('network', {'b': [1, 2], 'a': 1}, 'png', 150, True)
+        self.assertEqual(key1, key2)
+
+        # Un paramètre de rendu différent donne une autre clé
+        self.assertNotEqual(key1, self.cache.compute_key('network', {'a': 1, 'b': [1, 2]}, 'png', 300, True))
+        self.assertNotEqual(key1, self.cache.compute_key('network', {'a': 1, 'b': [1, 2]}, 'png', 150, False))
+        self.assertNotEqual(key1, self.cache.compute_key('network', {'a': 1, 'b': [2, 1]}, 'png', 150, True))
+
+    def test_hit_and_miss_counters(self):
+        """Les compteurs de succès et d'échecs sont mis à jour"""
+        key = self.cache.compute_key('protocol', {'x': 1}, 'svg', 150, False)
+        self.assertIsNone(self.cache.get(key))
+
+        path = self._write_artifact('a.svg')
+        self.cache.put(key, path)
+        self.assertEqual(self.cache.get(key), path)
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_size_eviction_is_lru(self):
+        """L'éviction par taille supprime l'entrée la moins récemment utilisée"""
+        first = self._write_artifact('first.png', 400)
+        second = self._write_artifact('second.png', 400)
+        self.cache.put('first', first)
+        self.cache.put('second', second)
+
+        # Accéder à la première entrée pour la rendre plus récente
+        self.cache.get('first')
+
+        third = self._write_artifact('third.png', 400)
+        self.cache.put('third', third)
+
+        self.assertIsNotNone(self.cache.get('first'))
+        self.assertIsNone(self.cache.get('second'))
+        self.assertFalse(os.path.exists(second))
+        self.assertGreaterEqual(self.cache.get_stats()['evictions'], 1)
+
+    def test_age_eviction(self):
+        """Une entrée expirée n'est plus servie"""
+        path = self._write_artifact('old.png')
+        self.cache.put('old', path)
+
+        with mock.patch('infographic_cache.time.time', return_value=time.time() + 7200):
+            self.assertIsNone(self.cache.get('old'))
+        self.assertFalse(os.path.exists(path))
+
+    def test_index_is_persisted(self):
+        """L'index est relu par une nouvelle instance"""
+        path = self._write_artifact('persisted.pdf')
+        self.cache.put('persisted', path)
+
+        reloaded = RenderCache(self.export_dir, max_bytes=1024, max_age=3600)
+        self.assertEqual(reloaded.get('persisted'), path)
+
+    def test_index_is_shared_between_instances(self):
+        """Deux instances (comme deux processus) voient les entrées et les accès l'une de l'autre"""
+        other = RenderCache(self.export_dir, max_bytes=1024, max_age=3600)
+        first = self._write_artifact('first.png', 400)
+        second = self._write_artifact('second.png', 400)
+        self.cache.put('first', first)
+        other.put('second', second)
+        self.assertEqual(self.cache.get('second'), second)
+        self.assertEqual(other.get_stats()['entries'], 2)
+
+        # L'accès enregistré par une instance protège l'entrée lors de l'éviction par l'autre
+        self.cache.get('first')
+        other.put('third', self._write_artifact('third.png', 400))
+        self.assertTrue(os.path.exists(first))
+        self.assertFalse(os.path.exists(second))
+        self.assertIsNone(self.cache.get('second'))
+
+    def test_legacy_json_index_is_imported(self):
+        """L'ancien index JSON est importé dans la base puis supprimé"""
+        path = self._write_artifact('legacy.png')
+        legacy_file = os.path.join(self.export_dir, 'render_cache.json')
+        now = time.time()
+        with open(legacy_file, 'w', encoding='utf-8') as f:
+            json.dump({'legacy': {'path': path, 'size': 100, 'created_at': now, 'last_access': now}}, f)
+
+        reloaded = RenderCache(self.export_dir, max_bytes=1024, max_age=3600)
+        self.assertEqual(reloaded.get('legacy'), path)
+        self.assertFalse(os.path.exists(legacy_file))
+
+
+class TestExportJanitor(unittest.TestCase):
+    """Tests unitaires pour le nettoyeur du répertoire d'exports"""
+
+    def setUp(self):
+        """Crée un répertoire d'export temporaire"""
+        self.export_dir = tempfile.mkdtemp(prefix='exports_')
+        os.makedirs(os.path.join(self.export_dir, 'downloads'))
+
+    def tearDown(self):
+        """Supprime le répertoire d'export temporaire"""
+        shutil.rmtree(self.export_dir, ignore_errors=True)
+
+    def _write_export(self, name, size=100, age=0):
+        """Crée un faux export de la taille et de l'âge demandés"""
+        path = os.path.join(self.export_dir, name)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        if age:
+            timestamp = time.time() - age
+            os.utime(path, (timestamp, timestamp))
+        return path
+
+    def test_expired_exports_are_removed(self):
+        """Les exports plus anciens que la durée de vie sont supprimés"""
+        old = self._write_export('old.png', age=7200)
+        recent = self._write_export('recent.png')
+
+        result = ExportJanitor(self.export_dir, max_bytes=10000, max_age=3600).sweep()
+
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(recent))
+        self.assertEqual(result['removed_files'], 1)
+
+    def test_quota_evicts_least_recently_used(self):
+        """Le quota est respecté en supprimant les exports les moins récemment utilisés"""
+        cache = RenderCache(self.export_dir)
+        first = self._write_export('first.png', 400, age=30)
+        second = self._write_export('second.png', 400, age=20)
+        cache.put('first', first)
+        cache.put('second', second)
+        # Un accès récent protège le fichier le plus ancien
+        cache.get('first')
+        self._write_export('third.png', 400)
+
+        ExportJanitor(self.export_dir, max_bytes=900, max_age=3600, render_cache=cache).sweep()
+
+        self.assertTrue(os.path.exists(first))
+        self.assertFalse(os.path.exists(second))
+        self.assertIsNone(cache.get('second'))
+
+    def test_hard_links_are_counted_once(self):
+        """Un export lié dans les téléchargements n'est compté qu'une fois dans le quota"""
+        source = self._write_export('report.pdf', 600)
+        link = os.path.join(self.export_dir, 'downloads', 'report.pdf')
+        os.link(source, link)
+
+        result = ExportJanitor(self.export_dir, max_bytes=700, max_age=3600).sweep()
+
+        self.assertEqual(result['removed_files'], 0)
+        self.assertTrue(os.path.exists(link))
+
+    def test_background_thread_can_be_stopped(self):
+        """Le thread de nettoyage démarre puis s'arrête proprement"""
+        janitor = ExportJanitor(self.export_dir, interval=60)
+        janitor.start()
+        self.assertTrue(janitor.get_stats()['running'])
+        janitor.stop(timeout=5)
+        self.assertFalse(janitor.get_stats()['running'])
+        self.assertGreaterEqual(janitor.get_stats()['sweeps'], 1)
+
+
+class TestInfographicGeneratorCache(unittest.TestCase):
+    """Tests d'intégration du cache dans le générateur d'infographies"""
+
+    def setUp(self):
+        """Initialise un générateur et des données d'exemple"""
+        self.generator = InfographicGenerator()
+        # Utiliser un index isolé pour ne pas toucher au cache réel
+        self.cache_dir = tempfile.mkdtemp(prefix='render_cache_')
+        self.generator.render_cache = RenderCache(self.cache_dir)
+        self.sample = self.generator._generate_sample_data('network')
+        self.generated = []
+
+    def tearDown(self):
+        """Supprime les fichiers générés"""
+        for path in self.generated:
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_identical_render_is_served_from_cache(self):
+        """Deux exports identiques ne déclenchent qu'un seul rendu"""
+        first = self.generator.generate_network_security_infographic(
+            self.sample['network_data'], self.sample['vulnerability_data'],
+            format='png', dpi=50, use_ai=False
+        )
+        self.generated.append(first)
+        second = self.generator.generate_network_security_infographic(
+            self.sample['network_data'], self.sample['vulnerability_data'],
+            format='png', dpi=50, use_ai=False
+        )
+        self.generated.append(second)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.generator.get_render_cache_stats()['hits'], 1)
+
+    def test_explicit_output_filename_bypasses_cache(self):
+        """Un nom de fichier imposé produit un nouveau rendu à ce nom"""
+        data = (self.sample['network_data'], self.sample['vulnerability_data'])
+        first = self.generator.generate_network_security_infographic(*data, format='png', dpi=50, use_ai=False)
+        self.generated.append(first)
+        named = self.generator.generate_network_security_infographic(
+            *data, output_filename='cache_test_named.png', format='png', dpi=50, use_ai=False
+        )
+        self.generated.append(named)
+
+        self.assertEqual(os.path.basename(named), 'cache_test_named.png')
+        self.assertTrue(os.path.exists(named))
+        self.assertEqual(self.generator.get_render_cache_stats()['hits'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de test pour le générateur d'infographies
+"""
+import io
+import os
+import shutil
+import subprocess
+import sys
+import logging
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+import matplotlib.image as mpimg
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
+
+import benchmark_infographics
+import infographic_loader
+from infographic_cache import RenderCache
+from infographic_generator import InfographicGenerator
+from infographic_layers import StaticLayerImage
+from infographic_output import round_svg_coordinates, save_figure
+from infographic_previews import PreviewCache, compute_preview_version
+from infographic_reduction import get_data_reduction_options, lttb_indices, top_n_with_others
+
+
+class TestInfographicBundle(unittest.TestCase):
+    """Tests de l'export multi-formats à partir d'une seule mise en page"""
+
+    def setUp(self):
+        """Initialise un générateur avec un cache isolé"""
+        self.generator = InfographicGenerator()
+        self.cache_dir = tempfile.mkdtemp(prefix='render_cache_')
+        self.generator.render_cache = RenderCache(self.cache_dir)
+        self.sample = self.generator._generate_sample_data('network')
+        self.generated = []
+
+    def tearDown(self):
+        """Supprime les fichiers générés"""
+        for path in self.generated:
+            if path and os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_bundle_lays_out_figure_once(self):
+        """Une seule figure est construite pour tous les formats"""
+        with mock.patch.object(
+            self.generator, '_build_report_figure', wraps=self.generator._build_report_figure
+        ) as build:
+            bundle = self.generator.generate_infographic_bundle(
+                'network', self.sample, output_basename='bundle_test', dpi=50, use_ai=False, create_zip=True
+            )
+        self.generated.extend(bundle['files'].values())
+        self.generated.append(bundle['zip'])
+
+        self.assertTrue(bundle['success'])
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(list(bundle['files'].keys()), ['png', 'pdf', 'svg'])
+        for path in bundle['files'].values():
+            self.assertTrue(os.path.exists(path))
+
+        with zipfile.ZipFile(bundle['zip']) as archive:
+            self.assertEqual(
+                sorted(archive.namelist()),
+                ['bundle_test.pdf', 'bundle_test.png', 'bundle_test.svg']
+            )
+
+    def test_bundle_reuses_cached_formats(self):
+        """Les formats déjà rendus sont servis depuis le cache"""
+        first = self.generator.generate_infographic_bundle(
+            'network', self.sample, formats=['png'], dpi=50, use_ai=False
+        )
+        self.generated.extend(first['files'].values())
+
+        second = self.generator.generate_infographic_bundle(
+            'network', self.sample, formats=['png', 'svg'], dpi=50, use_ai=False
+        )
+        self.generated.extend(second['files'].values())
+
+        self.assertEqual(second['cached_formats'], ['png'])
+        self.assertEqual(second['rendered_formats'], ['svg'])
+
+        # Un nom de sortie explicite force un nouveau rendu
+        named = self.generator.generate_infographic_bundle(
+            'network', self.sample, formats=['png'], output_basename='bundle_named', dpi=50, use_ai=False
+        )
+        self.generated.extend(named['files'].values())
+        self.assertEqual(named['rendered_formats'], ['png'])
+        self.assertEqual(os.path.basename(named['files']['png']), 'bundle_named.png')
+
+    def test_bundle_rejects_invalid_input(self):
+        """Un type de rapport ou des formats invalides renvoient une erreur"""
+        self.assertFalse(self.generator.generate_infographic_bundle('unknown', {})['success'])
+        self.assertFalse(self.generator.generate_infographic_bundle('network', self.sample, formats=['bmp'])['success'])
+
+
+
+class TestOptimizedOutput(unittest.TestCase):
+    """Tests des exports optimisés en taille"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Construit une figure d'exemple partagée par les tests"""
+        cls.generator = InfographicGenerator(use_cache=False)
+        cls.fig = cls.generator._build_report_figure('network', cls.generator._generate_sample_data('network'), 100)
+        cls.output_dir = tempfile.mkdtemp(prefix='optimized_output_')
+
+    @classmethod
+    def tearDownClass(cls):
+        """Ferme la figure et supprime les fichiers produits"""
+        plt.close(cls.fig)
+        shutil.rmtree(cls.output_dir, ignore_errors=True)
+
+    def _save(self, fmt, optimize):
+        """Enregistre la figure et renvoie (chemin, taille)"""
+        path = os.path.join(self.output_dir, f"{'optimized' if optimize else 'standard'}.{fmt}")
+        return path, save_figure(self.fig, path, fmt, optimize)
+
+    def test_png_uses_palette(self):
+        """Le PNG optimisé est indexé et plus léger"""
+        _, standard_size = self._save('png', False)
+        path, optimized_size = self._save('png', True)
+        self.assertLess(optimized_size, standard_size)
+        with Image.open(path) as image:
+            self.assertEqual(image.mode, 'P')
+
+    def test_svg_keeps_text(self):
+        """Le SVG optimisé conserve le texte et arrondit les coordonnées"""
+        _, standard_size = self._save('svg', False)
+        path, optimized_size = self._save('svg', True)
+        self.assertLess(optimized_size, standard_size)
+        with open(path, encoding='utf-8') as f:
+            svg = f.read()
+        self.assertIn('RAPPORT DE SÉCURITÉ RÉSEAU', svg)
+        self.assertEqual(round_svg_coordinates('<path d="M 1.23456 -7.891"/>3.14159'), '<path d="M 1.23 -7.89"/>3.14159')
+        # Arrondi au plus proche, et non troncature
+        self.assertEqual(round_svg_coordinates('<path d="M 1.996 0.126 -0.001 2.3456"/>'),
+                         '<path d="M 2 0.13 0 2.35"/>')
+
+    def test_pdf_embeds_truetype_subset(self):
+        """Le PDF optimisé embarque des polices TrueType sous-ensemblées"""
+        _, standard_size = self._save('pdf', False)
+        path, optimized_size = self._save('pdf', True)
+        self.assertLess(optimized_size, standard_size)
+        with open(path, 'rb') as f:
+            self.assertIn(b'/FontFile2', f.read())
+
+    def test_render_cache_distinguishes_optimized_output(self):
+        """Les rendus standard et optimisés ont des clés de cache distinctes"""
+        cache = RenderCache(self.output_dir)
+        standard_key = cache.compute_key('network', {}, 'png', 150, False)
+        self.assertEqual(standard_key, cache.compute_key('network', {}, 'png', 150, False, optimize=False))
+        self.assertNotEqual(standard_key, cache.compute_key('network', {}, 'png', 150, False, optimize=True))
+
+
+class TestStaticLayers(unittest.TestCase):
+    """Tests de la composition des éléments statiques depuis des calques en cache"""
+
+    def setUp(self):
+        """Initialise un générateur sans cache de rendus"""
+        self.generator = InfographicGenerator(use_cache=False)
+        self.sample = self.generator._generate_sample_data('network')
+
+    def _render_png(self, static_layers):
+        """Rend la figure réseau en PNG et renvoie les pixels"""
+        fig = self.generator._build_report_figure('network', self.sample, 50, static_layers=static_layers)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight')
+        plt.close(fig)
+        buffer.seek(0)
+        return mpimg.imread(buffer)
+
+    def test_layered_render_matches_full_render(self):
+        """Le rendu composé est visuellement identique au rendu complet"""
+        reference = self._render_png(static_layers=False)
+        layered = self._render_png(static_layers=True)
+
+        self.assertEqual(reference.shape, layered.shape)
+        self.assertLess(float(np.abs(reference - layered).mean()), 0.01)
+
+    def test_layers_are_reused(self):
+        """Les calques sont rendus une fois puis servis depuis le cache"""
+        self._render_png(static_layers=True)
+        misses = self.generator.static_layer_cache.get_stats()['misses']
+        self._render_png(static_layers=True)
+
+        stats = self.generator.static_layer_cache.get_stats()
+        self.assertEqual(stats['misses'], misses)
+        self.assertEqual(stats['hits'], 2)
+
+    def test_vector_figures_keep_live_artists(self):
+        """Les figures vectorielles ne contiennent aucun calque raster"""
+        fig = self.generator._build_report_figure('network', self.sample, 50)
+        try:
+            self.assertFalse(any(isinstance(a, StaticLayerImage) for a in fig.artists))
+        finally:
+            plt.close(fig)
+
+
+
+class TestDataReduction(unittest.TestCase):
+    """Tests de la réduction des grandes séries avant tracé"""
+
+    def test_lttb_keeps_bounds_and_extremes(self):
+        """LTTB conserve le nombre de points demandé, les extrémités et les pics"""
+        values = [50] * 1000
+        values[400] = 95
+        values[700] = 5
+
+        indices = lttb_indices(values, 20)
+
+        self.assertEqual(len(indices), 20)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], 999)
+        self.assertEqual(indices, sorted(indices))
+        self.assertIn(400, indices)
+        self.assertIn(700, indices)
+
+    def test_lttb_leaves_short_series_untouched(self):
+        """Une série plus courte que le seuil n'est pas modifiée"""
+        self.assertEqual(lttb_indices([1, 2, 3], 60), [0, 1, 2])
+
+    def test_top_n_with_others_bucket(self):
+        """Les n plus petits éléments sont conservés, les autres regroupés"""
+        devices = [{'name': f"d{i}", 'security_score': score} for i, score in enumerate([90, 10, 70, 30, 50])]
+
+        reduced = top_n_with_others(
+            devices, 2, key=lambda d: d['security_score'],
+            others_factory=lambda others: {'name': 'Autres', 'count': len(others)}
+        )
+
+        self.assertEqual([d['name'] for d in reduced], ['d1', 'd3', 'Autres'])
+        self.assertEqual(reduced[-1]['count'], 3)
+
+    def test_options_are_configurable_per_report(self):
+        """Les paramètres d'un rapport surchargent les valeurs par défaut"""
+        options = get_data_reduction_options({'devices_top_n': 10})
+        self.assertEqual(options['devices_top_n'], 10)
+        self.assertEqual(options['trend_max_points'], get_data_reduction_options()['trend_max_points'])
+
+    def test_large_inputs_are_bounded_in_charts(self):
+        """Les graphiques ne tracent qu'un nombre borné de points et de barres"""
+        generator = InfographicGenerator(use_cache=False)
+        sample = generator._generate_sample_data('network')
+        network_data = dict(sample['network_data'])
+        network_data['security_trend'] = [{'date': f"J{i}", 'score': i % 100} for i in range(2000)]
+        network_data['devices'] = [{'name': f"dev{i}", 'security_score': i % 100} for i in range(500)]
+        network_data['data_reduction'] = {'trend_max_points': 30, 'devices_top_n': 4}
+
+        fig = generator._build_network_security_figure(network_data, sample['vulnerability_data'], 50)
+        try:
+            devices_ax, trend_ax = fig.axes[4], fig.axes[5]
+            self.assertEqual(len(devices_ax.patches), 5)
+            self.assertEqual(devices_ax.get_yticklabels()[-1].get_text(), 'Autres (496 appareils)')
+            self.assertEqual(len(trend_ax.lines[0].get_xdata()), 30)
+            self.assertLessEqual(len(trend_ax.get_xticks()), get_data_reduction_options()['trend_max_ticks'])
+        finally:
+            plt.close(fig)
+
+
+class TestExportDelivery(unittest.TestCase):
+    """Tests de la mise à disposition des exports sans copie"""
+
+    def setUp(self):
+        """Crée un faux export dans le répertoire d'exports"""
+        self.generator = InfographicGenerator(use_cache=False)
+        self.source = os.path.join('static', 'exports', 'network', 'delivery_test.png')
+        os.makedirs(os.path.dirname(self.source), exist_ok=True)
+        with open(self.source, 'wb') as f:
+            f.write(b'x' * 128)
+        self.generated = [self.source]
+
+    def tearDown(self):
+        """Supprime les fichiers créés"""
+        for path in self.generated:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_export_info_points_to_render_location(self):
+        """Les métadonnées désignent le fichier rendu, sans copie"""
+        info = self.generator.get_export_file_info(self.source)
+
+        self.assertTrue(info['success'])
+        self.assertEqual(info['path'], 'exports/network/delivery_test.png')
+        self.assertEqual(info['export_path'], 'network/delivery_test.png')
+
+    def test_downloads_are_hard_linked(self):
+        """Le fichier placé dans les téléchargements partage le contenu de l'export"""
+        info = self.generator.copy_export_to_user_downloads(self.source)
+        destination = os.path.join('static', info['path'])
+        self.generated.append(destination)
+
+        self.assertTrue(info['success'])
+        self.assertTrue(os.path.samefile(self.source, destination))
+
+
+class TestPreviews(unittest.TestCase):
+    """Tests des aperçus versionnés générés en arrière-plan"""
+
+    def setUp(self):
+        """Initialise un générateur avec un répertoire d'aperçus isolé"""
+        self.generator = InfographicGenerator(use_cache=False)
+        self.previews_dir = tempfile.mkdtemp(prefix='previews_')
+        for filename in ('network_security_preview.svg', 'protocol_analysis_preview.svg',
+                         'vulnerability_report_preview.svg'):
+            with open(os.path.join(self.previews_dir, filename), 'w') as f:
+                f.write('<svg/>')
+        self.generator.preview_cache = PreviewCache(self.previews_dir, version='v1')
+
+    def tearDown(self):
+        """Supprime le répertoire d'aperçus"""
+        shutil.rmtree(self.previews_dir, ignore_errors=True)
+
+    def test_preview_version_is_stable(self):
+        """La version dépend uniquement du code du générateur"""
+        self.assertEqual(compute_preview_version(), compute_preview_version())
+        self.assertNotEqual(compute_preview_version(), compute_preview_version(('infographic_loader.py',)))
+
+    def test_missing_preview_does_not_render_on_request(self):
+        """Sans aperçu à jour, l'aperçu fourni est renvoyé et le rendu part en arrière-plan"""
+        with mock.patch.object(self.generator.preview_cache, 'warm_up') as warm_up, \
+                mock.patch.object(self.generator, '_render_preview') as render:
+            path = self.generator.generate_preview('protocol')
+
+        self.assertEqual(path, os.path.join(self.previews_dir, 'protocol_analysis_preview.svg'))
+        warm_up.assert_called_once()
+        render.assert_not_called()
+
+    def test_missing_fallback_renders_on_request(self):
+        """Sans aperçu à jour ni aperçu fourni, l'aperçu est rendu immédiatement"""
+        os.remove(os.path.join(self.previews_dir, 'protocol_analysis_preview.svg'))
+        with mock.patch.object(self.generator.preview_cache, 'warm_up') as warm_up, \
+                mock.patch.object(self.generator, '_render_preview',
+                                  side_effect=lambda report_type, path: open(path, 'w').write('<svg/>')):
+            path = self.generator.generate_preview('protocol')
+
+        self.assertEqual(path, self.generator.preview_cache.get_versioned_path('protocol'))
+        self.assertTrue(os.path.exists(path))
+        warm_up.assert_not_called()
+
+    def test_warm_up_builds_versioned_previews(self):
+        """Le préchargement génère les aperçus de la version courante et remplace les anciens"""
+        self.generator.warm_up_previews(background=False)
+        for report_type in ('network', 'protocol', 'vulnerability'):
+            path = self.generator.generate_preview(report_type)
+            self.assertTrue(path.endswith(f"{report_type}_v1.svg"))
+            self.assertGreater(os.path.getsize(path), 1000)
+
+        self.generator.preview_cache = PreviewCache(self.previews_dir, version='v2')
+        self.generator.preview_cache.build('network', lambda report_type, path: open(path, 'w').write('<svg/>'))
+        generated = os.listdir(self.generator.preview_cache.generated_dir)
+        self.assertIn('network_v2.svg', generated)
+        self.assertNotIn('network_v1.svg', generated)
+        self.assertIn('protocol_v1.svg', generated)
+
+
+class TestLazyLoading(unittest.TestCase):
+    """Tests du chargement différé du générateur d'infographies"""
+
+    def test_loader_does_not_import_matplotlib(self):
+        """Importer le chargeur ne charge ni matplotlib ni NumPy"""
+        code = (
+            "import sys, infographic_loader; "
+            "print('matplotlib' in sys.modules, 'numpy' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), 'False False')
+
+    def test_generator_is_created_once(self):
+        """Le générateur est créé à la première utilisation puis réutilisé"""
+        # Ne pas démarrer de nettoyage réel du répertoire d'exports pendant les tests
+        with mock.patch('infographic_cache.ExportJanitor.start'):
+            thread = infographic_loader.warm_up_infographic_generator(previews=False)
+            thread.join(timeout=60)
+
+        self.assertTrue(infographic_loader.is_infographic_generator_loaded())
+        self.assertIs(infographic_loader.get_infographic_generator(), infographic_loader.get_infographic_generator())
+
+
+class TestRenderBenchmark(unittest.TestCase):
+    """Tests de la suite de rendus et du contrôle de fuite mémoire"""
+
+    def test_suite_times_each_chart_helper(self):
+        """La suite mesure chaque fonction de tracé et restaure les méthodes du générateur"""
+        results = benchmark_infographics.run_render_suite(data_sizes=(5, 40), dpis=(30,), repeat=1)
+        self.assertEqual(len(results), 6)
+        network = results[('network', 40, 30)]['helpers']
+        self.assertIn('_create_security_score_gauge', network)
+        self.assertIn('_create_vulnerable_devices_chart', network)
+        self.assertIn('_create_top_vulnerabilities_list', results[('vulnerability', 5, 30)]['helpers'])
+
+    def test_scaled_data_keeps_unique_names(self):
+        """Les séries redimensionnées ont la taille demandée et des noms uniques"""
+        data = InfographicGenerator(use_cache=False)._generate_sample_data('network')
+        devices = benchmark_infographics.scale_report_data(data, 30)['network_data']['devices']
+        self.assertEqual(len(devices), 30)
+        self.assertEqual(len({d['name'] for d in devices}), 30)
+
+    def test_renders_release_figures_and_artists(self):
+        """Après une série de rendus, aucune figure ni aucun artiste ne reste en mémoire"""
+        report = benchmark_infographics.check_memory_leaks(renders=3, dpi=30, data_size=10, formats=('png',))
+        self.assertEqual(report['growth']['figures'], 0)
+        self.assertLessEqual(report['growth']['artists'], 0)
+        self.assertLessEqual(report['growth']['traced_kb'], benchmark_infographics.LEAK_TRACED_TOLERANCE_KB)
+
+
+if __name__ == '__main__':
+    unittest.main()
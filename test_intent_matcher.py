@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la détection des intentions de l'assistant de sécurité
+"""
+import random
+import unittest
+
+from assistant_securite import INTENT_KEYWORDS
+from intent_matcher import IntentMatcher
+
+
+class TestIntentMatcher(unittest.TestCase):
+    """Tests de l'automate d'intentions"""
+
+    def setUp(self):
+        """Compile l'automate des intentions de l'assistant"""
+        self.matcher = IntentMatcher(INTENT_KEYWORDS)
+
+    def test_matches_keyword_scan_of_each_intent(self):
+        """Les intentions trouvées en un parcours sont celles de la recherche mot-clé par mot-clé"""
+        rng = random.Random(42)
+        vocabulary = [keyword for _, keywords in INTENT_KEYWORDS for keyword in keywords]
+        vocabulary += ['wifi', 'mon', 'quel', 'est', 'le', 'c', 'k', 'protoc', 'mot de']
+        for _ in range(300):
+            text = ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 6)))
+            expected = [intent for intent, keywords in INTENT_KEYWORDS if any(k in text for k in keywords)]
+            self.assertEqual(self.matcher.classify(text)['intents'], expected, text)
+
+    def test_positions_and_overlapping_keywords(self):
+        """Chaque occurrence est renvoyée avec sa position, y compris les chevauchements"""
+        text = "mot de passe wpa2 ou wep ?"
+        matches = self.matcher.classify(text)['matches']
+        self.assertEqual(
+            [(m['keyword'], m['start'], m['end']) for m in matches],
+            [('mot de passe', 0, 12), ('wpa', 13, 16), ('wep', 21, 24)]
+        )
+
+        overlapping = IntentMatcher([('a', ['secur']), ('b', ['sécuriser', 'curi'])]).find_all('sécuriser')
+        self.assertEqual([(m['keyword'], m['start']) for m in overlapping], [('sécuriser', 0), ('curi', 2)])
+
+    def test_priority_order(self):
+        """L'intention retenue est la plus prioritaire, quelle que soit sa position"""
+        result = self.matcher.classify("Analyse des menaces, bonjour")
+        self.assertEqual(result['intent'], 'greeting')
+        self.assertEqual(result['intents'], ['greeting', 'threats', 'analysis'])
+        self.assertIsNone(self.matcher.classify("")['intent'])
+
+
+if __name__ == '__main__':
+    unittest.main()
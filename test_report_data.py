@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la préparation des données des rapports d'infographies
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import report_data
+from protocol_analyzer import ProtocolAnalyzer
+from report_data import ReportDataBuilder, build_report_data, collect_report_sources
+from security_scoring import DeviceSecurityScoring
+
+
+class TestReportData(unittest.TestCase):
+    """Tests du parcours unique et du cache par version des données"""
+
+    def setUp(self):
+        """Crée un jeu d'appareils notés dans un répertoire temporaire"""
+        self.data_dir = tempfile.mkdtemp(prefix='report_data_')
+        self.scoring = DeviceSecurityScoring(devices_file=os.path.join(self.data_dir, 'devices_security.json'))
+
+    def tearDown(self):
+        """Supprime les données temporaires"""
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_single_pass_counts(self):
+        """Les compteurs calculés en un parcours correspondent aux appareils"""
+        sources = collect_report_sources(self.scoring, report_types=[])
+        devices = sources['devices']
+        network = build_report_data('network', sources)
+        status = self.scoring.get_network_security_status()
+        for key in ('overall_score', 'device_count', 'high_risk_count', 'medium_risk_count', 'low_risk_count'):
+            self.assertEqual(sources['network_status'][key], status[key])
+
+        vulnerability_data = network['vulnerability_data']
+        self.assertEqual(vulnerability_data['total_vulnerabilities'], sum(d['issues_count'] for d in devices))
+        self.assertEqual(sum(vulnerability_data['severity_distribution'].values()), len(devices))
+        for category, keyword in report_data.VULNERABILITY_CATEGORY_KEYWORDS.items():
+            expected = sum(1 for d in devices if any(keyword in issue.lower() for issue in d['security_issues']))
+            self.assertEqual(vulnerability_data['vulnerability_types'][category], expected)
+
+        vulnerable = build_report_data('vulnerability', sources)['vulnerability_data']
+        self.assertEqual([d['mac_address'] for d in vulnerable['vulnerable_devices']],
+                         [d['mac_address'] for d in devices if d['security_score'] < 70])
+        self.assertEqual(vulnerable['severity_distribution']['low'], 0)
+
+    def test_builder_reuses_data_until_version_changes(self):
+        """Les données sont réutilisées tant que les appareils ne changent pas"""
+        builder = ReportDataBuilder(self.scoring)
+        with mock.patch('report_data.collect_report_sources', wraps=collect_report_sources) as collect:
+            first = builder.get_report_data('network')
+            builder.get_report_data('vulnerability')
+            second = builder.get_report_data('network')
+            self.assertEqual(collect.call_count, 1)
+            self.assertEqual(first, second)
+
+            # Les copies renvoyées sont indépendantes du cache
+            first['network_data']['devices'].clear()
+            self.assertTrue(builder.get_report_data('network')['network_data']['devices'])
+
+            self.scoring.devices[0]['security_score'] = 0
+            self.scoring.save_devices()
+            builder.get_report_data('network')
+            self.assertEqual(collect.call_count, 2)
+
+        self.assertEqual(builder.stats, {'hits': 2, 'misses': 3})
+
+    def test_network_report_includes_protocol_distribution(self):
+        """Le rapport réseau reprend la distribution des protocoles analysés et suit leur historique"""
+        analyzer = ProtocolAnalyzer(analyses_file=os.path.join(self.data_dir, 'protocol_analyses.json'))
+        analyzer.analyze_network_protocol({'ssid': 'Box', 'security': 'WPA2'})
+        builder = ReportDataBuilder(self.scoring, analyzer)
+
+        network_data = builder.get_report_data('network')['network_data']
+        self.assertEqual(network_data['protocol_distribution'], {'WPA2': 1})
+
+        analyzer.analyze_network_protocol({'ssid': 'Invités', 'security': 'WEP'})
+        network_data = builder.get_report_data('network')['network_data']
+        self.assertEqual(network_data['protocol_distribution'], {'WPA2': 1, 'WEP': 1})
+        self.assertEqual(builder.stats, {'hits': 0, 'misses': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
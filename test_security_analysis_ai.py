@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du module d'analyse de sécurité par IA (SecurityAnalysisAI)
+"""
+import unittest
+from unittest import mock
+
+from module_IA import SecurityAnalysisAI
+
+
+class TestBatchAnalysis(unittest.TestCase):
+    """Tests des variantes par lot"""
+
+    def setUp(self):
+        """Initialise le module d'IA"""
+        self.ai = SecurityAnalysisAI()
+
+    def test_batches_match_single_item_results(self):
+        """Les lots renvoient les mêmes insights que les appels unitaires (hors choix aléatoires)"""
+        devices = [('Router', 'Box', 40), ('', 'Caméra salon', 90), ('laptop', 'PC', 20), ('laptop', 'PC', 60)]
+        self.assertEqual(
+            self.ai.analyze_devices_security(devices),
+            [self.ai.analyze_device_security(*device) for device in devices]
+        )
+
+        protocols = [('wpa2', 70), ('WEP', 10), ('WiFi7', 20), ('WiFi7', 80)]
+        self.assertEqual(
+            self.ai.analyze_protocols_security(protocols),
+            [self.ai.analyze_protocol_security(*protocol) for protocol in protocols]
+        )
+
+        vulnerabilities = [('CVE-1', 'Injection SQL', 'unknown'), ('CVE-2', 'Faille', 'critical')]
+        self.assertEqual(
+            self.ai.analyze_vulnerabilities(vulnerabilities),
+            [self.ai.analyze_vulnerability(*vuln) for vuln in vulnerabilities]
+        )
+
+    def test_identical_inputs_are_analyzed_once(self):
+        """Les entrées identiques d'un lot sont analysées une seule fois et partagent leur résultat"""
+        recommendations = [{'title': 'Audit'}, {'title': 'Audit'}, {}, {'title': 'Mettre à jour le routeur'}]
+        with mock.patch.object(self.ai, 'generate_recommendation_insight',
+                               wraps=self.ai.generate_recommendation_insight) as single:
+            insights = self.ai.generate_recommendation_insights(recommendations)
+
+        self.assertEqual(single.call_count, 3)
+        self.assertEqual(insights[0], insights[1])
+        self.assertIsNone(insights[2])
+        self.assertIn('mises à jour', insights[3])
+
+        steps = [('Mise à jour firmware', 'low')] * 500 + [('Pare-feu', 'high')]
+        with mock.patch.object(self.ai, 'generate_remediation_recommendation',
+                               wraps=self.ai.generate_remediation_recommendation) as single:
+            results = self.ai.generate_remediation_recommendations(steps)
+        self.assertEqual(single.call_count, 2)
+        self.assertEqual(len(results), 501)
+
+
+class TestDeterministicMode(unittest.TestCase):
+    """Tests du mode déterministe et de la mémorisation"""
+
+    def test_same_input_gives_same_insight(self):
+        """En mode déterministe, les mêmes entrées donnent le même résultat d'une instance à l'autre"""
+        trend = [{'date': '2024-01', 'score': 60}, {'date': '2024-02', 'score': 70}]
+
+        def insights(ai):
+            return [
+                ai.generate_recommendation_insight({'title': 'Audit des accès'}),
+                ai.predict_security_trend(trend),
+                ai.analyze_vulnerability('CVE-1', 'Faille inconnue', 'unknown'),
+                ai.generate_remediation_recommendation('Revue des règles', 'medium'),
+                ai.analyze_vulnerability_trend('2024-02', 3, 'Stable')
+            ]
+
+        first = SecurityAnalysisAI(deterministic=True)
+        self.assertEqual(insights(first), insights(SecurityAnalysisAI(deterministic=True)))
+
+        # Les graines dépendent des entrées : les insights varient d'une recommandation à l'autre
+        insights = {first.generate_recommendation_insight({'title': f'Action {i}'}) for i in range(20)}
+        self.assertGreater(len(insights), 1)
+
+    def test_pure_insights_are_memoized_in_bounded_lru(self):
+        """Les appels répétés sont servis depuis la mémoire, bornée en nombre d'entrées"""
+        ai = SecurityAnalysisAI(deterministic=True, memo_size=2)
+        trend = [{'score': 50}, {'score': 55}]
+        predicted = ai.predict_security_trend(trend)
+        predicted[0]['score'] = 0
+        self.assertNotEqual(ai.predict_security_trend(trend)[0]['score'], 0)
+
+        ai.analyze_device_security('router', 'Box', 40)
+        ai.analyze_protocol_security('wpa2', 70)
+        stats = ai.get_memo_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 3, 2))
+
+    def test_short_trend_does_not_share_entry_with_zero_score(self):
+        """Une tendance trop courte et une tendance finissant à 0 ont des entrées distinctes"""
+        ai = SecurityAnalysisAI(deterministic=True)
+        self.assertEqual(ai.predict_security_trend([{'score': 0}]), [])
+        trend = [{'score': 10}, {'score': 0}]
+        self.assertEqual(ai.predict_security_trend(trend),
+                         SecurityAnalysisAI(deterministic=True).predict_security_trend(trend))
+        self.assertNotEqual(ai.predict_security_trend(trend), [])
+
+    def test_default_mode_is_not_memoized(self):
+        """Sans mode déterministe, rien n'est mémorisé"""
+        ai = SecurityAnalysisAI()
+        ai.analyze_device_security('router', 'Box', 40)
+        ai.analyze_device_security('router', 'Box', 40)
+        self.assertEqual(ai.get_memo_stats()['size'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du classement des menaces pertinentes de l'assistant de sécurité
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from assistant_securite import AssistantSecurite, CyberDefenseAssistant
+
+
+class TestThreatIndex(unittest.TestCase):
+    """Tests de l'index inversé des menaces"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Crée l'assistant (et sa base de menaces indexée), ses conversations dans un répertoire temporaire"""
+        cls.temp_dir = tempfile.mkdtemp(prefix='threats_')
+        cls.assistant = AssistantSecurite(conversations_dir=os.path.join(cls.temp_dir, 'conversations'))
+        cls.defense = cls.assistant.assistant
+
+    @classmethod
+    def tearDownClass(cls):
+        """Supprime le répertoire des conversations de l'assistant"""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def test_index_built_with_threat_database(self):
+        """Le chargement de la base construit les mots et l'index inversé de chaque menace"""
+        defense = self.defense
+        self.assertEqual(defense.threat_ids, list(defense.threat_database.keys()))
+        self.assertIn('krack', defense.threat_tokens['krack'])
+        self.assertIn(('krack', 3), defense.threat_index['krack'])
+        self.assertEqual(
+            {threat_id for threat_id, _ in defense.threat_index['handshake']},
+            {threat_id for threat_id, tokens in defense.threat_tokens.items() if 'handshake' in tokens}
+        )
+
+    def test_ranking_combines_keywords_encryption_and_severity(self):
+        """La pertinence cumule mots communs, type de chiffrement et gravité"""
+        ranked = self.defense.rank_threats({'krack'}, 'WPA2')
+        self.assertEqual(ranked[:2], [('krack', 3 + 3 + 2), ('pmkid', 3 + 2)])
+        # À pertinence égale, l'ordre de la base est conservé
+        self.assertEqual(ranked[2], ('evil_twin', 2))
+
+        threats = self.assistant._get_relevant_threats("Quelles attaques sur handshake ?", {'security': 'WPA'})
+        self.assertEqual(threats[0]['name'], "Capture de handshake WPA")
+        self.assertEqual(len(threats), 3)
+
+    def test_limit_is_filled_with_zero_relevance_threats(self):
+        """Sans menace grave, le classement est complété dans l'ordre de la base"""
+        defense = CyberDefenseAssistant.__new__(CyberDefenseAssistant)
+        defense.load_threat_database()
+        for threat in defense.threat_database.values():
+            threat['severity'] = 'moyenne'
+        defense.build_threat_index()
+        self.assertEqual(defense.rank_threats({'pmkid'}), [('pmkid', 3), ('evil_twin', 0), ('krack', 0)])
+        self.assertEqual(defense.default_threats, [])
+
+
+if __name__ == '__main__':
+    unittest.main()